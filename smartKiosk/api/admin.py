@@ -4,9 +4,11 @@ from .models import (
     Category,
     Item,
     SupplyRequest,
+    SupplyRequestLine,
     ItemPopularity,
     Room,
     RoomReservation,
+    SupplyRecipient,
 )
 from .models import UIAsset
 
@@ -49,7 +51,8 @@ class CategoryAdmin(admin.ModelAdmin):
 # -----------------------------------------
 @admin.register(Item)
 class ItemAdmin(admin.ModelAdmin):
-    list_display = ("name", "category", "image_preview")
+    list_display = ("name", "category", "daily_cap", "image_preview")
+    list_editable = ("daily_cap",)
     list_filter = ("category",)
     search_fields = ("name",)
 
@@ -77,7 +80,26 @@ class ItemPopularityAdmin(admin.ModelAdmin):
 # -----------------------------------------
 # Supply Requests Admin
 # -----------------------------------------
+class SupplyRequestLineInline(admin.TabularInline):
+    model = SupplyRequestLine
+    extra = 0
+    fields = ("item", "item_name", "qty")
+    readonly_fields = fields
+    can_delete = False
+
+
 @admin.register(SupplyRequest)
 class SupplyRequestAdmin(admin.ModelAdmin):
     list_display = ("id", "full_name", "email", "requested_at")
     readonly_fields = ("requested_at", "items")
+    inlines = [SupplyRequestLineInline]
+
+
+# -----------------------------------------
+# Supply Recipients Admin (category routing)
+# -----------------------------------------
+@admin.register(SupplyRecipient)
+class SupplyRecipientAdmin(admin.ModelAdmin):
+    list_display = ("email", "first_name", "last_name")
+    search_fields = ("email", "first_name", "last_name")
+    filter_horizontal = ("categories",)
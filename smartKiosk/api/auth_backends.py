@@ -0,0 +1,45 @@
+# api/auth_backends.py
+"""
+ModelBackend with password work moved to the bounded hashing pool.
+
+Same lookup and is_active rules as ModelBackend. A correct password
+stored with an older hasher (or older parameters) is re-hashed with the
+current default and saved right away — the transparent upgrade Django
+does in check_password(), minus the hashing on the request thread.
+
+Once this backend has handled a username + password it answers for
+good: a wrong password raises PermissionDenied, which stops
+authenticate() from hashing again in ModelBackend (listed after it only
+so existing sessions stay valid).
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+
+from api.utils.password_hashing import make_password_bounded, verify_password_bounded
+
+UserModel = get_user_model()
+
+
+class BoundedHashingBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown and known emails take the same time
+            make_password_bounded(password)
+            raise PermissionDenied
+
+        correct, must_update = verify_password_bounded(password, user.password)
+        if not correct or not self.user_can_authenticate(user):
+            raise PermissionDenied
+
+        if must_update:
+            user.password = make_password_bounded(password)
+            user.save(update_fields=["password"])
+        return user
@@ -1,10 +1,41 @@
+import random
 import time
-from django.db import connection
-from pymysql.err import OperationalError
+from django.db import connection, close_old_connections
+from django.db.utils import InternalError as DjangoInternalError
+from django.db.utils import OperationalError as DjangoOperationalError
+from pymysql.err import InternalError, OperationalError
 
 MAX_ATTEMPTS = 5
 RETRY_DELAY = 2  # seconds
 
+# PyMySQL raises unmapped server codes as OperationalError (>= 1000) or
+# InternalError; Django re-raises both with the same args
+RETRYABLE_EXCEPTIONS = (OperationalError, InternalError, DjangoOperationalError, DjangoInternalError)
+
+# TiDB / TiProxy error codes that mean "back off and try again"
+# 1105 unknown (cold start), 8027 schema out of date,
+# 9001-9007 PD / TiKV busy or timeout (throttling),
+# 2006 / 2013 server gone away / lost connection (client side)
+TRANSIENT_ERROR_CODES = frozenset({1105, 8027, 9001, 9002, 9003, 9004, 9005, 9006, 9007, 2006, 2013})
+
+# Raised by TiProxy before there is a server error code
+TRANSIENT_ERROR_MESSAGES = ("TiProxy fails to connect",)
+
+
+def error_code(exc):
+    """MySQL error number of a DB error (args[0]), or None."""
+    code = exc.args[0] if exc.args else None
+    return code if isinstance(code, int) else None
+
+
+def is_transient_error(exc):
+    """True if a DB error looks like throttling / a sleeping cluster."""
+    if error_code(exc) in TRANSIENT_ERROR_CODES:
+        return True
+    msg = str(exc)
+    return any(marker in msg for marker in TRANSIENT_ERROR_MESSAGES)
+
+
 def ensure_tidb_awake():
     """Ping TiDB with retries to wake up a sleeping cluster."""
     attempt = 1
@@ -13,11 +44,65 @@ def ensure_tidb_awake():
             with connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
             return True
-        except OperationalError as e:
-            if "TiProxy fails to connect" in str(e) or "1105" in str(e):
+        except RETRYABLE_EXCEPTIONS as e:
+            if error_code(e) == 1105 or "TiProxy fails to connect" in str(e):
                 print(f"[TiDB] Sleeping… retrying ({attempt}/{MAX_ATTEMPTS})")
                 time.sleep(RETRY_DELAY)
                 attempt += 1
             else:
                 raise e
     return False
+
+
+def run_with_backoff(fn, *args, attempts=MAX_ATTEMPTS, base_delay=0.25, max_delay=8.0, **kwargs):
+    """
+    Call fn(*args, **kwargs). On a transient TiDB error, sleep with
+    exponential backoff + jitter and retry. Nothing sleeps on the
+    happy path. Non-transient errors are raised immediately.
+    """
+    delay = base_delay
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(*args, **kwargs)
+        except RETRYABLE_EXCEPTIONS as e:
+            if attempt == attempts or not is_transient_error(e):
+                raise
+            print(f"[TiDB] Throttled, backing off {delay:.2f}s ({attempt}/{attempts}): {e}")
+            close_old_connections()
+            time.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, max_delay)
+
+
+def write_in_batches(objs, write_fn, batch_size=200, min_batch_size=10, max_batch_size=1000):
+    """
+    Feed objs to write_fn(chunk) in batches whose size adapts to TiDB:
+    a throttled batch is retried at half size, each clean batch grows
+    the size back (additive increase) up to max_batch_size.
+    Returns the number of objects written.
+    """
+    objs = list(objs)
+    size = max(min_batch_size, min(batch_size, max_batch_size))
+    written = 0
+    i = 0
+
+    while i < len(objs):
+        chunk = objs[i:i + size]
+        try:
+            run_with_backoff(write_fn, chunk, attempts=2)
+        except RETRYABLE_EXCEPTIONS as e:
+            if not is_transient_error(e):
+                raise
+            if size <= min_batch_size:
+                # Last resort: full backoff schedule at the smallest size
+                chunk = objs[i:i + min_batch_size]
+                run_with_backoff(write_fn, chunk)
+                size = min_batch_size
+            else:
+                size = max(min_batch_size, size // 2)
+                continue
+
+        written += len(chunk)
+        i += len(chunk)
+        size = min(max_batch_size, size + min_batch_size)
+
+    return written
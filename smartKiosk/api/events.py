@@ -0,0 +1,264 @@
+# api/events.py
+"""
+Live push channel for kiosk screens: GET /api/events/ (Server-Sent Events).
+
+Write views call publish("<event>", {...}) and every connected kiosk gets
+
+    id: 42
+    event: banner.changed
+    data: {"bannerId":3,"active":true}
+
+Events
+  banner.changed          banner activated / deactivated / edited / rescheduled
+  items.locked            supply items requested today (lock them in the UI)
+  reservation.created     a room was booked
+  reservation.cancelled   one or more bookings were cancelled
+  catalog.changed         an item was created or edited
+
+Query string: ?types=banner.changed,items.locked limits the stream.
+Reconnects send Last-Event-ID and get the missed events replayed from a
+small backlog; if the gap is older than the backlog a `resync` event
+tells the screen to refetch everything once.
+
+settings.EVENTS_BACKEND (dotted path) picks the fan-out backend. The
+default InProcessBackend only reaches streams held by THIS worker
+process — fine for one ASGI worker; with several, plug in a backend
+with the same publish/subscribe interface over a shared broker.
+
+The stream needs ASGI. Under WSGI (runserver) the view sends the
+replayed backlog and closes; EventSource reconnects after `retry` ms,
+so screens fall back to slow polling instead of pinning a sync worker.
+"""
+import asyncio
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_GET
+
+from api.utils.json_response import get_dumps
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = (
+    "banner.changed",
+    "items.locked",
+    "reservation.created",
+    "reservation.cancelled",
+    "catalog.changed",
+)
+
+
+class Event:
+    __slots__ = ("id", "type", "data")
+
+    def __init__(self, id, type, data):
+        self.id = id
+        self.type = type
+        self.data = data
+
+    def encode(self):
+        payload = get_dumps()(self.data).decode("utf-8")
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+# ---------------------------------------------------------
+# IN-PROCESS BACKEND
+# publish() may run in any thread (sync views, sync_to_async
+# workers); each subscriber's queue is fed on its own event loop.
+# ---------------------------------------------------------
+class Subscription:
+    def __init__(self, backend, loop, maxsize):
+        self.backend = backend
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # loop already closed
+            self.close()
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow client: end its stream, it reconnects with Last-Event-ID
+            self.close()
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class InProcessBackend:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._backlog = deque(maxlen=getattr(settings, "EVENTS_REPLAY_SIZE", 200))
+        self._next_id = 1
+
+    def publish(self, type, data):
+        with self._lock:
+            event = Event(self._next_id, type, data)
+            self._next_id += 1
+            self._backlog.append(event)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            subscription.push(event)
+        return event
+
+    def subscribe(self, last_id=None):
+        """
+        (subscription, missed_events, complete). Registration and the
+        backlog snapshot happen under one lock: no gaps, no duplicates.
+        """
+        subscription = Subscription(
+            self, asyncio.get_running_loop(), getattr(settings, "EVENTS_QUEUE_SIZE", 100)
+        )
+        with self._lock:
+            self._subscribers.add(subscription)
+            missed, complete = self._since(last_id)
+        return subscription, missed, complete
+
+    def backlog(self, last_id=None):
+        with self._lock:
+            return self._since(last_id)
+
+    def _since(self, last_id):
+        # No Last-Event-ID, or an id from before a restart: nothing to replay
+        if last_id is None or last_id >= self._next_id:
+            return [], True
+        missed = [e for e in self._backlog if e.id > last_id]
+        complete = not self._backlog or self._backlog[0].id <= last_id + 1
+        return missed, complete
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Resolve settings.EVENTS_BACKEND once per process."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, "EVENTS_BACKEND", "api.events.InProcessBackend")
+                _backend = import_string(path)()
+    return _backend
+
+
+def reservation_event(reservations):
+    """Availability-relevant fields only — no names or emails go to kiosks."""
+    return {
+        "reservations": [
+            {
+                "id": r.id,
+                "roomId": r.room_id,
+                "date": r.date.strftime("%Y-%m-%d"),
+                "startTime": r.start_time.strftime("%H:%M"),
+                "endTime": r.end_time.strftime("%H:%M"),
+            }
+            for r in reservations
+        ],
+    }
+
+
+def publish(type, data):
+    """Fire-and-forget: a push failure must never fail the write that caused it."""
+    if not getattr(settings, "EVENTS_ENABLED", True):
+        return None
+    try:
+        return get_backend().publish(type, data)
+    except Exception:
+        logger.exception("Event publish failed (%s)", type)
+        return None
+
+
+# ---------------------------------------------------------
+# GET /api/events/
+# ---------------------------------------------------------
+def _last_event_id(request):
+    raw = request.headers.get("Last-Event-ID") or request.GET.get("lastEventId")
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def _wanted_types(request):
+    raw = request.GET.get("types")
+    if not raw:
+        return set(EVENT_TYPES)
+    return {t.strip() for t in raw.split(",") if t.strip() in EVENT_TYPES}
+
+
+async def _stream(subscription, missed, complete, types):
+    heartbeat = getattr(settings, "EVENTS_HEARTBEAT_SECONDS", 15)
+    try:
+        yield f"retry: {getattr(settings, 'EVENTS_RETRY_MS', 3000)}\n\n"
+        if not complete:
+            yield "event: resync\ndata: {}\n\n"
+        for event in missed:
+            if event.type in types:
+                yield event.encode()
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection
+                yield ": ping\n\n"
+                continue
+            if event is None:
+                return
+            if event.type in types:
+                yield event.encode()
+    finally:
+        subscription.close()
+
+
+def _replay_once(missed, complete, types):
+    yield f"retry: {getattr(settings, 'EVENTS_RETRY_MS', 3000)}\n\n"
+    if not complete:
+        yield "event: resync\ndata: {}\n\n"
+    for event in missed:
+        if event.type in types:
+            yield event.encode()
+
+
+@require_GET
+async def events_stream(request):
+    types = _wanted_types(request)
+    last_id = _last_event_id(request)
+    backend = get_backend()
+
+    if isinstance(request, ASGIRequest):
+        subscription, missed, complete = backend.subscribe(last_id)
+        content = _stream(subscription, missed, complete, types)
+    else:
+        missed, complete = backend.backlog(last_id)
+        content = _replay_once(missed, complete, types)
+
+    response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: flush each event
+    return response
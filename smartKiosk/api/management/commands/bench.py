@@ -0,0 +1,276 @@
+import datetime
+import json
+import logging
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from accounts.models import UserCard, UserProfile
+from api.models import BannerImage, Category, Item, Room, RoomReservation
+
+# One INFO line per request would swamp the report; slow requests still log
+PERF_LOGGER = logging.getLogger("kiosks.perf")
+
+# Weighted kiosk traffic mix (roughly what one busy morning looks like)
+MIX = {
+    "card_login": 15,
+    "catalog": 20,
+    "supply_submit": 10,
+    "availability": 20,
+    "reserve": 8,
+    "cancel": 7,
+    "banners": 20,
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def swipe_for(uta_id):
+    return f"%B{uta_id}^KIOSK/BENCH^?;{uta_id}=0000?+{uta_id}?"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the kiosk API with a realistic request mix on a throwaway SQLite database. "
+        "Reports p50/p95/p99 latency and throughput per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Measured requests (after warmup).")
+        parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests first.")
+        parser.add_argument("--scale", type=int, default=200, help="Synthetic users (items, reservations scale with it).")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed = same request sequence).")
+        parser.add_argument(
+            "--only",
+            choices=sorted(MIX),
+            action="append",
+            help="Restrict the mix to these endpoints (repeatable).",
+        )
+        parser.add_argument("--json", type=str, default=None, help="Also write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "bench only runs on SQLite (it creates and drops its own database). "
+                "Run it as `KIOSK_SQLITE=1 python manage.py bench`."
+            )
+
+        self.rng = random.Random(options["seed"])
+        mix = {name: MIX[name] for name in (options["only"] or MIX)}
+
+        # Isolated in-memory database, same as the test runner uses
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        perf_level = PERF_LOGGER.level
+        PERF_LOGGER.setLevel(logging.WARNING)
+        try:
+            with override_settings(
+                EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                RATE_LIMIT_ENABLED=False,
+                SUPPLY_DIGEST_ENABLED=False,
+                ALLOWED_HOSTS=["testserver"],
+            ):
+                started = time.perf_counter()
+                self.seed(options["scale"])
+                self.stdout.write(f"Seeded scale={options['scale']} in {time.perf_counter() - started:.2f}s")
+
+                self.run_mix(mix, options["warmup"])
+                results, wall = self.run_mix(mix, options["requests"])
+        finally:
+            PERF_LOGGER.setLevel(perf_level)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.report(results, wall, options)
+
+    # ---------------------------------------------------------
+    # SYNTHETIC DATA
+    # ---------------------------------------------------------
+    def seed(self, scale):
+        today = timezone.localdate()
+        self.today = today
+
+        self.rooms = list(Room.objects.bulk_create(
+            [Room(name=f"ERSA {100 + n}", capacity=6 + n % 6) for n in range(max(3, scale // 40))]
+        ))
+
+        categories = Category.objects.bulk_create([
+            Category(name="Storage Closet", key="closet"),
+            Category(name="Break Room", key="break"),
+            Category(name="K-Cups", key="kcup"),
+        ])
+        self.item_ids = [i.id for i in Item.objects.bulk_create([
+            Item(name=f"Item {n}", category=categories[n % len(categories)]) for n in range(max(10, scale // 4))
+        ])]
+
+        users = User.objects.bulk_create([
+            User(username=f"bench{n}@mavs.uta.edu", email=f"bench{n}@mavs.uta.edu", first_name="Bench", last_name=str(n))
+            for n in range(scale)
+        ])
+        UserProfile.objects.bulk_create([UserProfile(user=u, full_name=f"Bench {n}") for n, u in enumerate(users)])
+
+        self.swipes = []
+        cards = []
+        for n, u in enumerate(users):
+            uta_id = f"100{n:07d}"
+            swipe = swipe_for(uta_id)
+            cards.append(UserCard(user=u, uta_id=uta_id, raw_swipe=swipe))
+            self.swipes.append(swipe)
+        UserCard.objects.bulk_create(cards)
+
+        # Existing bookings spread over the next two weeks
+        RoomReservation.objects.bulk_create([
+            RoomReservation(
+                room=self.rooms[n % len(self.rooms)],
+                user=users[n % len(users)],
+                full_name=f"Bench {n % len(users)}",
+                email=users[n % len(users)].email,
+                date=today + datetime.timedelta(days=n % 14),
+                start_time=datetime.time(7 + n % 12, 0),
+                end_time=datetime.time(8 + n % 12, 0),
+            )
+            for n in range(scale * 2)
+        ])
+
+        BannerImage.objects.bulk_create([
+            BannerImage(image=f"banners/bench{n}.png", label=f"Banner {n}", is_active=n % 2 == 0)
+            for n in range(6)
+        ])
+
+        # A pool of logged-in sessions for the reservation flows
+        self.clients = []
+        for u in users[: min(20, len(users))]:
+            client = Client()
+            client.force_login(u)
+            self.clients.append(client)
+        self.kiosk = Client()
+
+        self.slot = 0
+        self.own_reservations = []
+
+    # ---------------------------------------------------------
+    # REQUEST MIX
+    # ---------------------------------------------------------
+    def post_json(self, client, url, payload):
+        return client.post(url, json.dumps(payload), content_type="application/json")
+
+    def request(self, name):
+        rng = self.rng
+
+        if name == "card_login":
+            return self.post_json(self.kiosk, "/api/card/login/", {"raw_swipe": rng.choice(self.swipes)})
+
+        if name == "catalog":
+            return self.kiosk.get("/api/items/")
+
+        if name == "supply_submit":
+            return self.post_json(self.kiosk, "/api/supplies/request/", {
+                "items": rng.sample(self.item_ids, k=min(3, len(self.item_ids))),
+                "fullName": "Bench Kiosk",
+                "email": "kiosk@mavs.uta.edu",
+            })
+
+        if name == "availability":
+            day = self.today + datetime.timedelta(days=rng.randrange(14))
+            return rng.choice(self.clients).get(f"/api/rooms/reservations/by-date/?date={day.isoformat()}")
+
+        if name == "reserve":
+            # Fresh, non-conflicting slots far in the future
+            self.slot += 1
+            day = self.today + datetime.timedelta(days=30 + self.slot // 12)
+            hour = 7 + self.slot % 12
+            client = rng.choice(self.clients)
+            response = self.post_json(client, "/api/rooms/reserve/", {
+                "roomId": self.rooms[self.slot % len(self.rooms)].id,
+                "date": day.isoformat(),
+                "startTime": f"{hour:02d}:00",
+                "endTime": f"{hour:02d}:45",
+            })
+            if response.status_code < 300:
+                reservation_id = response.json().get("reservation", {}).get("id")
+                if reservation_id:
+                    self.own_reservations.append((client, reservation_id))
+            return response
+
+        if name == "cancel":
+            if not self.own_reservations:
+                return self.request("reserve")
+            client, reservation_id = self.own_reservations.pop(rng.randrange(len(self.own_reservations)))
+            return client.post(f"/api/rooms/reservations/{reservation_id}/cancel/")
+
+        if name == "banners":
+            return self.kiosk.get("/api/banners/active/")
+
+        raise CommandError(f"Unknown endpoint {name}")
+
+    def run_mix(self, mix, count):
+        names = list(mix)
+        weights = [mix[n] for n in names]
+        results = {name: {"latencies": [], "errors": 0} for name in names}
+
+        started = time.perf_counter()
+        for name in self.rng.choices(names, weights=weights, k=count):
+            t0 = time.perf_counter()
+            response = self.request(name)
+            elapsed = (time.perf_counter() - t0) * 1000
+
+            results[name]["latencies"].append(elapsed)
+            if response.status_code >= 400:
+                results[name]["errors"] += 1
+
+        return results, time.perf_counter() - started
+
+    # ---------------------------------------------------------
+    # REPORT
+    # ---------------------------------------------------------
+    def report(self, results, wall, options):
+        rows = {}
+        for name, data in results.items():
+            lat = sorted(data["latencies"])
+            if not lat:
+                continue
+            rows[name] = {
+                "count": len(lat),
+                "errors": data["errors"],
+                "p50_ms": round(percentile(lat, 50), 2),
+                "p95_ms": round(percentile(lat, 95), 2),
+                "p99_ms": round(percentile(lat, 99), 2),
+                "max_ms": round(lat[-1], 2),
+                # Requests/s this endpoint alone sustains on one worker
+                "rps": round(len(lat) / (sum(lat) / 1000), 1),
+            }
+
+        total = sum(r["count"] for r in rows.values())
+
+        self.stdout.write(
+            f"\n{'endpoint':<15}{'count':>7}{'err':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'req/s':>9}"
+        )
+        for name, r in sorted(rows.items()):
+            line = (
+                f"{name:<15}{r['count']:>7}{r['errors']:>6}{r['p50_ms']:>9.2f}"
+                f"{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['max_ms']:>9.2f}{r['rps']:>9.1f}"
+            )
+            self.stdout.write(self.style.WARNING(line) if r["errors"] else line)
+        self.stdout.write(self.style.SUCCESS(
+            f"\nTOTAL {total} requests in {wall:.2f}s → {total / wall:.1f} req/s (single worker)"
+        ))
+
+        if options["json"]:
+            with open(options["json"], "w", encoding="utf-8") as fh:
+                json.dump({
+                    "options": {k: options[k] for k in ("requests", "warmup", "scale", "seed", "only")},
+                    "total_requests": total,
+                    "wall_seconds": round(wall, 3),
+                    "endpoints": rows,
+                }, fh, indent=2)
+            self.stdout.write(f"Wrote {options['json']}")
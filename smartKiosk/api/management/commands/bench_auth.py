@@ -0,0 +1,138 @@
+import json
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils.module_loading import import_string
+
+from accounts.models import UserProfile
+from api.management.commands.bench import percentile
+
+PASSWORD = "Bench-Password-2026"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark password hashers and the login / registration / set-password endpoints "
+        "on a throwaway SQLite database, including first logins that upgrade a PBKDF2 hash."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20, help="Requests per flow.")
+        parser.add_argument("--hashes", type=int, default=5, help="Hashes per configured hasher.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(
+                "bench_auth only runs on SQLite (it creates and drops its own database). "
+                "Run it as `KIOSK_SQLITE=1 python manage.py bench_auth`."
+            )
+
+        self.stdout.write(f"Default hasher: {settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1]}, "
+                          f"hashing threads: {getattr(settings, 'PASSWORD_HASH_THREADS', 2)}")
+        self.bench_hashers(max(1, options["hashes"]))
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(RATE_LIMIT_ENABLED=False, ALLOWED_HOSTS=["testserver"]):
+                results = self.bench_requests(max(1, options["requests"]))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.report(results)
+
+    # ---------------------------------------------------------
+    # HASHERS
+    # ---------------------------------------------------------
+    def bench_hashers(self, count):
+        self.stdout.write("-------- HASHERS ----------")
+        for path in settings.PASSWORD_HASHERS:
+            hasher = import_string(path)()
+            try:
+                hasher.encode(PASSWORD, hasher.salt())  # warm up / check the library is there
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"{hasher.algorithm:<16} unavailable: {e}"))
+                continue
+            started = time.perf_counter()
+            for _ in range(count):
+                hasher.encode(PASSWORD, hasher.salt())
+            ms = (time.perf_counter() - started) / count * 1000
+            self.stdout.write(f"{hasher.algorithm:<16} {ms:9.1f} ms/hash")
+
+    # ---------------------------------------------------------
+    # ENDPOINTS
+    # ---------------------------------------------------------
+    def timed(self, results, name, fn):
+        started = time.perf_counter()
+        response = fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        entry = results.setdefault(name, {"latencies": [], "errors": 0})
+        entry["latencies"].append(elapsed)
+        if response.status_code >= 400:
+            entry["errors"] += 1
+        return response
+
+    def post_json(self, client, url, payload):
+        return client.post(url, json.dumps(payload), content_type="application/json")
+
+    def bench_requests(self, count):
+        results = {}
+        client = Client()
+
+        for n in range(count):
+            self.timed(results, "register", lambda: self.post_json(client, "/api/register/", {
+                "email": f"new{n}@mavs.uta.edu", "password": PASSWORD, "fullName": f"New User{n}",
+            }))
+
+        for n in range(count):
+            self.timed(results, "login", lambda: self.post_json(Client(), "/api/login/", {
+                "email": f"new{n}@mavs.uta.edu", "password": PASSWORD,
+            }))
+
+        self.timed(results, "login (wrong pw)", lambda: self.post_json(Client(), "/api/login/", {
+            "email": "new0@mavs.uta.edu", "password": "not-the-password",
+        }))
+
+        # Accounts created before the hasher change: first login upgrades the hash
+        legacy_hash = make_password(PASSWORD, hasher="pbkdf2_sha256")
+        legacy = User.objects.bulk_create([
+            User(username=f"old{n}@mavs.uta.edu", email=f"old{n}@mavs.uta.edu", password=legacy_hash)
+            for n in range(count)
+        ])
+        UserProfile.objects.bulk_create([UserProfile(user=u, full_name=f"Old User {n}") for n, u in enumerate(legacy)])
+
+        for label in ("login pbkdf2→new", "login upgraded"):
+            for n in range(count):
+                self.timed(results, label, lambda: self.post_json(Client(), "/api/login/", {
+                    "email": f"old{n}@mavs.uta.edu", "password": PASSWORD,
+                }))
+
+        upgraded = User.objects.get(username="old0@mavs.uta.edu").password
+        self.stdout.write(f"Legacy hash after login: {identify_hasher(upgraded).algorithm}")
+
+        client.force_login(User.objects.get(username="new0@mavs.uta.edu"))
+        for n in range(count):
+            self.timed(results, "set password", lambda: self.post_json(
+                client, "/api/me/set-password/", {"password": f"{PASSWORD}-{n}"}
+            ))
+        return results
+
+    # ---------------------------------------------------------
+    # REPORT
+    # ---------------------------------------------------------
+    def report(self, results):
+        self.stdout.write(f"\n{'flow':<19}{'count':>7}{'err':>6}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+        for name, data in results.items():
+            lat = sorted(data["latencies"])
+            line = (
+                f"{name:<19}{len(lat):>7}{data['errors']:>6}{percentile(lat, 50):>9.1f}"
+                f"{percentile(lat, 95):>9.1f}{lat[-1]:>9.1f}"
+            )
+            # The wrong-password login is expected to fail
+            failed = data["errors"] and name != "login (wrong pw)"
+            self.stdout.write(self.style.WARNING(line) if failed else line)
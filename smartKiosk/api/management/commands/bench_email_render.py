@@ -0,0 +1,103 @@
+import datetime
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from api.models import Room, RoomReservation
+from api.utils import email_templates
+
+
+def _time_per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+class Command(BaseCommand):
+    help = "Benchmark email template rendering (per email and bulk emails with many rows). No DB or SMTP."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=2000,
+            help="Renders per single-email template.",
+        )
+        parser.add_argument(
+            "--rows",
+            type=str,
+            default="10,100,500",
+            help="Comma-separated row counts for the bulk emails.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        row_counts = [int(n) for n in options["rows"].split(",") if n.strip()]
+
+        # Unsaved model instances — nothing touches the database
+        user = User(id=1, username="pat@mavs.uta.edu", first_name="Pat", last_name="Nguyen")
+        room = Room(id=1, name="ERSA 101", capacity=8)
+        start = datetime.date(2026, 1, 5)
+
+        def reservation(i):
+            return RoomReservation(
+                id=i + 1,
+                room=room,
+                user=user,
+                full_name="Pat Nguyen",
+                email="pat@mavs.uta.edu",
+                date=start + datetime.timedelta(days=i % 120),
+                start_time=datetime.time(9 + i % 8, 0),
+                end_time=datetime.time(10 + i % 8, 0),
+            )
+
+        res = reservation(0)
+        links = {"google": "https://calendar.google.com/", "outlook": "https://outlook.live.com/"}
+        logo = "https://example.com/logo.png"
+        now = datetime.datetime(2026, 1, 5, 9, 30)
+        catalog = [f"Catalog Item {n}" for n in range(60)]
+
+        singles = [
+            ("reservation", lambda: email_templates.render_reservation_email(user, res, links, logo)),
+            ("cancellation", lambda: email_templates.render_cancellation_email(res, "Room closed", logo, "admin")),
+            ("password_reset", lambda: email_templates.render_password_reset_email(logo, "123456")),
+            ("supply (5 items)", lambda: email_templates.render_supply_request_email(
+                "Pat Nguyen", "pat@mavs.uta.edu", catalog[:5], 1, now, logo, "Sam", "Lee")),
+        ]
+
+        self.stdout.write("-------- PER EMAIL --------")
+        for label, fn in singles:
+            fn()  # warm memoized fragments
+            secs = _time_per_call(fn, iterations)
+            size = len(fn())
+            self.stdout.write(f"{label:<22} {secs * 1e6:9.1f} µs/email   {size / 1024:7.1f} KiB")
+
+        self.stdout.write("-------- BULK EMAILS ------")
+        bulk_iterations = max(1, iterations // 20)
+        for rows in row_counts:
+            reservations = [reservation(i) for i in range(rows)]
+            items = [catalog[i % len(catalog)] for i in range(rows)]
+
+            bulk = lambda: email_templates.render_bulk_cancellation_email(
+                reservations, logo, "admin", "Room closed for the semester")
+            summary = lambda: email_templates.render_bulk_cancellation_email(
+                reservations, logo, "admin", "Room closed for the semester",
+                max_rows=25, attachment_name="cancelled-reservations.csv")
+            supply = lambda: email_templates.render_supply_request_email(
+                "Pat Nguyen", "pat@mavs.uta.edu", items, 1, now, logo)
+
+            for label, fn in (
+                (f"bulk cancel x{rows}", bulk),
+                (f"bulk summary x{rows}", summary),
+                (f"supply x{rows}", supply),
+            ):
+                fn()
+                secs = _time_per_call(fn, bulk_iterations)
+                size = len(fn())
+                self.stdout.write(
+                    f"{label:<22} {secs * 1e3:9.3f} ms/email   {size / 1024:7.1f} KiB   "
+                    f"{secs / rows * 1e6:6.2f} µs/row"
+                )
+        self.stdout.write("---------------------------")
@@ -1,12 +1,22 @@
 import os
 from django.core.management.base import BaseCommand
-from django.core.files import File
 from api.models import Item
-from django.conf import settings
+from api.utils.image_import import (
+    PhaseTimer,
+    dedupe_by_stem,
+    read_sources,
+    reencode_all,
+    scan_folder,
+    upload_all,
+)
+
+
+def item_name_from_stem(stem):
+    return stem.replace("_", " ").strip()
 
 
 class Command(BaseCommand):
-    help = "Bulk import item images from local assets folder."
+    help = "Bulk import item images from local assets folder (parallel, skips unchanged files)."
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -15,21 +25,43 @@ class Command(BaseCommand):
             required=True,
             help='Path to the folder containing item images (PNG/JPG).'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Thread pool size for file reads and storage uploads.'
+        )
+        parser.add_argument(
+            '--reencode',
+            action='store_true',
+            help='Losslessly re-encode images with Pillow before upload.'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=None,
+            help='Process pool size for --reencode (defaults to CPU count).'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-upload every image even if its content hash is unchanged.'
+        )
 
     def handle(self, *args, **options):
         folder_path = options['path']
+        workers = max(1, options['workers'])
 
         if not os.path.isdir(folder_path):
             self.stdout.write(self.style.ERROR(f"Invalid folder: {folder_path}"))
             return
 
+        timer = PhaseTimer()
+
         # Supported image extensions
         valid_exts = ['.png', '.jpg', '.jpeg']
 
-        files = [
-            f for f in os.listdir(folder_path)
-            if os.path.splitext(f)[1].lower() in valid_exts
-        ]
+        files = scan_folder(folder_path, valid_exts)
 
         if not files:
             self.stdout.write(self.style.WARNING("No PNG/JPG images found."))
@@ -37,36 +69,85 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Found {len(files)} image files.\n")
 
-        imported = 0
+        # Clean up filename → match DB; keep one file per item
+        # (Coffee_Pods.png and Coffee Pods.jpg are the same item)
+        by_name, conflicts = dedupe_by_stem(files, valid_exts, item_name_from_stem)
+        for skipped_file, kept in conflicts:
+            self.stdout.write(self.style.WARNING(f"⚠ Skipped {skipped_file}: same item as {kept}"))
+        files = sorted(by_name.values())
+        names = {filename: name for name, filename in by_name.items()}
+
+        # ----------------------------------------------------
+        # 1. Read + hash every file (thread pool)
+        # ----------------------------------------------------
+        sources = read_sources(folder_path, files, workers)
+        timer.mark("read+hash")
+
+        # ----------------------------------------------------
+        # 2. Resolve ALL item names in one query
+        # ----------------------------------------------------
+        items = Item.objects.in_bulk(set(names.values()), field_name="name")
+        timer.mark("resolve")
+
         skipped = 0
+        unchanged = 0
+        jobs = []
 
         for filename in files:
-            base, ext = os.path.splitext(filename)
-            item_name = base.replace("_", " ").strip()    # Clean up filename → match DB
-
-            try:
-                item = Item.objects.get(name=item_name)
-            except Item.DoesNotExist:
+            item_name = names[filename]
+            item = items.get(item_name)
+            if item is None:
                 self.stdout.write(self.style.WARNING(f"❌ No item matching: {item_name}"))
                 skipped += 1
                 continue
 
-            file_path = os.path.join(folder_path, filename)
-
-            # Open the file as Django File object
-            with open(file_path, 'rb') as img_file:
-                django_file = File(img_file)
+            data, digest = sources[filename]
+            if not options['force'] and item.image and item.image_hash == digest:
+                unchanged += 1
+                continue
 
-                # Auto-rename upload to <ItemName>.<ext>
-                safe_name = item.name.replace(" ", "_")
-                new_filename = f"{safe_name}{ext.lower()}"
+            ext = os.path.splitext(filename)[1].lower()
+            jobs.append((item, data, digest, ext))
+
+        # ----------------------------------------------------
+        # 3. Optional Pillow re-encode (process pool)
+        # ----------------------------------------------------
+        if options['reencode'] and jobs:
+            encoded = reencode_all(
+                [(item.pk, data, ext) for item, data, _, ext in jobs],
+                options['processes'],
+            )
+            jobs = [(item, encoded[item.pk], digest, ext) for item, _, digest, ext in jobs]
+            timer.mark("reencode")
+
+        # ----------------------------------------------------
+        # 4. Upload to storage (thread pool), then one bulk UPDATE
+        # ----------------------------------------------------
+        # Auto-rename upload to <ItemName>.<ext>
+        stored = upload_all(
+            [
+                (item.pk, item.image, f"{item.name.replace(' ', '_')}{ext}", data)
+                for item, data, _, ext in jobs
+            ],
+            workers,
+        )
+        timer.mark("upload")
 
-                item.image.save(new_filename, django_file, save=True)
+        changed = []
+        for item, _, digest, _ in jobs:
+            item.image.name = stored[item.pk]
+            item.image_hash = digest
+            changed.append(item)
+            self.stdout.write(self.style.SUCCESS(f"✔ Imported image for: {item.name}"))
 
-            self.stdout.write(self.style.SUCCESS(f"✔ Imported image for: {item_name}"))
-            imported += 1
+        Item.objects.bulk_update(changed, ["image", "image_hash"], batch_size=200)
+        timer.mark("db write")
 
         self.stdout.write("\n-------- SUMMARY --------")
-        self.stdout.write(self.style.SUCCESS(f"Imported: {imported} images"))
+        self.stdout.write(self.style.SUCCESS(f"Imported: {len(changed)} images"))
+        self.stdout.write(f"Unchanged: {unchanged} images")
         self.stdout.write(self.style.WARNING(f"Skipped: {skipped} files"))
+        self.stdout.write("-------- TIMING ---------")
+        for line in timer.lines():
+            self.stdout.write(line)
         self.stdout.write("-------------------------")
@@ -1,7 +1,15 @@
 import os
 from django.core.management.base import BaseCommand
-from django.core.files import File
 from api.models import UIAsset
+from kiosks.ui_assets import invalidate_manifest
+from api.utils.image_import import (
+    PhaseTimer,
+    dedupe_by_stem,
+    read_sources,
+    reencode_all,
+    scan_folder,
+    upload_all,
+)
 
 class Command(BaseCommand):
     help = "Bulk import UI assets (backgrounds, banners, favicons, etc.) into Django."
@@ -13,38 +21,114 @@ class Command(BaseCommand):
             required=True,
             help="Path containing UI asset images (PNG/JPG/WEBP)"
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Thread pool size for file reads and storage uploads."
+        )
+        parser.add_argument(
+            "--reencode",
+            action="store_true",
+            help="Losslessly re-encode images with Pillow before upload."
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Process pool size for --reencode (defaults to CPU count)."
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-upload every asset even if its content hash is unchanged."
+        )
 
     def handle(self, *args, **options):
         folder_path = options["path"]
+        workers = max(1, options["workers"])
 
         if not os.path.isdir(folder_path):
             self.stdout.write(self.style.ERROR(f"Invalid folder: {folder_path}"))
             return
 
+        timer = PhaseTimer()
+
         valid_exts = [".png", ".jpg", ".jpeg", ".webp"]
 
-        files = [
-            f for f in os.listdir(folder_path)
-            if os.path.splitext(f)[1].lower() in valid_exts
-        ]
+        files = scan_folder(folder_path, valid_exts)
 
         if not files:
             self.stdout.write(self.style.WARNING("No supported image files found."))
             return
 
-        imported = 0
+        # Asset name = file stem: keep one file per name (logo.png + logo.jpg)
+        by_name, conflicts = dedupe_by_stem(files, valid_exts)
+        for skipped, kept in conflicts:
+            self.stdout.write(self.style.WARNING(f"⚠ Skipped {skipped}: same asset name as {kept}"))
+        files = sorted(by_name.values())
+        names = {filename: name for name, filename in by_name.items()}
+
+        # Read + hash in parallel, then resolve every asset in one query
+        sources = read_sources(folder_path, files, workers)
+        timer.mark("read+hash")
+
+        existing = UIAsset.objects.in_bulk(set(names.values()), field_name="name")
+        timer.mark("resolve")
+
+        unchanged = 0
+        jobs = []
 
         for filename in files:
-            asset_name = os.path.splitext(filename)[0]
-            file_path = os.path.join(folder_path, filename)
+            asset_name = names[filename]
+            data, digest = sources[filename]
+
+            ui_asset = existing.get(asset_name)
+            if ui_asset is None:
+                ui_asset = UIAsset(name=asset_name)
+            elif not options["force"] and ui_asset.image and ui_asset.image_hash == digest:
+                unchanged += 1
+                continue
+
+            ext = os.path.splitext(filename)[1].lower()
+            jobs.append((ui_asset, filename, data, digest, ext))
 
-            with open(file_path, "rb") as img_file:
-                django_file = File(img_file)
+        if options["reencode"] and jobs:
+            encoded = reencode_all(
+                [(a.name, data, ext) for a, _, data, _, ext in jobs],
+                options["processes"],
+            )
+            jobs = [(a, fn, encoded[a.name], digest, ext) for a, fn, _, digest, ext in jobs]
+            timer.mark("reencode")
 
-                ui_asset, _ = UIAsset.objects.get_or_create(name=asset_name)
-                ui_asset.image.save(filename, django_file, save=True)
+        stored = upload_all(
+            [(a.name, a.image, filename, data) for a, filename, data, _, _ in jobs],
+            workers,
+        )
+        timer.mark("upload")
+
+        to_create = []
+        to_update = []
+        for ui_asset, _, data, digest, _ in jobs:
+            ui_asset.image.name = stored[ui_asset.name]
+            ui_asset.refresh_image_metadata(data)
+            ui_asset.image_hash = digest  # source hash drives skip-unchanged
+            (to_update if ui_asset.pk else to_create).append(ui_asset)
+            self.stdout.write(self.style.SUCCESS(f"✔ Imported UI asset: {ui_asset.name}"))
+
+        UIAsset.objects.bulk_create(to_create, batch_size=200)
+        UIAsset.objects.bulk_update(
+            to_update, ["image", "image_hash", "size", "width", "height"], batch_size=200
+        )
+        timer.mark("db write")
 
-            imported += 1
-            self.stdout.write(self.style.SUCCESS(f"✔ Imported UI asset: {asset_name}"))
+        # bulk writes skip model signals → drop the cached manifest ourselves
+        if jobs:
+            invalidate_manifest()
 
-        self.stdout.write(self.style.SUCCESS(f"\nDone! Imported {imported} UI assets."))
+        self.stdout.write(self.style.SUCCESS(
+            f"\nDone! Imported {len(jobs)} UI assets ({unchanged} unchanged, "
+            f"{len(conflicts)} skipped as duplicate names)."
+        ))
+        for line in timer.lines():
+            self.stdout.write(line)
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.utils.directory_import import KINDS, import_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import rooms, items or users from a CSV file: every row is validated, "
+        "valid rows are upserted in batches, invalid rows are reported with their line number."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=KINDS)
+        parser.add_argument("path", type=str, help="CSV file with a header row.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and count creates/updates without writing.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "IMPORT_BATCH_SIZE", 500),
+            help="Rows per bulk_create / bulk_update.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=getattr(settings, "IMPORT_HASH_PROCESSES", None),
+            help="Process pool size for password hashing (defaults to CPU count; 0 = bounded threads only).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as f:
+                report = import_csv(
+                    options["kind"],
+                    f,
+                    dry_run=options["dry_run"],
+                    batch_size=max(1, options["batch_size"]),
+                    processes=options["processes"],
+                )
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        for error in report.errors:
+            self.stdout.write(self.style.ERROR(f"  line {error['row']}: {error['error']}"))
+
+        verb = "Would import" if report.dry_run else "Imported"
+        summary = (
+            f"{verb} {report.kind}: {report.rows} row(s), {report.created} created, "
+            f"{report.updated} updated, {len(report.errors)} failed "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        style = self.style.WARNING if report.errors else self.style.SUCCESS
+        self.stdout.write(style(("⚠ " if report.errors else "✔ ") + summary))
@@ -0,0 +1,80 @@
+import gzip
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Already-compressed formats (png/jpg/webp) gain nothing from gzip/brotli
+COMPRESSIBLE_EXTS = {".svg", ".css", ".js", ".json", ".txt", ".html", ".xml", ".ico", ".ics", ".csv"}
+
+
+class Command(BaseCommand):
+    help = "Write .gz (and .br if brotli is installed) siblings for compressible media files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            type=str,
+            default=None,
+            help="Folder to scan (defaults to MEDIA_ROOT).",
+        )
+        parser.add_argument(
+            "--min-size",
+            type=int,
+            default=512,
+            help="Skip files smaller than this many bytes.",
+        )
+
+    def handle(self, *args, **options):
+        root = options["path"] or str(settings.MEDIA_ROOT)
+
+        if not os.path.isdir(root):
+            self.stdout.write(self.style.ERROR(f"Invalid folder: {root}"))
+            return
+
+        encoders = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            encoders.append((".br", lambda data: brotli.compress(data, quality=11)))
+        else:
+            self.stdout.write(self.style.WARNING("brotli not installed — writing .gz only."))
+
+        written = 0
+        fresh = 0
+
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                ext = os.path.splitext(filename)[1].lower()
+                if ext not in COMPRESSIBLE_EXTS:
+                    continue
+
+                src = os.path.join(dirpath, filename)
+                if os.path.getsize(src) < options["min_size"]:
+                    continue
+
+                data = None
+                for suffix, encode in encoders:
+                    dst = src + suffix
+                    if os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src):
+                        fresh += 1
+                        continue
+
+                    if data is None:
+                        with open(src, "rb") as fh:
+                            data = fh.read()
+
+                    compressed = encode(data)
+                    if len(compressed) >= len(data):
+                        continue
+
+                    with open(dst, "wb") as fh:
+                        fh.write(compressed)
+                    written += 1
+                    self.stdout.write(self.style.SUCCESS(
+                        f"✔ {os.path.relpath(dst, root)} ({len(data)} → {len(compressed)} bytes)"
+                    ))
+
+        self.stdout.write(self.style.SUCCESS(f"\nDone! Wrote {written} variants ({fresh} already fresh)."))
@@ -0,0 +1,92 @@
+import datetime
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.db_retry import run_with_backoff
+from api.models import PasswordResetCode, RoomReservation
+
+TARGETS = ("codes", "sessions", "reservations")
+
+
+def delete_in_batches(queryset, batch_size, pause=0.0):
+    """
+    Delete matching rows a batch of primary keys at a time, so no single
+    statement locks or scans the whole table. Each batch commits on its
+    own: an interrupted run just continues on the next invocation.
+    """
+    total = 0
+    while True:
+        pks = run_with_backoff(lambda: list(queryset.values_list("pk", flat=True)[:batch_size]))
+        if not pks:
+            return total
+
+        run_with_backoff(lambda: queryset.model.objects.filter(pk__in=pks).delete())
+        total += len(pks)
+
+        if pause:
+            time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = "Delete expired/used reset codes, expired sessions and old cancelled reservations in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            choices=TARGETS,
+            action="append",
+            help="Limit to one target (repeatable). Default: all.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per DELETE.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches (ease load on a busy DB).",
+        )
+        parser.add_argument(
+            "--reservation-days",
+            type=int,
+            default=getattr(settings, "PURGE_CANCELLED_RESERVATIONS_DAYS", 90),
+            help="Delete cancelled reservations dated more than this many days ago.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count what would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        targets = options["only"] or TARGETS
+        cutoff = now.date() - datetime.timedelta(days=options["reservation_days"])
+
+        querysets = {
+            # Used codes can never be entered again; expired ones are rejected in SQL
+            "codes": PasswordResetCode.objects.filter(used=True) | PasswordResetCode.objects.filter(expires_at__lte=now),
+            "sessions": Session.objects.filter(expire_date__lt=now),
+            "reservations": RoomReservation.objects.filter(cancelled=True, date__lt=cutoff),
+        }
+
+        batch_size = max(1, options["batch_size"])
+
+        for target in targets:
+            qs = querysets[target]
+            if options["dry_run"]:
+                self.stdout.write(f"{target:<13} {qs.count()} row(s) would be deleted")
+                continue
+
+            started = time.perf_counter()
+            deleted = delete_in_batches(qs, batch_size, options["pause"])
+            self.stdout.write(self.style.SUCCESS(
+                f"✔ {target:<13} {deleted} row(s) deleted in {time.perf_counter() - started:.2f}s"
+            ))
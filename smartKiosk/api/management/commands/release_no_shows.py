@@ -0,0 +1,57 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.utils.no_shows import release_no_shows
+
+
+class Command(BaseCommand):
+    help = "Release room reservations that were not checked in within the grace period (one UPDATE per sweep)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lookback-hours",
+            type=float,
+            default=getattr(settings, "NO_SHOW_LOOKBACK_HOURS", 12),
+            help="Only consider reservations that started within this many hours.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep sweeping every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help="Seconds between sweeps in --loop mode.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self.sweep(options)
+            return
+
+        interval = max(1.0, options["interval"])
+        self.stdout.write(f"Releasing no-shows every {interval:g}s (Ctrl+C to stop)")
+        try:
+            while True:
+                self.sweep(options)
+                close_old_connections()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def sweep(self, options):
+        try:
+            released = release_no_shows(lookback_hours=options["lookback_hours"])
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"No-show sweep failed: {e}"))
+            return
+
+        if released:
+            self.stdout.write(self.style.SUCCESS(f"✔ Released {released} no-show reservation(s)"))
+        elif options["verbosity"] > 1:
+            self.stdout.write("No no-shows to release.")
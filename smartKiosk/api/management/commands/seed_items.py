@@ -1,96 +1,166 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction, connections, close_old_connections
-from api.models import Category, Item
+import csv
+import json
+import os
 import time
 
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from api.db_retry import run_with_backoff, write_in_batches
+from api.models import Category, Item
 
-class Command(BaseCommand):
-    help = "Seed initial supply categories and items for the kiosk (TiDB safe)"
+DEFAULT_CATALOG = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "catalog.json",
+)
+
+
+def load_catalog(path):
+    """
+    Load catalog definitions from JSON or CSV.
+
+    JSON: { "categories": [ { "key", "name", "items": [name, ...] }, ... ] }
+    CSV:  header row with category_key, category_name, item_name
+
+    Returns (categories, items):
+        categories = { key: display_name }
+        items      = { item_name: category_key }
+    """
+    categories = {}
+    items = {}
+
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".json":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        for cat in data.get("categories", []):
+            key = cat["key"].strip()
+            categories[key] = cat["name"].strip()
+            for name in cat.get("items", []):
+                items[name.strip()] = key
+
+    elif ext == ".csv":
+        with open(path, newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                key = (row.get("category_key") or "").strip()
+                name = (row.get("item_name") or "").strip()
+                if not key or not name:
+                    continue
+                categories.setdefault(key, (row.get("category_name") or key).strip())
+                items[name] = key
+    else:
+        raise CommandError(f"Unsupported catalog format: {ext} (use .json or .csv)")
+
+    return categories, items
 
-    def handle(self, *args, **options):
-        self.stdout.write("Starting TiDB-safe seeding...")
 
-        # ----------------------------------------------------
-        # Categories
-        # ----------------------------------------------------
-        categories = {
-            "Storage Closet": "closet",
-            "Break Room": "break",
-            "K-Cups": "kcup",
-        }
+class Command(BaseCommand):
+    help = "Seed supply categories and items for the kiosk from a catalog file (TiDB safe)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            type=str,
+            default=DEFAULT_CATALOG,
+            help="Catalog definition file (.json or .csv). Defaults to api/data/catalog.json.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Starting rows per INSERT/UPDATE batch (shrinks automatically if TiDB throttles).",
+        )
 
-        category_objects = {}
+    def handle(self, *args, **options):
+        path = options["file"]
+        batch_size = options["batch_size"]
 
-        close_old_connections()  # prevent stale connections
+        if not os.path.isfile(path):
+            raise CommandError(f"Catalog file not found: {path}")
 
-        for name, key in categories.items():
-            cat, _ = Category.objects.get_or_create(
-                key=key,
-                defaults={"name": name},
-            )
-            if cat.name != name:
-                cat.name = name
-                cat.save()
+        started = time.perf_counter()
+        self.stdout.write(f"Starting TiDB-safe seeding from {path}...")
 
-            category_objects[key] = cat
+        categories, items = load_catalog(path)
 
-        self.stdout.write("✓ Categories seeded.")
+        close_old_connections()  # prevent stale connections
 
         # ----------------------------------------------------
-        # Items by category
+        # Categories — diff against existing rows in one query
         # ----------------------------------------------------
-        storage_closet_items = [
-            "Kleenex", "AA Batteries", "Ultra Fine Point Permanent Marker",
-            "Regular Permanent Marker", "Finepoint Permanent Marker",
-            "Black Ballpoint Pen", "Blue Ballpoint Pen",
-            "Standard Paper Clips", "Jumbo Paper Clips", "Staplers",
-            "Blue Dry Erase Markers", "Red Dry Erase Markers",
-            "Black Dry Erase Markers", "Whiteboard Spray", "Scissors",
-            "Yellow Highlighters", "Orange Highlighters", "Pink Highlighters",
-            "Microfiber Cloth", "Micro Binder Clips", "Medium Binder Clips",
-            "Large Binder Clips", "Rubber Bands", "Pencils",
-            "Mechanical Pencil Lead", "Spray Bottles", "All Purpose Cleaner",
-            "Dry Eraser", "Copy Paper", "Dolly",
-        ]
-
-        break_room_items = [
-            "Coffee Cups", "Coffee Lids", "Stir Sticks", "Sugar Packets",
-            "Sugar Container", "Coffee Creamer", "Napkins", "Plates",
-            "Trash Bags", "Small Trash Bags", "Plastic Spoons", "Plastic Forks",
-            "Plastic Knives", "Paper Roll", "Water Filters", "Dish Soap",
-        ]
-
-        k_cup_items = [
-            "Cafe Bustelo", "Dark Magic", "Breakfast Blend",
-            "Breakfast Blend Decaf", "Green Tea",
+        existing_cats = run_with_backoff(
+            lambda: {c.key: c for c in Category.objects.filter(key__in=categories.keys())}
+        )
+
+        new_cats = [
+            Category(key=key, name=name)
+            for key, name in categories.items()
+            if key not in existing_cats
         ]
+        renamed_cats = []
+        for key, cat in existing_cats.items():
+            if cat.name != categories[key]:
+                cat.name = categories[key]
+                renamed_cats.append(cat)
+
+        write_in_batches(
+            new_cats,
+            lambda chunk: Category.objects.bulk_create(chunk, ignore_conflicts=True),
+            batch_size,
+        )
+        write_in_batches(
+            renamed_cats,
+            lambda chunk: Category.objects.bulk_update(chunk, ["name"]),
+            batch_size,
+        )
+
+        # Re-read so freshly inserted categories have primary keys
+        # (bulk_create with ignore_conflicts does not return them)
+        cat_ids = run_with_backoff(
+            lambda: dict(Category.objects.filter(key__in=categories.keys()).values_list("key", "id"))
+        )
+
+        self.stdout.write(
+            f"✓ Categories seeded ({len(new_cats)} new, {len(renamed_cats)} renamed)."
+        )
 
         # ----------------------------------------------------
-        # SAFE batch insertion method
+        # Items — one query for every existing row
         # ----------------------------------------------------
-        def seed_items(batch, category_key):
-            cat = category_objects[category_key]
-
-            # break into small balanced chunks
-            for i in range(0, len(batch), 5):  # 5 items per commit
-                chunk = batch[i:i+5]
-
-                close_old_connections()  # important for TiDB
-
-                with transaction.atomic():
-                    for name in chunk:
-                        Item.objects.get_or_create(name=name, category=cat)
-
-                # tiny delay helps with TiDB throttling
-                time.sleep(0.3)
-
-        seed_items(storage_closet_items, "closet")
-        self.stdout.write("✓ Storage Closet items done.")
-
-        seed_items(break_room_items, "break")
-        self.stdout.write("✓ Break Room items done.")
-
-        seed_items(k_cup_items, "kcup")
-        self.stdout.write("✓ K-Cups items done.")
-
-        self.stdout.write(self.style.SUCCESS("🎉 ALL ITEMS SEEDED SUCCESSFULLY"))
+        existing_items = run_with_backoff(
+            lambda: {
+                i.name: i
+                for i in Item.objects.filter(name__in=items.keys()).only("id", "name", "category_id")
+            }
+        )
+
+        new_items = []
+        moved_items = []
+        for name, key in items.items():
+            category_id = cat_ids[key]
+            item = existing_items.get(name)
+            if item is None:
+                new_items.append(Item(name=name, category_id=category_id))
+            elif item.category_id != category_id:
+                item.category_id = category_id
+                moved_items.append(item)
+
+        write_in_batches(
+            new_items,
+            lambda chunk: Item.objects.bulk_create(chunk, ignore_conflicts=True),
+            batch_size,
+        )
+        write_in_batches(
+            moved_items,
+            lambda chunk: Item.objects.bulk_update(chunk, ["category"]),
+            batch_size,
+        )
+
+        self.stdout.write(
+            f"✓ Items seeded ({len(new_items)} new, {len(moved_items)} re-categorized, "
+            f"{len(items) - len(new_items) - len(moved_items)} unchanged)."
+        )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"🎉 ALL ITEMS SEEDED SUCCESSFULLY in {elapsed:.2f}s"))
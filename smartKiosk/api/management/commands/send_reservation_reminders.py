@@ -0,0 +1,67 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.utils.reservation_reminders import send_due_reminders
+
+
+class Command(BaseCommand):
+    help = "Email reminders for room reservations starting within the next N minutes (once per reservation)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            default=getattr(settings, "RESERVATION_REMINDER_MINUTES", 30),
+            help="Remind reservations starting within this many minutes.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "RESERVATION_REMINDER_BATCH_SIZE", 50),
+            help="Emails per SMTP connection.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Run as a daemon, checking every --tick seconds.",
+        )
+        parser.add_argument(
+            "--tick",
+            type=float,
+            default=getattr(settings, "RESERVATION_REMINDER_TICK_SECONDS", 60),
+            help="Seconds between checks in --loop mode.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self.tick(options)
+            return
+
+        tick = max(1.0, options["tick"])
+        self.stdout.write(
+            f"Sending reminders {options['minutes']} min ahead, checking every {tick:g}s (Ctrl+C to stop)"
+        )
+        try:
+            while True:
+                started = time.monotonic()
+                self.tick(options)
+                close_old_connections()
+                time.sleep(max(0.0, tick - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def tick(self, options):
+        try:
+            claimed, sent = send_due_reminders(options["minutes"], options["batch_size"])
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Reminder tick failed: {e}"))
+            return
+
+        if claimed:
+            style = self.style.SUCCESS if sent == claimed else self.style.WARNING
+            self.stdout.write(style(f"✔ Reminders: {sent}/{claimed} sent"))
+        elif options["verbosity"] > 1:
+            self.stdout.write("No reservations due.")
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.utils.supply_digest import digest_enabled, send_pending_digest
+
+
+class Command(BaseCommand):
+    help = "Send one consolidated supply request email per recipient for all pending requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and send a digest every --interval minutes (worker mode).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=getattr(settings, "SUPPLY_DIGEST_INTERVAL_MINUTES", 15),
+            help="Minutes between digests in --loop mode (default: SUPPLY_DIGEST_INTERVAL_MINUTES).",
+        )
+
+    def handle(self, *args, **options):
+        if not digest_enabled():
+            self.stdout.write(self.style.WARNING(
+                "SUPPLY_DIGEST_ENABLED is off — requests are emailed immediately; "
+                "only flushing anything still pending."
+            ))
+
+        if not options["loop"]:
+            self.send_once()
+            return
+
+        interval = max(0.1, options["interval"]) * 60
+        self.stdout.write(f"Sending supply digests every {interval / 60:g} min (Ctrl+C to stop)")
+        try:
+            while True:
+                self.send_once()
+                # Long-lived worker: drop stale DB connections between runs
+                close_old_connections()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def send_once(self):
+        try:
+            included, sent = send_pending_digest()
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Digest failed (will retry): {e}"))
+            return
+
+        if included:
+            self.stdout.write(self.style.SUCCESS(
+                f"✔ Digest sent: {included} request(s) → {sent} email(s)"
+            ))
+        else:
+            self.stdout.write("No pending supply requests.")
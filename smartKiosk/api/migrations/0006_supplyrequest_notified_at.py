@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:14
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_notified(apps, schema_editor):
+    # Requests created before digest mode were already emailed one by one
+    SupplyRequest = apps.get_model("api", "SupplyRequest")
+    SupplyRequest.objects.filter(notified_at__isnull=True).update(notified_at=F("requested_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_uiasset_manifest_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplyrequest',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_notified, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_supplyrequest_notified_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplyrecipient',
+            name='categories',
+            field=models.ManyToManyField(blank=True, related_name='supply_recipients', to='api.category'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_roomreservation_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='roomreservation',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:19
+
+from datetime import timedelta
+
+import api.models
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_expires_at(apps, schema_editor):
+    # AddField stamped every existing row with "now + TTL"; use the real lifetime
+    PasswordResetCode = apps.get_model("api", "PasswordResetCode")
+    PasswordResetCode.objects.update(expires_at=F("created_at") + timedelta(minutes=10))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_roomreservation_checked_in_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='passwordresetcode',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=api.models.reset_code_expiry),
+        ),
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='passwordresetcode',
+            index=models.Index(fields=['user', 'used', 'expires_at'], name='reset_user_live_idx'),
+        ),
+    ]
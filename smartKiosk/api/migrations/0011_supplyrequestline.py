@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:30
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_lines(apps, schema_editor):
+    # One line per distinct name in each SupplyRequest.items JSON list,
+    # a batch of requests at a time (pk-ordered, nothing held in memory)
+    SupplyRequest = apps.get_model("api", "SupplyRequest")
+    SupplyRequestLine = apps.get_model("api", "SupplyRequestLine")
+    Item = apps.get_model("api", "Item")
+
+    item_ids = dict(Item.objects.values_list("name", "id"))
+    last_pk = 0
+
+    while True:
+        batch = list(
+            SupplyRequest.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values("pk", "items", "requested_at")[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+
+        lines = []
+        for row in batch:
+            names = row["items"] if isinstance(row["items"], list) else [row["items"]]
+            for name, qty in Counter(str(n) for n in names if n).items():
+                lines.append(SupplyRequestLine(
+                    request_id=row["pk"],
+                    item_id=item_ids.get(name),  # NULL for items deleted since
+                    item_name=name[:200],
+                    qty=qty,
+                    requested_at=row["requested_at"],
+                ))
+        SupplyRequestLine.objects.bulk_create(lines, batch_size=BATCH_SIZE)
+        last_pk = batch[-1]["pk"]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_passwordresetcode_expires_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplyRequestLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_name', models.CharField(max_length=200)),
+                ('qty', models.PositiveIntegerField(default=1)),
+                ('requested_at', models.DateTimeField(db_index=True)),
+                ('item', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_lines', to='api.item')),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='api.supplyrequest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['item', 'requested_at'], name='supply_line_item_time_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_lines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_item_daily_cap'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('through', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SupplyUserRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('user_id', models.IntegerField()),
+                ('full_name', models.CharField(blank=True, default='', max_length=255)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'user_id'], name='supply_user_rollup_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SupplyItemRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('item_name', models.CharField(max_length=200)),
+                ('category_key', models.CharField(blank=True, default='', max_length=50)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('item', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.item')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'item'], name='supply_item_rollup_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:05
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_supply_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='item',
+            name='daily_cap',
+            field=models.PositiveIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+    ]
@@ -1,7 +1,8 @@
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
 
 def banner_upload_path(instance, filename):
@@ -64,16 +65,47 @@ class Item(models.Model):
         help_text="Upload an image like 'Kleenex.png'"
     )
 
+    # sha256 of the last imported source file (lets bulk imports skip unchanged images)
+    image_hash = models.CharField(max_length=64, blank=True, default="")
+
     # Track popularity
     request_count = models.IntegerField(default=0)
 
     # Let admin hide items
     is_active = models.BooleanField(default=True)
 
+    # Max total quantity requested per day across all kiosks (empty = no cap;
+    # 0 would lock the item for good, so the minimum is 1)
+    daily_cap = models.PositiveIntegerField(null=True, blank=True, validators=[MinValueValidator(1)])
+
     def __str__(self):
         return f"{self.name} ({self.category.key})"
 
 
+# ---------------------------------------------------------
+# PER-ITEM DAILY USAGE (cap counters)
+# One row per (item, day); api/utils/supply_caps.py reserves quantity
+# with a conditional UPDATE on it.
+# ---------------------------------------------------------
+class ItemDailyUsage(models.Model):
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.CASCADE,
+        related_name="daily_usage",
+        db_index=False,  # covered by item_daily_usage_uniq
+    )
+    day = models.DateField()
+    used = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["item", "day"], name="item_daily_usage_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.item_id} on {self.day}: {self.used}"
+
+
 # ---------------------------------------------------------
 # SUPPLY REQUEST MODEL
 # ---------------------------------------------------------
@@ -83,11 +115,98 @@ class SupplyRequest(models.Model):
     email = models.EmailField(blank=True, null=True)
     items = models.JSONField()
     requested_at = models.DateTimeField(auto_now_add=True)
+    # NULL until the admin email (immediate or digest) has gone out
+    notified_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     def __str__(self):
         return f"Request #{self.id} from {self.full_name or self.user_id}"
 
 
+# ---------------------------------------------------------
+# SUPPLY REQUEST LINES
+# One row per requested item, so reports and today's locks are
+# indexed SQL instead of decoding SupplyRequest.items in Python.
+# item_name keeps the name as requested (survives renames/deletes).
+# ---------------------------------------------------------
+class SupplyRequestLine(models.Model):
+    request = models.ForeignKey(
+        SupplyRequest,
+        on_delete=models.CASCADE,
+        related_name="lines",
+    )
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="request_lines",
+        db_index=False,  # covered by supply_line_item_time_idx
+    )
+    item_name = models.CharField(max_length=200)
+    qty = models.PositiveIntegerField(default=1)
+    # Copy of request.requested_at so per-item/per-day queries need no join
+    requested_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["item", "requested_at"], name="supply_line_item_time_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.item_name} x{self.qty} (request #{self.request_id})"
+
+
+# ---------------------------------------------------------
+# SUPPLY ROLLUPS (analytics)
+# Per local day totals built from SupplyRequestLine by
+# `manage.py rollup_supply_requests`; /api/supplies/analytics/ reads
+# these instead of the request history.
+# ---------------------------------------------------------
+class SupplyItemRollup(models.Model):
+    day = models.DateField()
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_index=False,
+    )
+    item_name = models.CharField(max_length=200)
+    category_key = models.CharField(max_length=50, blank=True, default="")
+    requests = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["day", "item"], name="supply_item_rollup_idx")]
+
+    def __str__(self):
+        return f"{self.day} {self.item_name}: {self.units}"
+
+
+class SupplyUserRollup(models.Model):
+    day = models.DateField()
+    user_id = models.IntegerField()  # same meaning as SupplyRequest.user_id (0 = kiosk guest)
+    full_name = models.CharField(max_length=255, blank=True, default="")
+    requests = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["day", "user_id"], name="supply_user_rollup_idx")]
+
+    def __str__(self):
+        return f"{self.day} user {self.user_id}: {self.units}"
+
+
+class RollupWatermark(models.Model):
+    """Last local day a rollup is complete for (one row per rollup name)."""
+    name = models.CharField(max_length=50, unique=True)
+    through = models.DateField()
+
+    def __str__(self):
+        return f"{self.name} through {self.through}"
+
+
 # ---------------------------------------------------------
 # ITEM POPULARITY MODEL
 # ---------------------------------------------------------
@@ -144,14 +263,34 @@ class RoomReservation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Set once the "starting soon" reminder has been emailed
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
+
+    # Card swipe at the kiosk; reservations never checked in are released
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         db_table = "room_reservations"
         ordering = ["date", "start_time"]
+        indexes = [
+            # Due-window scans (reminders) are range queries on these two
+            models.Index(fields=["date", "start_time"], name="resv_date_start_idx"),
+        ]
 
     def __str__(self):
         return f"{self.room.name} on {self.date} ({self.start_time}-{self.end_time})"
 
 
+# Booking / cancelling through save() changes availability for that date
+# (bulk .update() paths call bump_dates themselves)
+@receiver(post_save, sender=RoomReservation)
+@receiver(post_delete, sender=RoomReservation)
+def invalidate_room_availability(sender, instance, **kwargs):
+    from api.utils.availability import bump_dates
+
+    bump_dates([instance.date])
+
+
 def ui_asset_upload_path(instance, filename):
     """
     Save UI assets (like banners, favicons, backgrounds)
@@ -167,8 +306,46 @@ class UIAsset(models.Model):
     name = models.CharField(max_length=200, unique=True)
     image = models.ImageField(upload_to=ui_asset_upload_path)
 
+    # sha256 of the last imported source file
+    image_hash = models.CharField(max_length=64, blank=True, default="")
+
+    # Manifest metadata (filled on upload, or lazily by the manifest builder)
+    size = models.PositiveIntegerField(default=0)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+
     def __str__(self):
         return self.name
+
+    def refresh_image_metadata(self, data=None):
+        """Recompute hash / size / dimensions from the image bytes."""
+        from api.utils.image_import import hash_bytes, image_dimensions
+
+        if data is None:
+            self.image.open("rb")
+            try:
+                data = self.image.read()
+            finally:
+                self.image.seek(0)
+
+        self.image_hash = hash_bytes(data)
+        self.size = len(data)
+        self.width, self.height = image_dimensions(data)
+
+    def save(self, *args, **kwargs):
+        # New upload (admin / API) → metadata must match the new file
+        if self.image and not self.image._committed:
+            self.refresh_image_metadata()
+        super().save(*args, **kwargs)
+
+
+# Any change to a UI asset invalidates the cached manifest
+@receiver(post_save, sender=UIAsset)
+@receiver(post_delete, sender=UIAsset)
+def invalidate_ui_asset_manifest(sender, **kwargs):
+    from kiosks.ui_assets import invalidate_manifest
+
+    invalidate_manifest()
     
 
 # ---------------------------------------------------------
@@ -179,6 +356,13 @@ class SupplyRecipient(models.Model):
     last_name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)
 
+    # Categories this person fulfils; none = receives every category
+    categories = models.ManyToManyField(
+        Category,
+        blank=True,
+        related_name="supply_recipients",
+    )
+
     class Meta:
         db_table = "api_supplyrecipient"
 
@@ -186,9 +370,30 @@ class SupplyRecipient(models.Model):
         return f"{self.first_name} {self.last_name} <{self.email}>"
 
 
+# Recipient, category or item changes invalidate the cached routing table
+@receiver(post_save, sender=SupplyRecipient)
+@receiver(post_delete, sender=SupplyRecipient)
+@receiver(m2m_changed, sender=SupplyRecipient.categories.through)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def invalidate_supply_routing(sender, **kwargs):
+    from api.utils.supply_routing import invalidate_routing
+
+    invalidate_routing()
+
+
 # ---------------------------------------------------------
 # PASSWORD RESET CODE MODEL
 # ---------------------------------------------------------
+def reset_code_expiry():
+    from datetime import timedelta
+    from django.conf import settings
+
+    return timezone.now() + timedelta(minutes=getattr(settings, "PASSWORD_RESET_CODE_TTL_MINUTES", 10))
+
+
 class PasswordResetCode(models.Model):
     user = models.ForeignKey(
         User,
@@ -199,13 +404,19 @@ class PasswordResetCode(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     used = models.BooleanField(default=False)
 
+    # Stored so expiry is a SQL filter (login check, purge_expired)
+    expires_at = models.DateTimeField(default=reset_code_expiry, db_index=True)
+
+    class Meta:
+        indexes = [
+            # "live codes for this user": login check + invalidation on new request
+            models.Index(fields=["user", "used", "expires_at"], name="reset_user_live_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.email} – {self.code}"
 
     @property
     def is_expired(self):
-        # 10-minute lifetime
-        from datetime import timedelta
-
-        return self.created_at < timezone.now() - timedelta(minutes=10)
+        return self.expires_at <= timezone.now()
     
\ No newline at end of file
@@ -1,3 +1,1299 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import get_hasher, identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, InternalError, OperationalError, connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from pymysql import err as pymysql_err
+
+from accounts.models import UserCard, UserProfile
+from api import db_retry, events
+from api.utils.email_templates import (
+    render_bulk_cancellation_csv,
+    render_bulk_cancellation_email,
+    render_supply_request_email,
+)
+from api.models import (
+    Category,
+    Item,
+    ItemPopularity,
+    PasswordResetCode,
+    Room,
+    RoomReservation,
+    SupplyItemRollup,
+    SupplyRecipient,
+    SupplyRequest,
+    SupplyRequestLine,
+    UIAsset,
+)
+from api.utils import (
+    availability,
+    directory_import,
+    exports,
+    no_shows,
+    password_hashing,
+    ratelimit,
+    reservation_reminders,
+    supply_caps,
+    supply_digest,
+    supply_routing,
+)
+from kiosks import settings as project_settings
+from kiosks import ui_assets
+from kiosks.middleware import CompressionMiddleware
+
+# ---------------------------------------------------------
+# QUERY-COUNT CONTRACTS
+# Each list endpoint is hit at several data sizes; the number of
+# queries must not grow with the data (no N+1). Response times are
+# recorded and, with KIOSK_TEST_TIMINGS=1, printed at the end of the run.
+#   KIOSK_SQLITE=1 python manage.py test api
+# ---------------------------------------------------------
+SCALES = (10, 100, 1000)
+
+TIMINGS = {}
+
+
+class ScaledData:
+    """Grows the fixture set incrementally with bulk inserts (no signals)."""
+
+    def __init__(self):
+        self.users = 0
+        self.today = timezone.localdate()
+        self.rooms = Room.objects.bulk_create(
+            [Room(name=f"ERSA {100 + n}", capacity=8) for n in range(5)]
+        )
+        self.category = Category.objects.create(name="Storage Closet", key="closet")
+        self.admin = User.objects.create_user("admin@mavs.uta.edu", "admin@mavs.uta.edu", "pw", is_staff=True)
+
+    def grow_to(self, n):
+        new = n - self.users
+        if new <= 0:
+            return
+
+        start = self.users
+        users = User.objects.bulk_create([
+            User(username=f"user{i}@mavs.uta.edu", email=f"user{i}@mavs.uta.edu", first_name="User", last_name=str(i))
+            for i in range(start, n)
+        ])
+        # Every 10th user has no profile: exercises the fallback path
+        UserProfile.objects.bulk_create([
+            UserProfile(user=u, full_name=f"User {start + k}")
+            for k, u in enumerate(users) if (start + k) % 10
+        ])
+
+        RoomReservation.objects.bulk_create([
+            RoomReservation(
+                room=self.rooms[i % len(self.rooms)],
+                user=self.admin if i % 2 else users[i - start],
+                full_name=f"User {i}",
+                email=f"user{i}@mavs.uta.edu",
+                date=self.today + datetime.timedelta(days=i % 3),
+                start_time=datetime.time(8 + i % 10, 0),
+                end_time=datetime.time(9 + i % 10, 0),
+            )
+            for i in range(start, n)
+        ])
+
+        Item.objects.bulk_create([Item(name=f"Item {i}", category=self.category) for i in range(start, n)])
+        ItemPopularity.objects.bulk_create([
+            ItemPopularity(item_name=f"Item {i}", category="closet", count=i) for i in range(start, n)
+        ])
+
+        self.users = n
+
+
+class QueryCountTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if TIMINGS and os.environ.get("KIOSK_TEST_TIMINGS"):
+            print("\n-------- RESPONSE TIMES (ms) --------")
+            print(f"{'endpoint':<32}" + "".join(f"{n:>10}" for n in SCALES))
+            for name, row in sorted(TIMINGS.items()):
+                print(f"{name:<32}" + "".join(f"{row.get(n, 0):>10.1f}" for n in SCALES))
+
+    def setUp(self):
+        cache.clear()
+        self.data = ScaledData()
+        self.client.force_login(self.data.admin)
+
+    def measure(self, name, url):
+        """[(scale, queries)] for `url` at every scale; records timings."""
+        counts = []
+        for n in SCALES:
+            self.data.grow_to(n)
+            cache.clear()  # cached endpoints must be measured cold
+
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = self.client.get(url)
+                elapsed = (time.perf_counter() - start) * 1000
+
+            self.assertEqual(response.status_code, 200, response.content[:200])
+            TIMINGS.setdefault(name, {})[n] = elapsed
+            counts.append((n, len(ctx.captured_queries)))
+        return counts
+
+    def assertConstantQueries(self, name, url):
+        counts = self.measure(name, url)
+        self.assertEqual(
+            len({q for _, q in counts}), 1,
+            f"{url} query count grows with data (N+1?): {counts}",
+        )
+
+    def test_get_all_users(self):
+        self.assertConstantQueries("users", "/api/users/")
+
+    def test_get_all_users_compact(self):
+        self.assertConstantQueries("users (compact)", "/api/users/?format=compact")
+
+    def test_my_room_reservations(self):
+        self.assertConstantQueries("reservations/my", "/api/rooms/reservations/my/")
+
+    def test_all_room_reservations(self):
+        self.assertConstantQueries("reservations/all", "/api/rooms/reservations/all/")
+
+    def test_reservations_by_date(self):
+        day = timezone.localdate().isoformat()
+        self.assertConstantQueries("reservations/by-date", f"/api/rooms/reservations/by-date/?date={day}")
+
+    def test_get_items(self):
+        self.assertConstantQueries("items", "/api/items/")
+
+    def test_get_all_items(self):
+        self.assertConstantQueries("items/all", "/api/items/all/")
+
+    def test_get_popular_items(self):
+        self.assertConstantQueries("supplies/popular", "/api/supplies/popular/")
+
+    def test_get_rooms(self):
+        self.assertConstantQueries("rooms", "/api/rooms/")
+
+    def test_profile_fallback_names(self):
+        self.data.grow_to(SCALES[0])
+        users = {u["email"]: u["fullName"] for u in self.client.get("/api/users/").json()["users"]}
+        self.assertEqual(users["user1@mavs.uta.edu"], "User 1")
+        # user0 has no UserProfile → first + last name
+        self.assertEqual(users["user0@mavs.uta.edu"], "User 0")
+
+    def test_by_date_cache_serves_without_queries(self):
+        self.data.grow_to(SCALES[0])
+        url = f"/api/rooms/reservations/by-date/?date={timezone.localdate().isoformat()}"
+        first = self.client.get(url).json()
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(url).json()
+
+        self.assertEqual(first, second)
+        reservation_queries = [q for q in ctx.captured_queries if "room_reservations" in q["sql"]]
+        self.assertEqual(reservation_queries, [])
+
+    def test_by_date_payload_from_before_a_bump_is_not_cached(self):
+        self.data.grow_to(SCALES[0])
+        day = timezone.localdate()
+        url = f"/api/rooms/reservations/by-date/?date={day.isoformat()}"
+
+        # A booking lands between the query and the cache write
+        def bump_then_store(date, version, payload):
+            availability.bump_dates([date])
+            availability.set_cached(date, version, payload)
+
+        with mock.patch("api.views.set_cached_availability", bump_then_store):
+            self.client.get(url)
+        self.assertIsNone(availability.get_cached(day, availability.date_version(day)))
+
+
+# ---------------------------------------------------------
+# ASYNC VIEWS
+# Reservation create, supply request, cancellations and password
+# reset run as async views; exercised here through the ASGI handler.
+# ---------------------------------------------------------
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    RATE_LIMIT_ENABLED=False,
+    SUPPLY_DIGEST_ENABLED=False,
+)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.room = Room.objects.create(name="ERSA 101", capacity=8)
+        self.user = User.objects.create_user("user@mavs.uta.edu", "user@mavs.uta.edu", "pw")
+        UserProfile.objects.update_or_create(user=self.user, defaults={"full_name": "Test User"})
+        self.admin = User.objects.create_user("admin@mavs.uta.edu", "admin@mavs.uta.edu", "pw", is_staff=True)
+        self.day = timezone.localdate() + datetime.timedelta(days=7)
+
+    async def post(self, url, payload=None, as_user=None):
+        if as_user is not None:
+            await self.async_client.aforce_login(as_user)
+        return await self.async_client.post(url, payload or {}, content_type="application/json")
+
+    async def reserve(self, start, end):
+        return await self.post("/api/rooms/reserve/", {
+            "roomId": self.room.id,
+            "date": self.day.isoformat(),
+            "startTime": start,
+            "endTime": end,
+        }, as_user=self.user)
+
+    async def test_reserve_then_conflict(self):
+        response = await self.reserve("10:00", "11:00")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.json()["emailSent"])
+        self.assertEqual(len(mail.outbox), 1)
+
+        response = await self.reserve("10:30", "11:30")
+        self.assertEqual(response.status_code, 409)
+
+    async def test_overnight_reservation_blocks_next_morning(self):
+        self.assertEqual((await self.reserve("23:00", "02:00")).status_code, 201)
+        self.day += datetime.timedelta(days=1)
+        self.assertEqual((await self.reserve("01:00", "03:00")).status_code, 409)
+        self.assertEqual((await self.reserve("02:00", "03:00")).status_code, 201)
+
+    async def test_cancel_own_and_foreign(self):
+        reservation = await RoomReservation.objects.acreate(
+            room=self.room, user=self.user, full_name="Test User", email=self.user.email,
+            date=self.day, start_time=datetime.time(9), end_time=datetime.time(10),
+        )
+        url = f"/api/rooms/reservations/{reservation.id}/cancel/"
+
+        self.assertEqual((await self.post(url, as_user=self.admin)).status_code, 403)
+        self.assertEqual((await self.post(url, as_user=self.user)).status_code, 200)
+        await reservation.arefresh_from_db()
+        self.assertTrue(reservation.cancelled)
+        self.assertEqual(len(mail.outbox), 1)
+
+    async def test_admin_and_bulk_cancel(self):
+        reservations = [
+            await RoomReservation.objects.acreate(
+                room=self.room, user=self.user, full_name="Test User", email=self.user.email,
+                date=self.day, start_time=datetime.time(8 + n), end_time=datetime.time(9 + n),
+            )
+            for n in range(3)
+        ]
+
+        url = f"/api/rooms/reservations/{reservations[0].id}/admin-cancel/"
+        self.assertEqual((await self.post(url, {"reason": "Maintenance"}, as_user=self.user)).status_code, 403)
+        self.assertEqual((await self.post(url, {"reason": "Maintenance"}, as_user=self.admin)).status_code, 200)
+
+        response = await self.post(
+            "/api/rooms/reservations/cancel-bulk/",
+            {"ids": [r.id for r in reservations]},
+            as_user=self.user,
+        )
+        self.assertEqual(response.json()["cancelledCount"], 2)
+        self.assertEqual(await RoomReservation.objects.filter(cancelled=True).acount(), 3)
+        self.assertEqual(len(mail.outbox), 2)
+
+    async def test_supply_request(self):
+        category = await Category.objects.acreate(name="Break Room", key="break")
+        item = await Item.objects.acreate(name="Coffee", category=category)
+
+        response = await self.post("/api/supplies/request/", {"items": [item.id], "fullName": "Kiosk"})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.json()["emailSent"])
+        self.assertEqual(response.json()["lockedItems"], ["Coffee"])
+
+        supply_request = await SupplyRequest.objects.aget()
+        self.assertIsNotNone(supply_request.notified_at)
+        line = await supply_request.lines.aget()
+        self.assertEqual((line.item_id, line.item_name, line.qty), (item.id, "Coffee", 1))
+
+        # Lock list comes from the line table: a rename shows up immediately
+        item.name = "Dark Roast"
+        await item.asave()
+        response = await self.post("/api/supplies/request/", {"items": [item.id], "fullName": "Kiosk"})
+        self.assertEqual(response.json()["lockedItems"], ["Dark Roast"])
+        self.assertEqual((await ItemPopularity.objects.aget(item_name="Coffee")).count, 1)
+
+    async def test_supply_quantities_and_daily_cap(self):
+        category = await Category.objects.acreate(name="Break Room", key="break")
+        coffee = await Item.objects.acreate(name="Coffee", category=category, daily_cap=5)
+        cups = await Item.objects.acreate(name="Cups", category=category)
+
+        response = await self.post("/api/supplies/request/", {"items": [{"id": coffee.id, "qty": 3}]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["lockedItems"], [])  # 2 left today
+        supply_request = await SupplyRequest.objects.aget()
+        self.assertEqual(supply_request.items, ["Coffee"] * 3)
+        self.assertEqual((await supply_request.lines.aget()).qty, 3)
+        self.assertEqual((await ItemPopularity.objects.aget(item_name="Coffee")).count, 3)
+        html = mail.outbox[0].alternatives[0][0]
+        self.assertIn("/Coffee/Coffee.png", html)
+        self.assertIn("Coffee ×3", html)
+
+        # Repeated IDs add up; 3 more would exceed the cap → nothing saved,
+        # not even the uncapped line in the same request
+        response = await self.post("/api/supplies/request/", {"items": [coffee.id, coffee.id, coffee.id, cups.id]})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["capExceeded"][0]["remaining"], 2)
+        self.assertEqual(await SupplyRequest.objects.acount(), 1)
+
+        response = await self.post("/api/supplies/request/", {"items": [{"id": coffee.id, "qty": 2}, cups.id]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sorted(response.json()["lockedItems"]), ["Coffee", "Cups"])
+
+        response = await self.post("/api/supplies/request/", {"items": [{"id": cups.id, "qty": 0}]})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_password_reset(self):
+        response = await self.post("/api/password-reset/request/", {"email": "user@mavs.uta.edu"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await PasswordResetCode.objects.filter(used=False).acount(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+        # Unknown email: same answer, nothing sent
+        response = await self.post("/api/password-reset/request/", {"email": "nobody@mavs.uta.edu"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 1)
+
+
+# ---------------------------------------------------------
+# SSE PUSH CHANNEL  (/api/events/)
+# ---------------------------------------------------------
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EVENTS_BACKEND="api.events.InProcessBackend",
+    EVENTS_REPLAY_SIZE=3,
+)
+class EventStreamTests(TestCase):
+    def setUp(self):
+        events._backend = None  # fresh backend per test
+        self.user = User.objects.create_user("user@mavs.uta.edu", "user@mavs.uta.edu", "pw")
+        self.room = Room.objects.create(name="ERSA 101", capacity=8)
+
+    def tearDown(self):
+        events._backend = None
+
+    async def next_chunk(self, stream):
+        chunk = await asyncio.wait_for(stream.__anext__(), 2)
+        return chunk.decode() if isinstance(chunk, bytes) else chunk
+
+    def test_replay_and_resync(self):
+        backend = events.get_backend()
+        for n in range(5):
+            backend.publish("catalog.changed", {"itemId": n})
+
+        missed, complete = backend.backlog(3)
+        self.assertEqual([e.id for e in missed], [4, 5])
+        self.assertTrue(complete)
+
+        # id 1 is gone from a 3-event backlog → client must refetch
+        missed, complete = backend.backlog(0)
+        self.assertEqual([e.id for e in missed], [3, 4, 5])
+        self.assertFalse(complete)
+
+        # Id from before a restart: nothing to replay
+        self.assertEqual(backend.backlog(99), ([], True))
+
+    async def test_stream_receives_published_events(self):
+        response = await self.async_client.get("/api/events/?types=reservation.created")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await self.next_chunk(stream)).startswith("retry:"))
+
+        events.publish("banner.changed", {"bannerId": 1})  # filtered out
+        await self.async_client.aforce_login(self.user)
+        day = (timezone.localdate() + datetime.timedelta(days=3)).isoformat()
+        await self.async_client.post("/api/rooms/reserve/", {
+            "roomId": self.room.id, "date": day, "startTime": "09:00", "endTime": "10:00",
+        }, content_type="application/json")
+
+        chunk = await self.next_chunk(stream)
+        self.assertIn("event: reservation.created", chunk)
+        self.assertIn(f'"roomId":{self.room.id}', chunk.replace(" ", ""))
+        self.assertNotIn("user@mavs.uta.edu", chunk)
+
+        # Client disconnect: ASGI cancels the task waiting for the next event
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(events.get_backend().subscriber_count(), 0)
+
+    def test_publish_failure_is_logged_not_raised(self):
+        with mock.patch.object(events.get_backend(), "publish", side_effect=RuntimeError("broker down")), \
+                self.assertLogs("api.events", "ERROR"):
+            self.assertIsNone(events.publish("catalog.changed", {"itemId": 1}))
+
+    def test_wsgi_replays_backlog_and_closes(self):
+        events.publish("banner.changed", {"bannerId": 1})
+        events.publish("items.locked", {"items": ["Coffee"]})
+
+        response = self.client.get("/api/events/", HTTP_LAST_EVENT_ID="1")
+        body = b"".join(response.streaming_content).decode()
+        self.assertNotIn("banner.changed", body)
+        self.assertIn("event: items.locked", body)
+
+
+# ---------------------------------------------------------
+# SUPPLY ANALYTICS (rollups)
+# ---------------------------------------------------------
+class SupplyAnalyticsTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin@mavs.uta.edu", "admin@mavs.uta.edu", "pw", is_staff=True)
+        self.client.force_login(self.admin)
+        closet = Category.objects.create(name="Storage Closet", key="closet")
+        kcup = Category.objects.create(name="K-Cups", key="kcup")
+        self.pens = Item.objects.create(name="Pens", category=closet)
+        self.roast = Item.objects.create(name="Dark Roast", category=kcup)
+        self.today = supply_caps.supply_day()
+
+        # 10 days of history: day n has n+1 requests from two users
+        for n in range(10):
+            day = self.today - datetime.timedelta(days=n)
+            for k in range(n + 1):
+                items = [self.pens] if k % 2 else [self.pens, self.roast]
+                supply_request, _ = supply_caps.record_request(
+                    1 + k % 2, f"User {1 + k % 2}", "", items, {i.id: 1 + k % 3 for i in items}, day
+                )
+                stamp = supply_caps.day_start(day) + datetime.timedelta(hours=9)
+                SupplyRequest.objects.filter(pk=supply_request.pk).update(requested_at=stamp)
+                SupplyRequestLine.objects.filter(request=supply_request).update(requested_at=stamp)
+
+    def get(self, **params):
+        query = "&".join(f"{k}={v}" for k, v in params.items())
+        response = self.client.get(f"/api/supplies/analytics/?{query}")
+        self.assertEqual(response.status_code, 200, response.content[:200])
+        return response.json()
+
+    def all_groups(self):
+        start = (self.today - datetime.timedelta(days=13)).isoformat()
+        return {
+            group: self.get(group=group, **{"from": start})
+            for group in ("day", "week", "item", "category", "user")
+        }
+
+    def test_rollups_match_live_aggregation(self):
+        live = self.all_groups()
+        self.assertIsNone(live["day"]["rolledUpThrough"])
+
+        call_command("rollup_supply_requests", stdout=StringIO())
+        self.assertTrue(SupplyItemRollup.objects.exists())
+        rolled = self.all_groups()
+        self.assertEqual(rolled["day"]["rolledUpThrough"], (self.today - datetime.timedelta(days=1)).isoformat())
+
+        for group in live:
+            self.assertEqual(live[group]["series"], rolled[group]["series"], group)
+            self.assertEqual(live[group]["totals"], rolled[group]["totals"], group)
+
+        day = rolled["day"]
+        self.assertEqual(len(day["series"]), 14)  # zero-filled
+        self.assertEqual(day["totals"]["requests"], sum(range(1, 11)))
+        self.assertEqual(day["series"][-1]["requests"], 1)  # today, served live
+
+        categories = {b["label"]: b for b in rolled["category"]["series"]}
+        self.assertEqual(set(categories), {"Storage Closet", "K-Cups"})
+
+    def test_rolled_query_does_not_touch_lines(self):
+        call_command("rollup_supply_requests", stdout=StringIO())
+        with CaptureQueriesContext(connection) as ctx:
+            self.get(group="item", **{"from": (self.today - datetime.timedelta(days=9)).isoformat(),
+                                      "to": (self.today - datetime.timedelta(days=1)).isoformat()})
+        self.assertEqual([q for q in ctx.captured_queries if "supplyrequestline" in q["sql"]], [])
+
+    def test_unrolled_span_is_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.get(group="day", **{"from": (self.today - datetime.timedelta(days=9)).isoformat()})
+        self.assertEqual(len([q for q in ctx.captured_queries if "supplyrequestline" in q["sql"]]), 1)
+        self.assertEqual([b["requests"] for b in data["series"]], list(range(10, 0, -1)))
+
+    def test_incremental_and_rename(self):
+        call_command("rollup_supply_requests", stdout=StringIO())
+        # Second run has nothing to do
+        out = StringIO()
+        call_command("rollup_supply_requests", stdout=out)
+        self.assertIn("Up to date", out.getvalue())
+
+        self.pens.name = "Blue Pens"
+        self.pens.save()
+        items = {b["key"]: b for b in self.get(group="item", limit=1)["series"]}
+        self.assertEqual(list(items), [self.pens.id])
+
+    def test_validation(self):
+        self.assertEqual(self.client.get("/api/supplies/analytics/?group=month").status_code, 400)
+        self.assertEqual(self.client.get("/api/supplies/analytics/?from=2026-02-01&to=2026-01-01").status_code, 400)
+        self.assertEqual(self.client.get("/api/supplies/analytics/?from=2024-02-30").status_code, 400)
+        with self.assertRaises(CommandError):
+            call_command("rollup_supply_requests", since="2024-02-30", stdout=StringIO())
+        self.client.logout()
+        self.assertEqual(self.client.get("/api/supplies/analytics/").status_code, 403)
+
+
+class RoomUtilizationTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin@mavs.uta.edu", "admin@mavs.uta.edu", "pw", is_staff=True)
+        self.client.force_login(self.admin)
+        self.a = Room.objects.create(name="Room A")
+        self.b = Room.objects.create(name="Room B")
+
+        def book(room, day, start, end, cancelled=False):
+            RoomReservation.objects.create(
+                room=room, date=datetime.date.fromisoformat(day),
+                start_time=datetime.time.fromisoformat(start), end_time=datetime.time.fromisoformat(end),
+                user=self.admin, full_name="Admin", email="admin@mavs.uta.edu", cancelled=cancelled,
+            )
+
+        # 2026-01-05 is a Monday; the range is that week
+        book(self.a, "2026-01-04", "23:30", "00:30")  # Sunday before: 30 min spill into Monday
+        book(self.a, "2026-01-05", "10:00", "12:00")
+        book(self.a, "2026-01-05", "11:00", "12:30")  # overlaps: counted once
+        book(self.a, "2026-01-11", "23:00", "01:00")  # overnight past the range end: 1 h
+        book(self.a, "2026-01-06", "09:00", "17:00", cancelled=True)
+        book(self.b, "2026-01-05", "11:00", "12:00")
+
+    def test_report(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/rooms/utilization/?from=2026-01-05&to=2026-01-11")
+        self.assertEqual(response.status_code, 200, response.content[:200])
+        self.assertEqual(len([q for q in ctx.captured_queries if "room_reservations" in q["sql"]]), 1)
+
+        data = response.json()
+        self.assertEqual(data["days"], 7)
+        rooms = {r["roomName"]: r for r in data["rooms"]}
+        a = rooms["Room A"]
+        self.assertEqual(a["reservations"], 3)
+        self.assertEqual(a["bookedHours"], 4.0)
+        monday, sunday = a["byWeekdayHour"][0], a["byWeekdayHour"][6]
+        self.assertEqual(monday[0], 50.0)
+        self.assertEqual(monday[10:13], [100.0, 100.0, 50.0])
+        self.assertEqual(sunday[23], 100.0)
+        self.assertEqual(rooms["Room B"]["bookedHours"], 1.0)
+
+        overall = data["overall"]
+        self.assertEqual(overall["peaks"][0], {"weekday": "Mon", "hour": 11, "pct": 100.0})
+        self.assertEqual(overall["maxConcurrentRooms"], {"rooms": 2, "at": "2026-01-05T11:00"})
+
+    def test_validation(self):
+        self.assertEqual(self.client.get("/api/rooms/utilization/?from=2026-02-01&to=2026-01-01").status_code, 400)
+        self.assertEqual(self.client.get("/api/rooms/utilization/?from=2024-01-01&to=2026-01-01").status_code, 400)
+        self.assertEqual(self.client.get("/api/rooms/utilization/?to=2026-13-01").status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.get("/api/rooms/utilization/").status_code, 403)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin@mavs.uta.edu", "admin@mavs.uta.edu", "pw", is_staff=True)
+        self.client.force_login(self.admin)
+        room = Room.objects.create(name="Room A")
+        for day in range(1, 6):
+            RoomReservation.objects.create(
+                room=room, date=datetime.date(2026, 1, day), start_time=datetime.time(9), end_time=datetime.time(10),
+                user=self.admin, full_name="Admin, \"The\"", email="admin@mavs.uta.edu", cancelled=day == 5,
+            )
+        SupplyRequest.objects.create(user_id=self.admin.id, full_name="Admin", email="", items=["Pens", "Pens", "Tape"])
+
+    def test_csv_streams_in_pages(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/exports/reservations/?from=2026-01-02&to=2026-01-05")
+            body = b"".join(response.streaming_content).decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="reservations-2026-01-02-2026-01-05.csv"', response["Content-Disposition"])
+
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([r["date"] for r in rows], ["2026-01-02", "2026-01-03", "2026-01-04", "2026-01-05"])
+        self.assertEqual(rows[0]["full_name"], 'Admin, "The"')
+        self.assertEqual(rows[0]["start_time"], "09:00:00")
+        # Two full pages + the empty one that ends the scan
+        self.assertEqual(len([q for q in ctx.captured_queries if "room_reservations" in q["sql"]]), 3)
+
+        supplies = self.client.get("/api/exports/supply_requests/")
+        rows = list(csv.DictReader(StringIO(b"".join(supplies.streaming_content).decode())))
+        self.assertEqual((rows[0]["items"], rows[0]["units"]), ("Pens ×2; Tape", "3"))
+
+    def test_csv_neutralizes_formulas(self):
+        RoomReservation.objects.filter(date=datetime.date(2026, 1, 1)).update(
+            full_name='=HYPERLINK("http://evil.example","x")', cancel_reason="@SUM(1+1)",
+        )
+        response = self.client.get("/api/exports/reservations/?from=2026-01-01&to=2026-01-01")
+        row = next(csv.DictReader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(row["full_name"], '\'=HYPERLINK("http://evil.example","x")')
+        self.assertEqual(row["cancel_reason"], "'@SUM(1+1)")
+        self.assertEqual(row["email"], "admin@mavs.uta.edu")
+
+    @unittest.skipUnless(exports.parquet_available(), "pyarrow not installed")
+    def test_parquet_round_trip(self):
+        import pyarrow.parquet as pq
+
+        response = self.client.get("/api/exports/reservations/?format=parquet")
+        self.assertEqual(response.status_code, 200)
+        parquet = pq.ParquetFile(BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(parquet.metadata.num_rows, 5)
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        table = parquet.read()
+        self.assertEqual(table.column("cancelled").to_pylist(), [False] * 4 + [True])
+        self.assertEqual(table.column("date").to_pylist()[0], datetime.date(2026, 1, 1))
+
+    def test_command_and_validation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            out = StringIO()
+            call_command("export_data", "supply_requests", "--output", path, stdout=out)
+            self.assertIn("Exported supply_requests", out.getvalue())
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(len(list(csv.reader(f))), 2)
+
+        self.assertEqual(self.client.get("/api/exports/users/").status_code, 400)
+        self.assertEqual(self.client.get("/api/exports/reservations/?format=xlsx").status_code, 400)
+        self.assertEqual(self.client.get("/api/exports/reservations/?from=2024-02-30").status_code, 400)
+        with self.assertRaises(CommandError):
+            call_command("export_data", "reservations", "--to", "2024-02-30", stdout=StringIO())
+        self.client.logout()
+        self.assertEqual(self.client.get("/api/exports/reservations/").status_code, 403)
+
+    async def test_asgi_response_is_async_stream(self):
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get("/api/exports/reservations/")
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(len(body.strip().splitlines()), 6)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class DirectoryImportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin@mavs.uta.edu", "admin@mavs.uta.edu", "pw", is_staff=True)
+        self.client.force_login(self.admin)
+
+    def import_file(self, kind, text, *args):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"{kind}.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            out = StringIO()
+            call_command("import_directory", kind, path, *args, stdout=out)
+            return out.getvalue()
+
+    def test_users(self):
+        existing = User.objects.create_user("old@mavs.uta.edu", "old@mavs.uta.edu", "old-pw")
+        out = self.import_file("users", (
+            "Email,Full_Name,Password,is_staff,uta_id\n"
+            "Ana@mavs.uta.edu,anaLopez,s3cret-1,yes,1001234567\n"
+            "ben@mavs.uta.edu,ben kim,s3cret-2,,\n"
+            "cam@mavs.uta.edu,Cam Diaz,,no,\n"
+            "not-an-email,Someone,,,\n"
+            "ana@mavs.uta.edu,Ana Again,,,\n"
+            "old@mavs.uta.edu,old timer,new-pw,,\n"
+        ), "--batch-size", "2", "--processes", "2")
+        self.assertIn("3 created, 1 updated, 2 failed", out)
+        self.assertIn("line 5: invalid email", out)
+        self.assertIn("line 6: duplicate", out)
+
+        ana = User.objects.get(username="ana@mavs.uta.edu")
+        self.assertTrue(ana.password.startswith("md5$"))  # hashed in the pool with the active hasher
+        self.assertTrue(ana.check_password("s3cret-1"))
+        self.assertTrue(ana.is_staff)
+        self.assertEqual((ana.first_name, ana.last_name), ("Ana", "Lopez"))
+        self.assertEqual(UserProfile.objects.get(user=ana).full_name, "Ana Lopez")
+        self.assertEqual(UserCard.objects.get(user=ana).uta_id, "1001234567")
+
+        cam = User.objects.get(username="cam@mavs.uta.edu")
+        self.assertFalse(cam.has_usable_password())
+        self.assertTrue(UserProfile.objects.get(user=cam).must_set_password)
+
+        existing.refresh_from_db()
+        self.assertTrue(existing.check_password("new-pw"))
+        self.assertEqual(UserProfile.objects.get(user=existing).full_name, "Old Timer")
+
+    def test_rooms_and_items_upload(self):
+        Room.objects.create(name="Room A", capacity=4)
+        Category.objects.create(name="Storage Closet", key="closet")
+
+        def upload(kind, text, **params):
+            return self.client.post(
+                f"/api/import/{kind}/",
+                {"file": SimpleUploadedFile(f"{kind}.csv", text.encode("utf-8-sig")), **params},
+            ).json()
+
+        dry = upload("rooms", "name,capacity,features\nRoom A,10,Screen; HDMI\nRoom B,6,\n", dryRun="1")
+        self.assertEqual((dry["created"], dry["updated"]), (1, 1))
+        self.assertFalse(Room.objects.filter(name="Room B").exists())
+
+        report = upload("rooms", "name,capacity,features\nRoom A,10,Screen; HDMI\nRoom B,6,\nRoom C,zero,\n")
+        self.assertEqual((report["created"], report["updated"]), (1, 1))
+        self.assertEqual(report["errors"], [{"row": 4, "error": "capacity must be a whole number"}])
+        room = Room.objects.get(name="Room A")
+        self.assertEqual((room.capacity, room.features, room.has_hdmi), (10, ["Screen", "HDMI"], True))
+
+        # Keys match existing rows case-insensitively
+        report = upload("rooms", "name,capacity\nroom a,12\n")
+        self.assertEqual((report["created"], report["updated"]), (0, 1))
+        self.assertEqual(Room.objects.get(name="Room A").capacity, 12)
+
+        report = upload("items", "name,category,daily_cap\nPens,closet,5\nTape,Storage Closet,\nGlue,kitchen,\n")
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["errors"][0]["error"], "unknown category: kitchen")
+        self.assertEqual(Item.objects.get(name="Pens").daily_cap, 5)
+
+        self.assertEqual(upload("users", "email\nx@mavs.uta.edu\n")["errors"][0]["error"], "missing column(s): full_name")
+        self.client.logout()
+        self.assertEqual(self.client.post("/api/import/rooms/").status_code, 403)
+
+    def test_daily_cap_must_be_positive(self):
+        closet = Category.objects.create(name="Storage Closet", key="closet")
+        with self.assertRaises(ValidationError):
+            Item(name="Pens", category=closet, daily_cap=0).full_clean()
+
+        out = self.import_file("items", "name,category,daily_cap\nPens,closet,0\n")
+        self.assertIn("line 2: daily_cap must be at least 1", out)
+        self.assertFalse(Item.objects.exists())
+
+    def test_upload_hashes_without_forking(self):
+        csv_text = "email,full_name,password\na@mavs.uta.edu,A One,pw-1\nb@mavs.uta.edu,B Two,pw-2\n"
+        with mock.patch.object(directory_import, "ProcessPoolExecutor", side_effect=AssertionError("forked")):
+            report = self.client.post(
+                "/api/import/users/", {"file": SimpleUploadedFile("users.csv", csv_text.encode())}
+            ).json()
+        self.assertEqual(report["created"], 2)
+        self.assertTrue(User.objects.get(username="b@mavs.uta.edu").check_password("pw-2"))
+
+    def test_rejected_batch_reported_per_row(self):
+        real = directory_import.upsert_rooms
+        calls = []
+
+        def flaky(records, dry_run, context):
+            calls.append(len(records))
+            if len(calls) == 1:
+                raise IntegrityError("UNIQUE constraint failed: api_room.name")
+            return real(records, dry_run, context)
+
+        with mock.patch.dict(directory_import.UPSERTS, {"rooms": flaky}):
+            report = directory_import.import_csv(
+                "rooms", StringIO("name\nRoom A\nRoom B\nRoom C\n"), batch_size=2
+            )
+        self.assertEqual(report.created, 1)
+        self.assertEqual([e["row"] for e in report.errors], [2, 3])
+        self.assertIn("UNIQUE constraint failed", report.errors[0]["error"])
+        self.assertEqual(list(Room.objects.values_list("name", flat=True)), ["Room C"])
+
+
+@override_settings(RATE_LIMIT_ENABLED=False)
+class PasswordHashingTests(TestCase):
+    def login(self, email, password):
+        return self.client.post(
+            "/api/login/", json.dumps({"email": email, "password": password}), content_type="application/json"
+        )
+
+    # The suite hashes with MD5 (kiosks/test_runner.py): use the real hashers
+    # here, without logging the (deliberately) slow login
+    @override_settings(PASSWORD_HASHERS=project_settings.PASSWORD_HASHERS, PERF_SLOW_REQUEST_MS=60_000)
+    def test_legacy_hash_upgraded_on_login(self):
+        user = User.objects.create_user("old@mavs.uta.edu", "old@mavs.uta.edu")
+        user.password = make_password("Legacy-pw-1", hasher="pbkdf2_sha256")
+        user.save()
+
+        self.assertEqual(self.login("old@mavs.uta.edu", "Legacy-pw-1").status_code, 200)
+        user.refresh_from_db()
+        self.assertEqual(get_hasher().algorithm, "scrypt")
+        self.assertEqual(identify_hasher(user.password).algorithm, "scrypt")
+        self.assertTrue(user.check_password("Legacy-pw-1"))
+
+    def test_wrong_password_hashes_once(self):
+        User.objects.create_user("ana@mavs.uta.edu", "ana@mavs.uta.edu", "Right-pw-1")
+        with mock.patch.object(ModelBackend, "authenticate") as fallback:
+            self.assertEqual(self.login("ana@mavs.uta.edu", "Wrong-pw-1").status_code, 400)
+        fallback.assert_not_called()
+
+    def test_register_hashes_in_pool(self):
+        threads = []
+        real = password_hashing.make_password
+
+        def spy(password):
+            threads.append(threading.current_thread().name)
+            return real(password)
+
+        with mock.patch.object(password_hashing, "make_password", spy), \
+                CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/api/register/", json.dumps({
+                "email": "new@mavs.uta.edu", "password": "New-pw-1", "fullName": "New User",
+            }), content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(threads and threads[0].startswith("password-hash"))
+        # The user row is written once, with the hash already in it
+        user_writes = [q["sql"] for q in ctx.captured_queries if '"auth_user"' in q["sql"]
+                       and q["sql"].startswith(("INSERT", "UPDATE"))]
+        self.assertEqual(len(user_writes), 1)
+        self.assertTrue(self.login("new@mavs.uta.edu", "New-pw-1").json()["ok"])
+
+
+@override_settings(
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMITS={"login": {"rate": "2/min", "keys": ("ip", "email")}},
+)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login(self):
+        return self.client.post(
+            "/api/login/", json.dumps({"email": "nobody@mavs.uta.edu", "password": "Wrong-pw-1"}),
+            content_type="application/json",
+        )
+
+    def test_throttled_login_gets_429_without_db_work(self):
+        self.assertEqual(self.login().status_code, 400)
+        self.assertEqual(self.login().status_code, 400)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(response.json()["ok"])
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 60)
+        self.assertEqual(ctx.captured_queries, [])
+
+    def test_concurrent_requests_never_share_a_slot(self):
+        results = []
+
+        def hit():
+            results.append(ratelimit.hit_window("ratelimit:test:ip:1.2.3.4", 5, 60.0, now=1200.0))
+
+        threads = [threading.Thread(target=hit) for _ in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(0.0), 5)
+        self.assertEqual(max(results), 60.0)
+
+        # Next window starts fresh
+        self.assertEqual(ratelimit.hit_window("ratelimit:test:ip:1.2.3.4", 5, 60.0, now=1260.0), 0.0)
+
+    async def test_async_window_shares_counters(self):
+        key = "ratelimit:test:ip:5.6.7.8"
+        results = [await ratelimit.ahit_window(key, 2, 60.0, now=1200.0) for _ in range(2)]
+        self.assertEqual(results, [0.0, 0.0])
+        self.assertEqual(ratelimit.hit_window(key, 2, 60.0, now=1230.0), 30.0)
+        self.assertEqual(await ratelimit.ahit_window(key, 2, 60.0, now=1260.0), 0.0)
+
+
+# ---------------------------------------------------------
+# CHECK-IN AND NO-SHOW RELEASE
+# ---------------------------------------------------------
+class NoShowTests(TestCase):
+    def setUp(self):
+        self.room = Room.objects.create(name="ERSA 201", capacity=6)
+        self.user = User.objects.create_user("ana@mavs.uta.edu", "ana@mavs.uta.edu")
+        UserCard.objects.create(user=self.user, uta_id="1001234567")
+
+    def reserve(self, date, start, end):
+        return RoomReservation.objects.create(
+            room=self.room, user=self.user, full_name="Ana", email=self.user.email,
+            date=date, start_time=start, end_time=end,
+        )
+
+    def test_check_in_rejects_non_numeric_room(self):
+        response = self.client.post("/api/rooms/reservations/check-in/", json.dumps({
+            "raw_swipe": "1001234567", "roomId": "ERSA 201",
+        }), content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_release_skips_reservations_that_already_ended(self):
+        now = datetime.datetime(2026, 10, 19, 12, 0)
+        running = self.reserve(now.date(), datetime.time(11, 30), datetime.time(12, 30))
+        ended = self.reserve(now.date(), datetime.time(10, 0), datetime.time(11, 0))
+
+        self.assertEqual(no_shows.release_no_shows(now=now), 1)
+        running.refresh_from_db()
+        ended.refresh_from_db()
+        self.assertTrue(running.cancelled)
+        self.assertEqual(running.cancel_reason, no_shows.RELEASE_REASON)
+        self.assertFalse(ended.cancelled)
+
+    def test_release_overnight_reservation_from_yesterday(self):
+        now = datetime.datetime(2026, 10, 19, 1, 0)
+        yesterday = now.date() - datetime.timedelta(days=1)
+        overnight = self.reserve(yesterday, datetime.time(23, 0), datetime.time(2, 0))
+        ended = self.reserve(yesterday, datetime.time(22, 0), datetime.time(23, 30))
+
+        self.assertEqual(no_shows.release_no_shows(now=now), 1)
+        overnight.refresh_from_db()
+        ended.refresh_from_db()
+        self.assertTrue(overnight.cancelled)
+        self.assertFalse(ended.cancelled)
+
+    def test_release_publishes_one_event_per_date(self):
+        now = datetime.datetime(2026, 10, 19, 1, 0)
+        yesterday = now.date() - datetime.timedelta(days=1)
+        other = Room.objects.create(name="ERSA 202", capacity=6)
+        self.reserve(yesterday, datetime.time(23, 0), datetime.time(2, 0))
+        self.reserve(now.date(), datetime.time(0, 0), datetime.time(2, 0))
+        RoomReservation.objects.create(
+            room=other, user=self.user, full_name="Ana", email=self.user.email,
+            date=now.date(), start_time=datetime.time(0, 30), end_time=datetime.time(1, 30),
+        )
+
+        with mock.patch.object(no_shows, "publish") as publish:
+            self.assertEqual(no_shows.release_no_shows(now=now), 3)
+        self.assertEqual([c.args[0] for c in publish.call_args_list], ["reservation.cancelled"] * 2)
+        per_date = [{r["date"] for r in c.args[1]["reservations"]} for c in publish.call_args_list]
+        self.assertEqual(per_date, [{yesterday.isoformat()}, {now.date().isoformat()}])
+        self.assertEqual(len(publish.call_args_list[1].args[1]["reservations"]), 2)
+
+
+# ---------------------------------------------------------
+# RESPONSE COMPRESSION
+# ---------------------------------------------------------
+class CompressionTests(TestCase):
+    def compress(self, content_type, accept="gzip, br"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept)
+        response = HttpResponse(b"<p>kiosk</p>" * 500, content_type=content_type)
+        return CompressionMiddleware(lambda r: response).process_response(request, response)
+
+    def test_gzip_body_is_padded(self):
+        sizes = set()
+        for _ in range(20):
+            response = self.compress("text/html")
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertEqual(response.content[3] & gzip.FNAME, gzip.FNAME)
+            self.assertEqual(gzip.decompress(response.content), b"<p>kiosk</p>" * 500)
+            sizes.add(len(response.content))
+        self.assertGreater(len(sizes), 1)
+
+    def test_html_never_brotli(self):
+        with mock.patch("kiosks.middleware.brotli", mock.Mock(compress=lambda data, quality: b"br")):
+            self.assertEqual(self.compress("text/html", accept="br, gzip;q=0.5")["Content-Encoding"], "gzip")
+            self.assertEqual(self.compress("application/json", accept="br")["Content-Encoding"], "br")
+
+
+# ---------------------------------------------------------
+# UI ASSET MANIFEST
+# ---------------------------------------------------------
+class ManifestCacheTests(TestCase):
+    def setUp(self):
+        ui_assets.invalidate_manifest()
+
+    def test_bulk_import_skips_duplicate_names(self):
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as media, \
+                override_settings(MEDIA_ROOT=media):
+            for filename, fmt in (("logo.png", "PNG"), ("logo.jpg", "JPEG"), ("banner.jpg", "JPEG")):
+                Image.new("RGB", (4, 4), "orange").save(os.path.join(src, filename), fmt)
+
+            out = StringIO()
+            call_command("bulk_import_ui_assets", path=src, workers=2, stdout=out)
+
+        self.assertIn("Skipped logo.jpg: same asset name as logo.png", out.getvalue())
+        assets = dict(UIAsset.objects.values_list("name", "image"))
+        self.assertEqual(set(assets), {"logo", "banner"})
+        self.assertTrue(assets["logo"].endswith(".png"))
+
+    def test_build_racing_an_invalidation_is_not_stored(self):
+        real = ui_assets.build_manifest
+
+        def build_then_upload():
+            manifest = real()
+            ui_assets.invalidate_manifest()  # an upload lands mid-build
+            return manifest
+
+        with mock.patch.object(ui_assets, "build_manifest", build_then_upload):
+            ui_assets.get_manifest()
+        self.assertIsNone(ui_assets._manifest)
+
+        ui_assets.get_manifest()
+        self.assertIsNotNone(ui_assets._manifest)
+
+
+class ItemImageImportTests(TestCase):
+    def test_one_file_per_item(self):
+        from PIL import Image
+
+        Item.objects.create(name="Coffee Pods", category=Category.objects.create(name="K-Cups", key="kcup"))
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as media, \
+                override_settings(MEDIA_ROOT=media):
+            for filename, fmt in (("Coffee_Pods.png", "PNG"), ("Coffee Pods.jpg", "JPEG")):
+                Image.new("RGB", (4, 4), "brown").save(os.path.join(src, filename), fmt)
+
+            out = StringIO()
+            call_command("bulk_import_item_images", path=src, workers=2, stdout=out)
+
+        self.assertIn("Skipped Coffee Pods.jpg: same item as Coffee_Pods.png", out.getvalue())
+        self.assertIn("Imported: 1 images", out.getvalue())
+        self.assertTrue(Item.objects.get(name="Coffee Pods").image.name.endswith(".png"))
+
+
+# ---------------------------------------------------------
+# SUPPLY DIGEST AND RESERVATION REMINDERS
+# Both claim rows with one UPDATE before sending and release the
+# claim when the send fails.
+# ---------------------------------------------------------
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class NotificationClaimTests(TestCase):
+    def setUp(self):
+        supply_routing.invalidate_routing()
+        closet = Category.objects.create(name="Storage Closet", key="closet")
+        kcup = Category.objects.create(name="K-Cups", key="kcup")
+        Item.objects.create(name="Pens", category=closet)
+        Item.objects.create(name="Dark Roast", category=kcup)
+        SupplyRecipient.objects.create(first_name="Cal", last_name="Lee", email="closet@uta.edu").categories.add(closet)
+        SupplyRecipient.objects.create(first_name="Kim", last_name="Ng", email="kcup@uta.edu").categories.add(kcup)
+
+        self.user = User.objects.create_user("ana@mavs.uta.edu", "ana@mavs.uta.edu")
+        self.room = Room.objects.create(name="ERSA 201", capacity=6)
+
+    def test_digest_claims_once_and_routes_by_category(self):
+        for items in (["Pens"], ["Pens", "Dark Roast"]):
+            SupplyRequest.objects.create(user_id=self.user.id, full_name="Ana", email=self.user.email, items=items)
+
+        self.assertEqual(supply_digest.send_pending_digest(), (2, 2))
+        self.assertFalse(SupplyRequest.objects.filter(notified_at__isnull=True).exists())
+        by_recipient = {m.to[0]: m for m in mail.outbox}
+        self.assertEqual(set(by_recipient), {"closet@uta.edu", "kcup@uta.edu"})
+        self.assertIn("2 request(s)", by_recipient["closet@uta.edu"].subject)
+        self.assertIn("1 request(s)", by_recipient["kcup@uta.edu"].subject)
+
+        # Everything is claimed: a second run sends nothing
+        self.assertEqual(supply_digest.send_pending_digest(), (0, 0))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_failed_digest_releases_the_claim(self):
+        SupplyRequest.objects.create(user_id=self.user.id, full_name="Ana", email=self.user.email, items=["Pens"])
+        with mock.patch.object(supply_digest, "send_batch", side_effect=OSError("smtp down")):
+            with self.assertRaises(OSError):
+                supply_digest.send_pending_digest()
+        self.assertTrue(SupplyRequest.objects.filter(notified_at__isnull=True).exists())
+        self.assertEqual(supply_digest.send_pending_digest(), (1, 1))
+
+    def reserve_soon(self, now):
+        start = now + datetime.timedelta(minutes=10)
+        return RoomReservation.objects.create(
+            room=self.room, user=self.user, full_name="Ana", email=self.user.email,
+            date=start.date(), start_time=start.time(), end_time=(start + datetime.timedelta(hours=1)).time(),
+        )
+
+    def test_reminder_claimed_once(self):
+        now = datetime.datetime(2026, 10, 19, 9, 0)
+        reservation = self.reserve_soon(now)
+
+        self.assertEqual(reservation_reminders.send_due_reminders(now=now), (1, 1))
+        reservation.refresh_from_db()
+        self.assertIsNotNone(reservation.reminder_sent_at)
+        self.assertIn("in 10 minutes", mail.outbox[0].alternatives[0][0])
+
+        self.assertEqual(reservation_reminders.send_due_reminders(now=now), (0, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failed_reminder_released_and_logged(self):
+        now = datetime.datetime(2026, 10, 19, 9, 0)
+        reservation = self.reserve_soon(now)
+
+        with mock.patch.object(reservation_reminders, "send_batch", side_effect=OSError("smtp down")), \
+                self.assertLogs("api.utils.reservation_reminders", "ERROR"):
+            self.assertEqual(reservation_reminders.send_due_reminders(now=now), (1, 0))
+        reservation.refresh_from_db()
+        self.assertIsNone(reservation.reminder_sent_at)
+
+
+# ---------------------------------------------------------
+# SUPPLY ROUTING CACHE AND PURGE
+# ---------------------------------------------------------
+class SupplyRoutingTests(TestCase):
+    def setUp(self):
+        supply_routing.invalidate_routing()
+        self.closet = Category.objects.create(name="Storage Closet", key="closet")
+        self.kcup = Category.objects.create(name="K-Cups", key="kcup")
+        self.pens = Item.objects.create(name="Pens", category=self.closet)
+        self.cal = SupplyRecipient.objects.create(first_name="Cal", last_name="Lee", email="closet@uta.edu")
+        self.cal.categories.add(self.closet)
+        self.kim = SupplyRecipient.objects.create(first_name="Kim", last_name="Ng", email="kcup@uta.edu")
+        self.kim.categories.add(self.kcup)
+
+    def routed(self, *names):
+        return {email: items for (email, _, _), items in supply_routing.route_item_names(names).items()}
+
+    def test_item_change_invalidates(self):
+        self.assertEqual(self.routed("Pens"), {"closet@uta.edu": ["Pens"]})
+        self.pens.category = self.kcup
+        self.pens.save()
+        self.assertEqual(self.routed("Pens"), {"kcup@uta.edu": ["Pens"]})
+
+        Item.objects.create(name="Dark Roast", category=self.kcup)
+        self.assertEqual(self.routed("Dark Roast"), {"kcup@uta.edu": ["Dark Roast"]})
+
+    def test_category_change_invalidates(self):
+        fallback = supply_routing.fallback_recipient()[0]
+        self.assertEqual(self.routed("Tape"), {fallback: ["Tape"]})
+        # Kim is left with no categories: now a catch-all recipient
+        self.kcup.delete()
+        self.assertEqual(self.routed("Tape"), {"kcup@uta.edu": ["Tape"]})
+
+    def test_recipient_change_invalidates(self):
+        self.assertEqual(self.routed("Pens"), {"closet@uta.edu": ["Pens"]})
+        self.kim.categories.add(self.closet)
+        self.assertEqual(self.routed("Pens"), {"closet@uta.edu": ["Pens"], "kcup@uta.edu": ["Pens"]})
+
+        self.cal.delete()
+        self.assertEqual(self.routed("Pens"), {"kcup@uta.edu": ["Pens"]})
+
+    def test_build_racing_an_invalidation_is_not_stored(self):
+        real = supply_routing.build_routing
+
+        def build_then_change():
+            routing = real()
+            supply_routing.invalidate_routing()  # a recipient changes mid-build
+            return routing
+
+        with mock.patch.object(supply_routing, "build_routing", build_then_change):
+            supply_routing.get_routing()
+        self.assertIsNone(supply_routing._routing)
+
+        supply_routing.get_routing()
+        self.assertIsNotNone(supply_routing._routing)
+
+
+class PurgeExpiredTests(TestCase):
+    def test_codes_purged_by_expires_at(self):
+        user = User.objects.create_user("ana@mavs.uta.edu", "ana@mavs.uta.edu")
+        now = timezone.now()
+        # Old but still valid (expiry is what counts, not age)
+        live = PasswordResetCode.objects.create(user=user, code="111111", expires_at=now + datetime.timedelta(minutes=5))
+        PasswordResetCode.objects.filter(pk=live.pk).update(created_at=now - datetime.timedelta(days=1))
+        PasswordResetCode.objects.create(user=user, code="222222", expires_at=now - datetime.timedelta(seconds=1))
+        PasswordResetCode.objects.create(user=user, code="333333", used=True)
+
+        call_command("purge_expired", only=["codes"], stdout=StringIO())
+        self.assertEqual(list(PasswordResetCode.objects.values_list("code", flat=True)), ["111111"])
+
+
+# ---------------------------------------------------------
+# MEDIA SERVING
+# ---------------------------------------------------------
+class MediaUrlTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.data = b"kiosk-logo" * 1000
+        with open(os.path.join(media.name, "logo.png"), "wb") as f:
+            f.write(self.data)
+        self.url = reverse("serve_media", kwargs={"path": "logo.png"})
+        self.version = hashlib.sha256(self.data).hexdigest()[:12]
+
+    def test_media_route_follows_media_url(self):
+        self.assertEqual(reverse("serve_media", kwargs={"path": "ui/logo.png"}), f"{settings.MEDIA_URL}ui/logo.png")
+
+    def test_immutable_only_for_matching_version(self):
+        self.assertIn("immutable", self.client.get(f"{self.url}?v={self.version}")["Cache-Control"])
+        self.assertNotIn("immutable", self.client.get(f"{self.url}?v=0123456789ab")["Cache-Control"])
+        self.assertNotIn("immutable", self.client.get(f"{self.url}?v=1")["Cache-Control"])
+        self.assertNotIn("immutable", self.client.get(self.url)["Cache-Control"])
+
+    async def test_asgi_bodies_are_async_streams(self):
+        response = await self.async_client.get(self.url)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Length"], str(len(self.data)))
+        self.assertEqual(b"".join([chunk async for chunk in response.streaming_content]), self.data)
+
+        response = await self.async_client.get(self.url, headers={"Range": "bytes=10-19"})
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.is_async)
+        self.assertEqual(b"".join([chunk async for chunk in response.streaming_content]), self.data[10:20])
+
+
+# ---------------------------------------------------------
+# EMAIL RENDERING
+# ---------------------------------------------------------
+class EmailRenderTests(TestCase):
+    def test_supply_row_image_ignores_quantity(self):
+        html = render_supply_request_email(
+            "Ana", "ana@mavs.uta.edu", [("AA Batteries", 3), "Pens"], 7,
+            datetime.datetime(2026, 10, 19, 9, 0), "logo.png",
+        )
+        self.assertIn('src="https://raw.githubusercontent.com/patrickngg1/kioskguys/main/'
+                      'smartKiosk/media/items/AA_Batteries/AA_Batteries.png"', html)
+        self.assertIn("AA Batteries ×3", html)
+        self.assertNotIn("×3/", html)
+        self.assertIn("/Pens/Pens.png", html)
+
+    def test_bulk_cancellation_csv_neutralizes_formulas(self):
+        room = Room.objects.create(name="=HYPERLINK(\"http://evil.example\")")
+        user = User.objects.create_user("ana@mavs.uta.edu", "ana@mavs.uta.edu", "pw")
+        reservation = RoomReservation.objects.create(
+            room=room, date=datetime.date(2026, 1, 5), start_time=datetime.time(9), end_time=datetime.time(10),
+            user=user, full_name="Ana", email="ana@mavs.uta.edu",
+        )
+        row = list(csv.DictReader(StringIO(render_bulk_cancellation_csv([reservation]))))[0]
+        self.assertEqual(row["room"], '\'=HYPERLINK("http://evil.example")')
+
+    def test_bulk_cancellation_escapes_room_names(self):
+        room = Room.objects.create(name="<b>Lab</b> & Co")
+        user = User.objects.create_user("ana@mavs.uta.edu", "ana@mavs.uta.edu", "pw")
+        reservations = [
+            RoomReservation.objects.create(
+                room=room, date=datetime.date(2026, 1, day), start_time=datetime.time(9), end_time=datetime.time(10),
+                user=user, full_name="Ana", email="ana@mavs.uta.edu",
+            )
+            for day in (5, 6)
+        ]
+        for max_rows in (None, 1):
+            html = render_bulk_cancellation_email(reservations, "logo.png", "Admin", "Closed", max_rows=max_rows)
+            self.assertIn("&lt;b&gt;Lab&lt;/b&gt; &amp; Co", html)
+            self.assertNotIn("<b>Lab</b>", html)
+
+
+# ---------------------------------------------------------
+# TIDB RETRIES
+# ---------------------------------------------------------
+@mock.patch.object(db_retry, "print", create=True)
+class DbRetryTests(TestCase):
+    def flaky(self, error, failures=2):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise error
+            return "ok"
+
+        return fn, calls
+
+    def test_transient_codes_retry_for_both_exception_classes(self, _print):
+        for error in (
+            pymysql_err.OperationalError(9001, "PD server timeout"),
+            pymysql_err.InternalError(1105, "unknown error"),
+            OperationalError(8027, "Information schema is out of date"),
+            InternalError(1105, "unknown error"),
+        ):
+            fn, calls = self.flaky(error)
+            self.assertEqual(db_retry.run_with_backoff(fn, base_delay=0), "ok")
+            self.assertEqual(len(calls), 3)
+
+    def test_code_comes_from_args_not_the_message(self, _print):
+        for error in (
+            pymysql_err.OperationalError(1064, "near '1105': syntax error"),
+            pymysql_err.InternalError(1062, "Duplicate entry '9001' for key 'name'"),
+        ):
+            fn, calls = self.flaky(error)
+            with self.assertRaises(type(error)):
+                db_retry.run_with_backoff(fn, base_delay=0)
+            self.assertEqual(len(calls), 1)
@@ -2,6 +2,7 @@
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
 from . import views
+from .events import events_stream
 from .views import login_user, get_session_user, cancel_room_reservations_bulk, password_reset_request, get_all_items
 
 urlpatterns = [
@@ -24,6 +25,9 @@ urlpatterns = [
     path("items/all/", get_all_items),
 
     path("supplies/popular/", views.get_popular_items, name="get_popular_items"),
+    path("supplies/analytics/", views.supply_analytics_view, name="supply_analytics"),
+    path("exports/<str:dataset>/", views.export_data_view, name="export_data"),
+    path("import/<str:kind>/", views.import_directory_view, name="import_directory"),
 
     # Admin: create/update items
     # Admin: create/update/delete items
@@ -36,6 +40,7 @@ urlpatterns = [
     # Rooms
     # --------------------------
     path("rooms/", views.get_rooms, name="get_rooms"),
+    path("rooms/utilization/", views.room_utilization_view, name="room_utilization"),
     path("rooms/reserve/", views.create_room_reservation, name="create_room_reservation"),
     path("rooms/reservations/my/", views.my_room_reservations, name="my_room_reservations"),
 
@@ -54,6 +59,11 @@ urlpatterns = [
         csrf_exempt(views.cancel_room_reservation),
         name="cancel_room_reservation",
     ),
+    path(
+        "rooms/reservations/check-in/",
+        views.check_in_reservation,
+        name="check_in_reservation",
+    ),
     path(
         "rooms/reservations/by-date/",
         views.reservations_by_date,
@@ -91,6 +101,11 @@ urlpatterns = [
     path("banners/<int:banner_id>/update/", views.update_banner),
     path("banners/active/", views.get_active_banners),
 
+    # --------------------------
+    # Live updates (SSE)
+    # --------------------------
+    path("events/", events_stream, name="events"),
+
         # --------------------------
     # Card Swipe Auth
     # --------------------------
@@ -0,0 +1,51 @@
+# api/utils/availability.py
+"""
+Per-date cache for room availability (GET /rooms/reservations/by-date/).
+
+Every date has a version number in the Django cache; cached payloads
+are keyed by (date, version). Any write that frees or takes a slot bumps
+the version of the affected dates, so stale payloads are never read
+again and simply expire. Overnight reservations show up on the next
+day's listing too, so both days are bumped.
+
+Readers take the version once, before querying, and store under that
+version: a bump that lands mid-query leaves the payload under the old
+(already dead) key instead of labelling stale data as current.
+"""
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+
+AVAILABILITY_CACHE_TTL = getattr(settings, "AVAILABILITY_CACHE_TTL", 30)  # seconds
+
+
+def _version_key(date):
+    return f"availability:v:{date.isoformat()}"
+
+
+def date_version(date):
+    return cache.get_or_set(_version_key(date), 1, None)
+
+
+def bump_dates(dates):
+    """Invalidate cached availability for each date and the day after."""
+    keys = set()
+    for date in dates:
+        keys.add(_version_key(date))
+        keys.add(_version_key(date + datetime.timedelta(days=1)))
+
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:  # not cached yet
+            cache.set(key, 2, None)
+
+
+def get_cached(date, version):
+    return cache.get(f"availability:{date.isoformat()}:{version}")
+
+
+def set_cached(date, version, payload):
+    """Store `payload` under the version read before it was queried."""
+    cache.set(f"availability:{date.isoformat()}:{version}", payload, AVAILABILITY_CACHE_TTL)
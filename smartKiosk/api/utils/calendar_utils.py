@@ -104,6 +104,44 @@ END:VCALENDAR
     return ics.encode("utf-8")
 
 
+# ------------------------------------------------------------
+# CREATE ICS CANCELLATION (one VEVENT per cancelled reservation)
+# ------------------------------------------------------------
+def create_cancellation_ics(reservations, user_email=""):
+    """
+    METHOD:CANCEL calendar with the same UIDs as create_ics_content,
+    so calendar clients drop the events that were added earlier.
+    Returns bytes (ready to attach).
+    """
+    tz_name = "America/Chicago"
+    dt_stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "CALSCALE:GREGORIAN",
+        "METHOD:CANCEL",
+        "PRODID:-//UTA Smart Kiosk//EN",
+    ]
+    for r in reservations:
+        day = r.date.strftime("%Y%m%d")
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{r.id}@utasmartkiosk",
+            f"DTSTAMP:{dt_stamp}",
+            f"DTSTART;TZID={tz_name}:{day}T{r.start_time.strftime('%H%M%S')}",
+            f"DTEND;TZID={tz_name}:{day}T{r.end_time.strftime('%H%M%S')}",
+            f"SUMMARY:Conference Room Reservation ({r.room.name})",
+            "STATUS:CANCELLED",
+            "SEQUENCE:1",
+            f"ORGANIZER:mailto:{user_email}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
 # ------------------------------------------------------------
 # Encode ICS for SendGrid attachment
 # ------------------------------------------------------------
@@ -0,0 +1,382 @@
+# api/utils/directory_import.py
+"""
+Bulk CSV import of rooms, items and users
+(`manage.py import_directory` and POST /api/import/<kind>/).
+
+    rooms   name*, capacity, features ("Screen; HDMI")
+    items   name*, category* (key or name), daily_cap, is_active
+    users   email*, full_name*, password, is_staff, uta_id
+
+The file is read once as a stream: each row is validated on its own
+(errors are reported with their line number and the row is skipped)
+and valid rows are upserted IMPORT_BATCH_SIZE at a time — one lookup
+query, one bulk_create and one bulk_update per batch. Existing rows
+are matched by room/item name or user email; optional columns missing
+from the header are left untouched on existing rows.
+
+Users without a password get an unusable one and must_set_password,
+same as card-only accounts. Passwords are hashed per batch: in a
+process pool shared by the whole import for the management command,
+in the bounded request hashing threads for web uploads.
+bulk_create skips post_save, so profiles are created here, and an
+item import invalidates supply routing and publishes catalog.changed.
+"""
+import csv
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, transaction
+from django.db.models.functions import Lower
+
+from accounts.models import UserCard, UserProfile
+from api.db_retry import run_with_backoff
+from api.events import publish
+from api.models import Category, Item, Room
+from api.utils.password_hashing import hash_passwords, hashing_executor
+from api.utils.supply_routing import invalidate_routing
+
+KINDS = ("rooms", "items", "users")
+REQUIRED = {
+    "rooms": ("name",),
+    "items": ("name", "category"),
+    "users": ("email", "full_name"),
+}
+TRUE_VALUES = {"1", "true", "yes", "y"}
+FALSE_VALUES = {"0", "false", "no", "n", ""}
+
+
+def normalize_full_name(raw):
+    """
+    "PrakashSapkota" / "prakash sapkota" → "Prakash Sapkota".
+    Only splits camel case when the name has no space.
+    """
+    cleaned = raw.strip()
+    if " " not in cleaned:
+        cleaned = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", cleaned)
+    return " ".join(part.capitalize() for part in cleaned.split())
+
+
+class ImportReport:
+    def __init__(self, kind, dry_run=False):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.errors.append({"row": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "dryRun": self.dry_run,
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+# ---------------------------------------------------------
+# ROW VALIDATION (raise ValueError → per-row error)
+# ---------------------------------------------------------
+def _text(row, column, required=False, max_length=None):
+    value = (row.get(column) or "").strip()
+    if required and not value:
+        raise ValueError(f"{column} is required")
+    if max_length and len(value) > max_length:
+        raise ValueError(f"{column} is longer than {max_length} characters")
+    return value
+
+
+def _int(row, column, minimum=0):
+    value = (row.get(column) or "").strip()
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{column} must be a whole number")
+    if number < minimum:
+        raise ValueError(f"{column} must be at least {minimum}")
+    return number
+
+
+def _bool(row, column):
+    value = (row.get(column) or "").strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"{column} must be yes/no")
+
+
+def parse_room(row, columns, context):
+    features = [f.strip() for f in re.split(r"[;|]", row.get("features") or "") if f.strip()]
+    return {
+        "name": _text(row, "name", required=True, max_length=100),
+        "capacity": _int(row, "capacity", minimum=1),
+        "features": features if "features" in columns else None,
+    }
+
+
+def parse_item(row, columns, context):
+    category = _text(row, "category", required=True)
+    category_id = context["categories"].get(category.lower())
+    if category_id is None:
+        raise ValueError(f"unknown category: {category}")
+    return {
+        "name": _text(row, "name", required=True, max_length=200),
+        "category_id": category_id,
+        "daily_cap": _int(row, "daily_cap", minimum=1),
+        "is_active": _bool(row, "is_active") if "is_active" in columns else None,
+    }
+
+
+def parse_user(row, columns, context):
+    email = _text(row, "email", required=True, max_length=150).lower()
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise ValueError(f"invalid email: {email}")
+    full_name = normalize_full_name(_text(row, "full_name", required=True, max_length=150))
+    return {
+        "name": email,  # upsert key
+        "full_name": full_name,
+        "password": (row.get("password") or "") or None,
+        "is_staff": _bool(row, "is_staff") if "is_staff" in columns else None,
+        "uta_id": _text(row, "uta_id", max_length=20) or None,
+    }
+
+
+# ---------------------------------------------------------
+# BATCH UPSERTS → (created, updated)
+# ---------------------------------------------------------
+def _existing(model, field, keys):
+    """Existing rows by lowercased key ("room a" finds "Room A")."""
+    keys = {key.lower() for key in keys}
+    rows = model.objects.alias(match_key=Lower(field)).filter(match_key__in=keys)
+    return {getattr(obj, field).lower(): obj for obj in rows}
+
+
+def upsert_rooms(records, dry_run, context):
+    existing = _existing(Room, "name", [r["name"] for r in records])
+    new, changed = [], []
+    for record in records:
+        room = existing.get(record["name"].lower())
+        if room is None:
+            room = Room(name=record["name"])
+            new.append(room)
+        else:
+            changed.append(room)
+        if record["capacity"] is not None:
+            room.capacity = record["capacity"]
+        if record["features"] is not None:
+            room.features = record["features"]
+            # Legacy flags follow features, as in create_room
+            room.has_screen = "Screen" in record["features"]
+            room.has_hdmi = "HDMI" in record["features"]
+
+    if not dry_run:
+        with transaction.atomic():
+            Room.objects.bulk_create(new)
+            Room.objects.bulk_update(changed, ["capacity", "features", "has_screen", "has_hdmi"])
+    return len(new), len(changed)
+
+
+def upsert_items(records, dry_run, context):
+    existing = _existing(Item, "name", [r["name"] for r in records])
+    new, changed = [], []
+    for record in records:
+        item = existing.get(record["name"].lower())
+        if item is None:
+            item = Item(name=record["name"])
+            new.append(item)
+        else:
+            changed.append(item)
+        item.category_id = record["category_id"]
+        if "daily_cap" in context["columns"]:
+            item.daily_cap = record["daily_cap"]
+        if record["is_active"] is not None:
+            item.is_active = record["is_active"]
+
+    if not dry_run:
+        with transaction.atomic():
+            Item.objects.bulk_create(new)
+            Item.objects.bulk_update(changed, ["category", "daily_cap", "is_active"])
+    return len(new), len(changed)
+
+
+def upsert_users(records, dry_run, context):
+    existing = _existing(User, "username", [r["name"] for r in records])
+    if dry_run:
+        created = sum(1 for r in records if r["name"] not in existing)
+        return created, len(records) - created
+
+    # One hashing pass for the batch (process pool), before any write
+    hashed = hash_passwords([r["password"] for r in records], pool=context.get("pool"))
+
+    new, changed = [], []
+    for record, password in zip(records, hashed):
+        parts = record["full_name"].split()
+        user = existing.get(record["name"])
+        if user is None:
+            user = User(username=record["name"], email=record["name"], password=password)
+            new.append(user)
+        else:
+            changed.append(user)
+            if record["password"]:
+                user.password = password
+        user.first_name = parts[0] if parts else ""
+        user.last_name = " ".join(parts[1:])
+        if record["is_staff"] is not None:
+            user.is_staff = record["is_staff"]
+
+    with transaction.atomic():
+        User.objects.bulk_create(new)
+        User.objects.bulk_update(changed, ["password", "first_name", "last_name", "is_staff"])
+
+        # MySQL/TiDB bulk_create returns no primary keys: resolve by username
+        ids = dict(User.objects.filter(username__in=[r["name"] for r in records]).values_list("username", "id"))
+
+        profiles = {p.user_id: p for p in UserProfile.objects.filter(user_id__in=ids.values())}
+        new_profiles, changed_profiles = [], []
+        for record in records:
+            user_id = ids[record["name"]]
+            profile = profiles.get(user_id)
+            if profile is None:
+                new_profiles.append(UserProfile(
+                    user_id=user_id,
+                    full_name=record["full_name"],
+                    must_set_password=not record["password"],
+                ))
+                continue
+            profile.full_name = record["full_name"]
+            if record["password"]:
+                profile.must_set_password = False
+            changed_profiles.append(profile)
+        UserProfile.objects.bulk_create(new_profiles)
+        UserProfile.objects.bulk_update(changed_profiles, ["full_name", "must_set_password"])
+
+        with_card = {ids[r["name"]]: r["uta_id"] for r in records if r["uta_id"]}
+        cards = {c.user_id: c for c in UserCard.objects.filter(user_id__in=with_card)}
+        for card in cards.values():
+            card.uta_id = with_card[card.user_id]
+        UserCard.objects.bulk_update(list(cards.values()), ["uta_id"])
+        UserCard.objects.bulk_create([
+            UserCard(user_id=user_id, uta_id=uta_id)
+            for user_id, uta_id in with_card.items() if user_id not in cards
+        ])
+
+    return len(new), len(changed)
+
+
+PARSERS = {"rooms": parse_room, "items": parse_item, "users": parse_user}
+UPSERTS = {"rooms": upsert_rooms, "items": upsert_items, "users": upsert_users}
+
+
+# ---------------------------------------------------------
+# ENTRY POINT
+# ---------------------------------------------------------
+def import_csv(kind, lines, dry_run=False, batch_size=None, processes=0):
+    """
+    `lines`: any iterable of text lines (open file, decoded upload).
+    Returns an ImportReport; invalid rows never stop the import, and a
+    batch the database refuses is reported against each of its rows.
+
+    processes: 0 hashes passwords in the bounded request thread pool
+    (web uploads: never fork the server); None or N > 0 uses a process
+    pool of that size (CPU count for None) — management command only.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(KINDS)}")
+
+    batch_size = batch_size or getattr(settings, "IMPORT_BATCH_SIZE", 500)
+    report = ImportReport(kind, dry_run)
+    reader = csv.DictReader(lines)
+    try:
+        header = reader.fieldnames or []
+    except (csv.Error, UnicodeDecodeError) as e:
+        report.error(1, f"unreadable file: {e}")
+        return report
+
+    reader.fieldnames = [(name or "").strip().lower() for name in header]
+    columns = set(reader.fieldnames)
+    missing = [c for c in REQUIRED[kind] if c not in columns]
+    if missing:
+        report.error(1, f"missing column(s): {', '.join(missing)}")
+        return report
+
+    context = {"columns": columns}
+    if kind == "items":
+        categories = Category.objects.values_list("id", "key", "name")
+        context["categories"] = {
+            **{name.lower(): pk for pk, _, name in categories},
+            **{key.lower(): pk for pk, key, _ in categories},
+        }
+
+    parse, upsert = PARSERS[kind], UPSERTS[kind]
+    pool = None
+    if kind == "users" and "password" in columns and not dry_run:
+        if processes == 0:
+            context["pool"] = hashing_executor()  # shared, not shut down here
+        else:
+            pool = context["pool"] = ProcessPoolExecutor(max_workers=processes)
+
+    def flush(batch):
+        try:
+            created, updated = run_with_backoff(upsert, batch, dry_run, context)
+        except DatabaseError as e:
+            # The batch's transaction rolled back: none of its rows were saved
+            for record in batch:
+                report.error(record["line"], f"not saved (batch rejected by the database): {e}")
+            return
+        report.created += created
+        report.updated += updated
+
+    seen = set()
+    batch = []
+    try:
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except (csv.Error, UnicodeDecodeError) as e:
+                report.error(reader.line_num, f"unreadable row: {e}")
+                break
+
+            report.rows += 1
+            try:
+                record = parse(row, columns, context)
+                key = record["name"].lower()
+                if key in seen:
+                    raise ValueError(f"duplicate of an earlier row: {record['name']}")
+            except ValueError as e:
+                report.error(reader.line_num, str(e))
+                continue
+
+            seen.add(key)
+            record["line"] = reader.line_num
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+
+        if batch:
+            flush(batch)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if kind == "items" and report.created + report.updated and not dry_run:
+        invalidate_routing()
+        publish("catalog.changed", {"imported": report.created + report.updated})
+    return report
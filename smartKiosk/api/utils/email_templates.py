@@ -1,22 +1,68 @@
+import csv
 import html as html_lib
 import datetime
+import io
+from functools import lru_cache
+from string import Formatter
+
+from api.utils.exports import _csv_value
 
 # --------------------------------------------------
-# RENDER RESERVATION CONFIRMATION (PREMIUM VERSION)
+# PRECOMPILED TEMPLATE ENGINE
+# Each email is a static HTML shell with {placeholders}.
+# The shell is split into literal chunks ONCE at import;
+# a send only fills the slots and does a single "".join().
+# (No literal braces appear in these templates — all CSS is inline.)
 # --------------------------------------------------
-def render_reservation_email(user, reservation, calendar_links, logo_url):
-    full = getattr(reservation, "full_name", None) or user.get_full_name() or ""
-    user_first = full.split()[0] if full.strip() else (user.first_name or user.username)
+class CompiledTemplate:
+    __slots__ = ("parts", "slots")
+
+    def __init__(self, source):
+        parts = []
+        slots = []
+        for literal, field, _, _ in Formatter().parse(source):
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                slots.append((len(parts), field))
+                parts.append("")
+        self.parts = tuple(parts)
+        self.slots = tuple(slots)
+
+    def render(self, **ctx):
+        parts = list(self.parts)
+        for index, name in self.slots:
+            value = ctx[name]
+            parts[index] = value if value.__class__ is str else str(value)
+        return "".join(parts)
+
+
+def compile_template(source):
+    return CompiledTemplate(source)
+
 
-    room_name = reservation.room.name
-    date_str = reservation.date.strftime("%Y-%m-%d")
-    time_str = f"{reservation.start_time.strftime('%I:%M %p')} – {reservation.end_time.strftime('%I:%M %p')}"
+def _first_name(full, user, default=""):
+    if full.strip():
+        return full.split()[0]
+    return user.first_name or user.username or default
 
-    google_link = calendar_links.get("google", "#")
-    outlook_link = calendar_links.get("outlook", "#")
-    ics_text = "Apple Calendar users: open the attached .ics file."
 
-    html = f"""\
+# Bulk emails repeat the same dates / time slots over and over
+@lru_cache(maxsize=1024)
+def _date_str(date):
+    return date.strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=1024)
+def _time_range(start_time, end_time):
+    return f"{start_time.strftime('%I:%M %p')} – {end_time.strftime('%I:%M %p')}"
+
+
+# --------------------------------------------------
+# RENDER RESERVATION CONFIRMATION / REMINDER (PREMIUM VERSION)
+# One card layout; the headline and intro are slots.
+# --------------------------------------------------
+_RESERVATION_SHELL = compile_template("""\
 <html>
   <body style="margin:0; padding:0; background-color:#020617;">
     <table width="100%" cellpadding="0" cellspacing="0" style="background:#020617; padding:40px 0;">
@@ -58,7 +104,7 @@ def render_reservation_email(user, reservation, calendar_links, logo_url):
                     <td align="right"
                         style="font-family:system-ui,'Segoe UI',sans-serif; font-size:12px;
                                color:rgba(148,163,184,0.65);">
-                      Reservation ID: #{reservation.id}
+                      Reservation ID: #{reservation_id}
                     </td>
                   </tr>
                 </table>
@@ -72,8 +118,8 @@ def render_reservation_email(user, reservation, calendar_links, logo_url):
                             font-weight:800; color:#f9fafb; letter-spacing:0.02em;">
                   <span style="font-size:28px; vertical-align:middle; 
                                margin-right:10px; 
-                               text-shadow:0 0 10px rgba(238,118,36,0.35);">✅</span>
-                  Reservation Confirmed
+                               text-shadow:0 0 10px rgba(238,118,36,0.35);">{title_icon}</span>
+                  {title}
                 </div>
 
                 <!-- Subtle orange accent line -->
@@ -82,7 +128,7 @@ def render_reservation_email(user, reservation, calendar_links, logo_url):
 
                 <div style="font-family:system-ui,'Segoe UI',sans-serif; font-size:14px;
                             color:rgba(209,213,219,0.96); line-height:1.55;">
-                  Hello <b>{user_first}</b>, your conference room reservation is locked in.
+                  Hello <b>{user_first}</b>, {intro}
                 </div>
               </td>
             </tr>
@@ -226,26 +272,72 @@ def render_reservation_email(user, reservation, calendar_links, logo_url):
     </table>
   </body>
 </html>
-"""
-    return html
-
+""")
 
 
-def render_cancellation_email(reservation, reason, logo_url, cancelled_by):
-    """
-    Premium cancellation email matching UTA Smart Kiosk theme.
-    Uses UTA blue + orange, cinematic glass panel, and full layout.
-    """
-
-    user = reservation.user
+def render_reservation_email(user, reservation, calendar_links, logo_url):
     full = getattr(reservation, "full_name", None) or user.get_full_name() or ""
-    user_first = full.split()[0] if full.strip() else (user.first_name or user.username or "User")
+    user_first = full.split()[0] if full.strip() else (user.first_name or user.username)
+
+    return _RESERVATION_SHELL.render(
+        logo_url=logo_url,
+        reservation_id=reservation.id,
+        title_icon="✅",
+        title="Reservation Confirmed",
+        user_first=user_first,
+        intro="your conference room reservation is locked in.",
+        room_name=reservation.room.name,
+        date_str=_date_str(reservation.date),
+        time_str=_time_range(reservation.start_time, reservation.end_time),
+        google_link=calendar_links.get("google", "#"),
+        outlook_link=calendar_links.get("outlook", "#"),
+        ics_text="Apple Calendar users: open the attached .ics file.",
+    )
+
+
+def _minutes_text(minutes):
+    minutes = max(0, int(minutes))
+    if minutes < 1:
+        return "less than a minute"
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
+
+
+def render_reservation_reminder_email(reservation, calendar_links, logo_url, minutes_until):
+    full = getattr(reservation, "full_name", None) or ""
+    user_first = _first_name(full, reservation.user)
+
+    return _RESERVATION_SHELL.render(
+        logo_url=logo_url,
+        reservation_id=reservation.id,
+        title_icon="⏰",
+        title="Starting Soon",
+        user_first=user_first,
+        intro=f"your conference room reservation starts in {_minutes_text(minutes_until)}.",
+        room_name=reservation.room.name,
+        date_str=_date_str(reservation.date),
+        time_str=_time_range(reservation.start_time, reservation.end_time),
+        google_link=calendar_links.get("google", "#"),
+        outlook_link=calendar_links.get("outlook", "#"),
+        ics_text="Running late or no longer need the room? Cancel from the kiosk so others can book it.",
+    )
+
+
+def render_reservation_reminder_text(reservation, minutes_until):
+    return "\n".join([
+        f"Reminder: your reservation starts in {_minutes_text(minutes_until)}.",
+        "",
+        f"Room: {reservation.room.name}",
+        f"Date: {_date_str(reservation.date)}",
+        f"Time: {_time_range(reservation.start_time, reservation.end_time)}",
+        "",
+        "This email was sent automatically by the kiosk reservation system. Please do not reply.",
+    ])
 
-    room_name = reservation.room.name
-    date_str = reservation.date.strftime("%Y-%m-%d")
-    time_str = f"{reservation.start_time.strftime('%I:%M %p')} – {reservation.end_time.strftime('%I:%M %p')}"
 
-    html = f"""\
+# --------------------------------------------------
+# RENDER SINGLE CANCELLATION
+# --------------------------------------------------
+_CANCELLATION_SHELL = compile_template("""\
 <html>
   <body style="margin:0; padding:0; background-color:#020617;">
     <table width="100%" cellpadding="0" cellspacing="0" style="background:#020617; padding:40px 0;">
@@ -287,7 +379,7 @@ def render_cancellation_email(reservation, reason, logo_url, cancelled_by):
                 <td align="right"
                     style="font-family:system-ui,'Segoe UI',sans-serif; font-size:12px;
                            color:rgba(148,163,184,0.65);">
-                  Cancellation Notice — #{reservation.id}
+                  Cancellation Notice — #{reservation_id}
                 </td>
 
               </tr></table>
@@ -360,7 +452,7 @@ def render_cancellation_email(reservation, reason, logo_url, cancelled_by):
                   </div>
                   <div style="font-family:system-ui,'Segoe UI',sans-serif;
                               font-size:14px; color:#e5e7eb;">
-                    {reason or "No reason provided."}
+                    {reason}
                   </div>
 
                 </td></tr>
@@ -387,34 +479,29 @@ def render_cancellation_email(reservation, reason, logo_url, cancelled_by):
     </table>
   </body>
 </html>
-"""
-    return html
+""")
 
 
-def render_bulk_cancellation_email(reservations, logo_url, cancelled_by, reason):
+def render_cancellation_email(reservation, reason, logo_url, cancelled_by):
     """
-    **PREMIUM BULK CANCELLATION EMAIL**
-    Matches the exact visual style of reservation confirmed,
-    reservation cancelled, and supply request.
-    Shows ALL cancelled reservations in a glass card list.
+    Premium cancellation email matching UTA Smart Kiosk theme.
+    Uses UTA blue + orange, cinematic glass panel, and full layout.
     """
+    return _CANCELLATION_SHELL.render(
+        logo_url=logo_url,
+        reservation_id=reservation.id,
+        cancelled_by=cancelled_by,
+        room_name=reservation.room.name,
+        date_str=_date_str(reservation.date),
+        time_str=_time_range(reservation.start_time, reservation.end_time),
+        reason=reason or "No reason provided.",
+    )
 
-    if not reservations:
-        return ""
 
-    # All reservations belong to same user
-    user = reservations[0].user
-    full = getattr(reservations[0], "full_name", None) or user.get_full_name() or ""
-    user_first = full.split()[0] if full.strip() else (user.first_name or user.username or "User")
-
-    # Build reservation rows
-    rows_html = ""
-    for r in reservations:
-        date_str = r.date.strftime("%Y-%m-%d")
-        time_str = f"{r.start_time.strftime('%I:%M %p')} – {r.end_time.strftime('%I:%M %p')}"
-        room_name = r.room.name
-
-        rows_html += f"""
+# --------------------------------------------------
+# RENDER BULK CANCELLATION
+# --------------------------------------------------
+_BULK_CANCELLATION_ROW = compile_template("""
           <tr>
             <td style="padding:14px 0;">
               <table width="100%" cellpadding="0" cellspacing="0"
@@ -441,10 +528,9 @@ def render_bulk_cancellation_email(reservations, logo_url, cancelled_by, reason)
               </table>
             </td>
           </tr>
-        """
+        """)
 
-    # wrap email
-    html = f"""\
+_BULK_CANCELLATION_SHELL = compile_template("""\
 <html>
   <body style="margin:0; padding:0; background-color:#020617;">
     <table width="100%" cellpadding="0" cellspacing="0"
@@ -512,7 +598,7 @@ def render_bulk_cancellation_email(reservations, logo_url, cancelled_by, reason)
                           text-shadow:0 0 14px rgba(238,118,36,0.55);">
                 ⚠️
               </span>
-              { "1 Reservation Cancelled" if len(reservations)==1 else f"{len(reservations)} Reservations Cancelled" }
+              {title}
             </div>
 
             <!-- Orange line -->
@@ -583,66 +669,138 @@ def render_bulk_cancellation_email(reservations, logo_url, cancelled_by, reason)
     </table>
   </body>
 </html>
-"""
-    return html
+""")
 
 
+_BULK_SUMMARY_NOTE = compile_template("""
+          <tr>
+            <td style="padding:6px 0 14px 0; font-family:system-ui,'Segoe UI',sans-serif;
+                       font-size:13px; color:rgba(209,213,219,0.8); line-height:1.55;">
+              {note}
+            </td>
+          </tr>
+        """)
+
 
-def render_supply_request_email(full_name, email, items, request_id, timestamp, logo_url, recipient_first="", recipient_last=""):
+def summarize_by_room(reservations):
+    """[(room_name, count, first_date, last_date)] sorted by room name."""
+    summary = {}
+    for r in reservations:
+        name = r.room.name
+        entry = summary.get(name)
+        if entry is None:
+            summary[name] = [1, r.date, r.date]
+        else:
+            entry[0] += 1
+            entry[1] = min(entry[1], r.date)
+            entry[2] = max(entry[2], r.date)
+    return [(name, *summary[name]) for name in sorted(summary)]
+
+
+def render_bulk_cancellation_email(reservations, logo_url, cancelled_by, reason, max_rows=None, attachment_name=None):
     """
-    Premium admin-facing email for a new supply request.
-    Uses real item images from GitHub, one item per row.
+    **PREMIUM BULK CANCELLATION EMAIL**
+    Matches the exact visual style of reservation confirmed,
+    reservation cancelled, and supply request.
+    Shows ALL cancelled reservations in a glass card list —
+    or, above max_rows, one summary card per room (the full list
+    then travels as an attachment so Gmail does not clip the email).
     """
 
-    full_name = full_name or "Unknown User"
-    email = email or "Not provided"
+    if not reservations:
+        return ""
 
-    if recipient_first or recipient_last:
-        greeting = f"Hello {recipient_first} {recipient_last}".strip() + ","
+    # All reservations belong to same user
+    user = reservations[0].user
+    full = getattr(reservations[0], "full_name", None) or user.get_full_name() or ""
+
+    row = _BULK_CANCELLATION_ROW.render
+
+    if max_rows is not None and len(reservations) > max_rows:
+        note = f"{len(reservations)} reservations were cancelled. Summary by room below"
+        note += f" — the full list is attached as <b>{attachment_name}</b>." if attachment_name else "."
+        rows_html = _BULK_SUMMARY_NOTE.render(note=note) + "".join(
+            row(
+                room_name=html_lib.escape(name),
+                date_str=f"{count} reservation{'s' if count != 1 else ''}",
+                time_str=f"{_date_str(first)} → {_date_str(last)}",
+            )
+            for name, count, first, last in summarize_by_room(reservations)
+        )
     else:
-        greeting = "Hello,"
+        rows_html = "".join(
+            row(
+                room_name=html_lib.escape(r.room.name),
+                date_str=_date_str(r.date),
+                time_str=_time_range(r.start_time, r.end_time),
+            )
+            for r in reservations
+        )
 
-    # Format timestamp safely
-    try:
-        timestamp_str = timestamp.strftime("%Y-%m-%d %I:%M %p")
-    except Exception:
-        timestamp_str = str(timestamp)
+    count = len(reservations)
+
+    return _BULK_CANCELLATION_SHELL.render(
+        logo_url=logo_url,
+        title="1 Reservation Cancelled" if count == 1 else f"{count} Reservations Cancelled",
+        user_first=_first_name(full, user, "User"),
+        cancelled_by=cancelled_by,
+        reason=reason,
+        rows_html=rows_html,
+    )
+
+
+def render_bulk_cancellation_text(reservations, cancelled_by, reason, max_rows=None, attachment_name=None):
+    """Compact text/plain alternative for the bulk cancellation email."""
+    count = len(reservations)
+    lines = [
+        f"{count} reservation{'s' if count != 1 else ''} cancelled",
+        f"Cancelled by: {cancelled_by}",
+        f"Reason: {reason}",
+        "",
+    ]
+
+    if max_rows is not None and count > max_rows:
+        for name, n, first, last in summarize_by_room(reservations):
+            lines.append(f"- {name}: {n} ({_date_str(first)} to {_date_str(last)})")
+        if attachment_name:
+            lines.append("")
+            lines.append(f"Full list attached: {attachment_name}")
+    else:
+        for r in reservations:
+            lines.append(f"- {r.room.name}: {_date_str(r.date)} {_time_range(r.start_time, r.end_time)}")
 
-    # Helper: turn item name ("AA Batteries") into folder ("AA_Batteries")
-    def folder_from_name(name: str) -> str:
-        base = (name or "").strip()
-        if not base:
-            return "Unknown"
-        # Replace slashes with space, then split on whitespace
-        parts = base.replace("/", " ").split()
-        norm_parts = []
-        for p in parts:
-            # Keep ALLCAPS tokens as-is (e.g., "AA")
-            if p.isupper():
-                norm_parts.append(p)
-            else:
-                norm_parts.append(p[0].upper() + p[1:])
-        return "_".join(norm_parts)
+    lines.append("")
+    lines.append("This notification was generated automatically by UTA Smart Kiosk.")
+    return "\n".join(lines)
 
-    # Build rows for each item
-    items = items or []
-    if not isinstance(items, (list, tuple)):
-        items = [str(items)]
 
-    rows_html = ""
-    for raw_name in items:
-        display_name = str(raw_name or "").strip()
-        safe_name = html_lib.escape(display_name or "(Unnamed item)")
+def render_bulk_cancellation_csv(reservations):
+    """Full cancelled-reservation list as CSV text (attachment)."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["reservation_id", "room", "date", "start_time", "end_time"])
+    for r in reservations:
+        # Room names are free text: neutralize spreadsheet formulas
+        # the same way the data exports do
+        writer.writerow([
+            r.id,
+            _csv_value(r.room.name),
+            _date_str(r.date),
+            r.start_time.strftime("%H:%M"),
+            r.end_time.strftime("%H:%M"),
+        ])
+    return out.getvalue()
 
-        folder = folder_from_name(display_name)
-        filename = f"{folder}.png"
 
-        image_url = (
-            "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
-            f"smartKiosk/media/items/{folder}/{filename}"
-        )
+# --------------------------------------------------
+# RENDER SUPPLY REQUEST (ADMIN-FACING)
+# --------------------------------------------------
+ITEM_IMAGE_BASE = (
+    "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
+    "smartKiosk/media/items"
+)
 
-        rows_html += f"""
+_SUPPLY_ITEM_ROW = compile_template("""
           <tr>
             <td style="padding:10px 0; width:48px; vertical-align:middle;">
               <img src="{image_url}" alt="{safe_name}"
@@ -657,19 +815,20 @@ def render_supply_request_email(full_name, email, items, request_id, timestamp,
               {safe_name}
             </td>
           </tr>
-        """
+        """)
 
-    if not rows_html:
-        rows_html = """
+_SUPPLY_NO_ITEMS_ROW = ("""
           <tr>
             <td colspan="2" style="padding:8px 0; font-family:system-ui,'Segoe UI',sans-serif;
                                    font-size:13px; color:rgba(148,163,184,0.9);">
               (No items listed)
             </td>
           </tr>
-        """
+        """)
 
-    html = f"""\
+# Shared by the single request and the digest: headline, intro and the
+# three detail labels are slots
+_SUPPLY_SHELL = compile_template("""\
 <html>
   <body style="margin:0; padding:0; background-color:#020617;">
     <table width="100%" cellpadding="0" cellspacing="0" style="background:#020617; padding:40px 0;">
@@ -712,7 +871,7 @@ def render_supply_request_email(full_name, email, items, request_id, timestamp,
                     <td align="right"
                         style="font-family:system-ui,'Segoe UI',sans-serif; font-size:12px;
                                color:rgba(148,163,184,0.65);">
-                      Supply Request ID: #{request_id}
+                      {id_label}
                     </td>
                   </tr>
                 </table>
@@ -726,7 +885,7 @@ def render_supply_request_email(full_name, email, items, request_id, timestamp,
                             font-weight:800; color:#f9fafb; letter-spacing:0.02em;">
                   <span style="font-size:26px; vertical-align:middle; margin-right:10px;
                                text-shadow:0 0 10px rgba(34,197,94,0.45);">📦</span>
-                  Supply Request Received
+                  {title}
                 </div>
 
                 <!-- Subtle orange accent line -->
@@ -739,7 +898,7 @@ def render_supply_request_email(full_name, email, items, request_id, timestamp,
                 </div>
                 <div style="font-family:system-ui,'Segoe UI',sans-serif; font-size:14px;
                             color:rgba(209,213,219,0.96); line-height:1.55;">
-                  A new supply request has been submitted via UTA Smart Kiosk.
+                  {intro}
                 </div>
               </td>
             </tr>
@@ -756,29 +915,29 @@ def render_supply_request_email(full_name, email, items, request_id, timestamp,
                     <td style="padding:18px 22px;">
                       <div style="font-family:system-ui,'Segoe UI',sans-serif;
                                   font-size:13px; color:rgba(156,163,175,0.9);">
-                        Requested by:
+                        {name_label}
                       </div>
                       <div style="font-family:system-ui,'Segoe UI',sans-serif;
                                   font-size:16px; font-weight:600; color:#e5e7eb; padding-bottom:10px;">
-                        {html_lib.escape(full_name)}
+                        {full_name}
                       </div>
 
                       <div style="font-family:system-ui,'Segoe UI',sans-serif;
                                   font-size:13px; color:rgba(156,163,175,0.9);">
-                        Email:
+                        {email_label}
                       </div>
                       <div style="font-family:system-ui,'Segoe UI',sans-serif;
                                   font-size:14px; color:#e5e7eb; padding-bottom:10px;">
-                        {html_lib.escape(email)}
+                        {email}
                       </div>
 
                       <div style="font-family:system-ui,'Segoe UI',sans-serif;
                                   font-size:13px; color:rgba(156,163,175,0.9);">
-                        Requested at:
+                        {time_label}
                       </div>
                       <div style="font-family:system-ui,'Segoe UI',sans-serif;
                                   font-size:14px; color:#e5e7eb;">
-                        {html_lib.escape(timestamp_str)}
+                        {timestamp}
                       </div>
                     </td>
                   </tr>
@@ -831,16 +990,183 @@ def render_supply_request_email(full_name, email, items, request_id, timestamp,
     </table>
   </body>
 </html>
-"""
-    return html
+""")
+
+
+@lru_cache(maxsize=1024)
+def folder_from_name(name: str) -> str:
+    """Turn an item name ("AA Batteries") into its media folder ("AA_Batteries")."""
+    base = (name or "").strip()
+    if not base:
+        return "Unknown"
+    # Replace slashes with space, then split on whitespace
+    parts = base.replace("/", " ").split()
+    norm_parts = []
+    for p in parts:
+        # Keep ALLCAPS tokens as-is (e.g., "AA")
+        if p.isupper():
+            norm_parts.append(p)
+        else:
+            norm_parts.append(p[0].upper() + p[1:])
+    return "_".join(norm_parts)
+
+
+@lru_cache(maxsize=2048)
+def supply_item_row(name: str, qty: int = 1) -> str:
+    """
+    One item row; identical for every email that lists this item, so memoized.
+    The image comes from the bare name; " ×qty" only goes on the label.
+    """
+    safe_name = html_lib.escape(name or "(Unnamed item)")
+    if qty > 1:
+        safe_name = f"{safe_name} ×{qty}"
+    folder = folder_from_name(name)
 
+    return _SUPPLY_ITEM_ROW.render(
+        image_url=f"{ITEM_IMAGE_BASE}/{folder}/{folder}.png",
+        safe_name=safe_name,
+    )
 
-def render_password_reset_email(logo_url: str, code: str) -> str:
+
+def render_supply_request_email(full_name, email, items, request_id, timestamp, logo_url, recipient_first="", recipient_last=""):
     """
-    Premium UTA Smart Kiosk email for password reset (6-digit login code).
-    Matches visual style of existing reservation & supply emails.
+    Premium admin-facing email for a new supply request.
+    Uses real item images from GitHub, one item per row.
+    `items`: item names, or (name, qty) pairs.
     """
-    return f"""
+
+    full_name = full_name or "Unknown User"
+    email = email or "Not provided"
+
+    if recipient_first or recipient_last:
+        greeting = f"Hello {recipient_first} {recipient_last}".strip() + ","
+    else:
+        greeting = "Hello,"
+
+    # Format timestamp safely
+    try:
+        timestamp_str = timestamp.strftime("%Y-%m-%d %I:%M %p")
+    except Exception:
+        timestamp_str = str(timestamp)
+
+    # Build rows for each item
+    items = items or []
+    if not isinstance(items, (list, tuple)):
+        items = [str(items)]
+
+    rows = []
+    for entry in items:
+        raw_name, qty = entry if isinstance(entry, tuple) else (entry, 1)
+        rows.append(supply_item_row(str(raw_name or "").strip(), qty))
+    rows_html = "".join(rows)
+
+    return _SUPPLY_SHELL.render(
+        logo_url=logo_url,
+        id_label=f"Supply Request ID: #{request_id}",
+        title="Supply Request Received",
+        greeting=greeting,
+        intro="A new supply request has been submitted via UTA Smart Kiosk.",
+        name_label="Requested by:",
+        full_name=html_lib.escape(full_name),
+        email_label="Email:",
+        email=html_lib.escape(email),
+        time_label="Requested at:",
+        timestamp=html_lib.escape(timestamp_str),
+        rows_html=rows_html or _SUPPLY_NO_ITEMS_ROW,
+    )
+
+
+# --------------------------------------------------
+# RENDER SUPPLY DIGEST (ADMIN-FACING, MANY REQUESTS)
+# --------------------------------------------------
+def summarize_supply_requests(requests):
+    """
+    Group items across requests.
+    Returns (item_counts, requesters): item_counts is [(name, count)] by
+    count desc then name; requesters are unique names in request order.
+    """
+    counts = {}
+    requesters = {}
+    for req in requests:
+        items = req.items or []
+        if not isinstance(items, (list, tuple)):
+            items = [items]
+        for raw_name in items:
+            name = str(raw_name or "").strip()
+            counts[name] = counts.get(name, 0) + 1
+        requesters.setdefault(req.full_name or "Unknown User", None)
+
+    item_counts = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    return item_counts, list(requesters)
+
+
+def _digest_window(requests):
+    first = min(r.requested_at for r in requests)
+    last = max(r.requested_at for r in requests)
+    return f"{first.strftime('%Y-%m-%d %I:%M %p')} – {last.strftime('%I:%M %p')}"
+
+
+def render_supply_digest_email(requests, logo_url, recipient_first="", recipient_last=""):
+    """
+    One admin email for every supply request collected in a digest
+    window. Items are grouped with their counts.
+    """
+    if not requests:
+        return ""
+
+    if recipient_first or recipient_last:
+        greeting = f"Hello {recipient_first} {recipient_last}".strip() + ","
+    else:
+        greeting = "Hello,"
+
+    item_counts, requesters = summarize_supply_requests(requests)
+
+    rows_html = "".join(
+        _SUPPLY_ITEM_ROW.render(
+            image_url=f"{ITEM_IMAGE_BASE}/{folder_from_name(name)}/{folder_from_name(name)}.png",
+            safe_name=f"{html_lib.escape(name or '(Unnamed item)')} &times; {count}",
+        )
+        for name, count in item_counts
+    )
+
+    ids = sorted(r.id for r in requests)
+    id_range = f"#{ids[0]}" if len(ids) == 1 else f"#{ids[0]}–#{ids[-1]}"
+    total_items = sum(count for _, count in item_counts)
+
+    return _SUPPLY_SHELL.render(
+        logo_url=logo_url,
+        id_label=f"Supply Requests: {id_range}",
+        title="Supply Request Digest",
+        greeting=greeting,
+        intro=f"{len(requests)} supply request(s) were submitted via UTA Smart Kiosk since the last digest.",
+        name_label="Requesters:",
+        full_name=html_lib.escape(", ".join(requesters)),
+        email_label="Requests:",
+        email=f"{len(requests)} request(s), {total_items} item(s)",
+        time_label="Window:",
+        timestamp=html_lib.escape(_digest_window(requests)),
+        rows_html=rows_html or _SUPPLY_NO_ITEMS_ROW,
+    )
+
+
+def render_supply_digest_text(requests):
+    """text/plain alternative for the supply digest."""
+    item_counts, requesters = summarize_supply_requests(requests)
+    lines = [
+        f"{len(requests)} supply request(s) — {_digest_window(requests)}",
+        f"Requesters: {', '.join(requesters)}",
+        "",
+    ]
+    lines += [f"- {name or '(Unnamed item)'} x {count}" for name, count in item_counts]
+    lines.append("")
+    lines.append("This notification was generated automatically by UTA Smart Kiosk.")
+    return "\n".join(lines)
+
+
+# --------------------------------------------------
+# RENDER PASSWORD RESET CODE
+# --------------------------------------------------
+_PASSWORD_RESET_SHELL = compile_template("""
     <div style="
         font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen,
         Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
@@ -925,8 +1251,20 @@ def render_password_reset_email(logo_url: str, code: str) -> str:
             margin-top: 28px;
             text-align: center;
         ">
-          © {datetime.datetime.now().year} UTA Smart Kiosk - All Rights Reserved.
+          © {year} UTA Smart Kiosk - All Rights Reserved.
         </p>
       </div>
     </div>
+    """)
+
+
+def render_password_reset_email(logo_url: str, code: str) -> str:
+    """
+    Premium UTA Smart Kiosk email for password reset (6-digit login code).
+    Matches visual style of existing reservation & supply emails.
     """
+    return _PASSWORD_RESET_SHELL.render(
+        logo_url=logo_url,
+        code=code,
+        year=datetime.datetime.now().year,
+    )
@@ -0,0 +1,269 @@
+# api/utils/exports.py
+"""
+Streaming CSV / Parquet exports of reservation and supply request history.
+
+    chunks("reservations", "csv", start, end)  → iterator of bytes
+
+Rows are read in keyset pages (WHERE id > last ORDER BY id LIMIT n)
+and encoded page by page, so memory stays at one page however many
+years are exported. QuerySet.iterator() would not be enough here:
+PyMySQL (TiDB/MySQL) has no server-side cursors and would buffer the
+whole result set; short keyset queries also never hold a long-running
+transaction open.
+
+Parquet needs pyarrow (optional dependency); each page becomes one row
+group and is streamed as soon as it is written.
+"""
+import csv
+import datetime
+import io
+from collections import Counter, namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from api.db_retry import run_with_backoff
+from api.models import RoomReservation, SupplyRequest
+from api.utils.supply_caps import day_start
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+FORMATS = ("csv", "parquet")
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+# kind: int | str | bool | date | time | datetime (→ Arrow type for Parquet)
+Column = namedtuple("Column", "name field kind convert", defaults=(None,))
+
+
+def _item_summary(names):
+    """["Pens", "Pens", "Tape"] → "Pens ×2; Tape" (items repeats a name per unit)."""
+    return "; ".join(
+        f"{name} ×{qty}" if qty > 1 else name for name, qty in Counter(names or []).items()
+    )
+
+
+class Dataset:
+    def __init__(self, name, model, columns, range_filter):
+        self.name = name
+        self.model = model
+        self.columns = columns
+        self.range_filter = range_filter
+        self.fields = list(dict.fromkeys(["id"] + [c.field for c in columns]))
+
+    def queryset(self, start=None, end=None):
+        qs = self.model.objects.all()
+        if start or end:
+            qs = qs.filter(**self.range_filter(start, end))
+        return qs
+
+    def pages(self, start=None, end=None, chunk_size=None):
+        """Lists of output rows, at most chunk_size each, ordered by id."""
+        chunk_size = chunk_size or getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+        qs = self.queryset(start, end).order_by("id").values_list(*self.fields)
+        index = {field: i for i, field in enumerate(self.fields)}
+        last_id = 0
+        while True:
+            page = run_with_backoff(lambda: list(qs.filter(id__gt=last_id)[:chunk_size]))
+            if not page:
+                return
+            last_id = page[-1][0]
+            yield [
+                tuple(
+                    c.convert(row[index[c.field]]) if c.convert else row[index[c.field]]
+                    for c in self.columns
+                )
+                for row in page
+            ]
+
+
+def _reservation_range(start, end):
+    lookups = {}
+    if start:
+        lookups["date__gte"] = start
+    if end:
+        lookups["date__lte"] = end
+    return lookups
+
+
+def _supply_range(start, end):
+    # Local days, same as caps and analytics
+    lookups = {}
+    if start:
+        lookups["requested_at__gte"] = day_start(start)
+    if end:
+        lookups["requested_at__lt"] = day_start(end + datetime.timedelta(days=1))
+    return lookups
+
+
+DATASETS = {
+    "reservations": Dataset(
+        "reservations",
+        RoomReservation,
+        [
+            Column("id", "id", "int"),
+            Column("room", "room__name", "str"),
+            Column("date", "date", "date"),
+            Column("start_time", "start_time", "time"),
+            Column("end_time", "end_time", "time"),
+            Column("user_id", "user_id", "int"),
+            Column("full_name", "full_name", "str"),
+            Column("email", "email", "str"),
+            Column("cancelled", "cancelled", "bool"),
+            Column("cancel_reason", "cancel_reason", "str"),
+            Column("created_at", "created_at", "datetime"),
+            Column("checked_in_at", "checked_in_at", "datetime"),
+        ],
+        _reservation_range,
+    ),
+    "supply_requests": Dataset(
+        "supply_requests",
+        SupplyRequest,
+        [
+            Column("id", "id", "int"),
+            Column("requested_at", "requested_at", "datetime"),
+            Column("user_id", "user_id", "int"),
+            Column("full_name", "full_name", "str"),
+            Column("email", "email", "str"),
+            Column("items", "items", "str", _item_summary),
+            Column("units", "items", "int", lambda names: len(names or [])),
+        ],
+        _supply_range,
+    ),
+}
+
+
+# ---------------------------------------------------------
+# CSV
+# ---------------------------------------------------------
+# Text a spreadsheet would run as a formula (names, emails, cancel reasons
+# are user input): prefixed with ' so it opens as plain text
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_chunks(dataset, pages):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.name for c in dataset.columns])
+    yield buffer.getvalue().encode("utf-8")
+
+    for page in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(v) for v in row] for row in page)
+        yield buffer.getvalue().encode("utf-8")
+
+
+# ---------------------------------------------------------
+# PARQUET
+# ---------------------------------------------------------
+def _arrow_type(kind):
+    return {
+        "int": pa.int64(),
+        "str": pa.string(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "time": pa.time64("us"),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }[kind]
+
+
+class _Sink:
+    """Write-only file object: ParquetWriter writes, the generator drains."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _parquet_chunks(dataset, pages):
+    schema = pa.schema([(c.name, _arrow_type(c.kind)) for c in dataset.columns])
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for page in pages:
+            columns = list(zip(*page))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()  # footer
+
+
+# ---------------------------------------------------------
+# ENTRY POINTS
+# ---------------------------------------------------------
+def parquet_available():
+    return pq is not None
+
+
+def filename(dataset, fmt, start=None, end=None):
+    span = "-".join(d.isoformat() for d in (start, end) if d) or "all"
+    return f"{dataset}-{span}.{fmt}"
+
+
+def chunks(dataset, fmt, start=None, end=None, chunk_size=None):
+    """bytes chunks of the export; raises ValueError for unknown dataset/format."""
+    if dataset not in DATASETS:
+        raise ValueError(f"dataset must be one of: {', '.join(DATASETS)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    if fmt == "parquet" and not parquet_available():
+        raise ValueError("Parquet export requires pyarrow")
+
+    spec = DATASETS[dataset]
+    pages = spec.pages(start, end, chunk_size)
+    return _parquet_chunks(spec, pages) if fmt == "parquet" else _csv_chunks(spec, pages)
+
+
+async def achunks(iterator):
+    """
+    Async view of a chunk iterator for ASGI responses (a sync iterator
+    would be buffered whole by Django). Every step runs on the same
+    sync thread, which owns the DB connection.
+    """
+    done = object()
+    while True:
+        chunk = await sync_to_async(next, thread_sensitive=True)(iterator, done)
+        if chunk is done:
+            return
+        yield chunk
@@ -0,0 +1,177 @@
+# api/utils/image_import.py
+"""
+Shared helpers for the bulk image import commands
+(bulk_import_item_images / bulk_import_ui_assets).
+
+Reading + hashing runs in a thread pool (pure I/O), optional Pillow
+re-encoding runs in a process pool (CPU bound), and storage uploads go
+back through a thread pool. Callers only touch the database from the
+main thread.
+"""
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+# ------------------------------------------------------------
+# CONTENT HASHING
+# ------------------------------------------------------------
+def hash_bytes(data):
+    """sha256 hex digest of raw file bytes (stored on the model)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def image_dimensions(data):
+    """(width, height) read from the image header, or (None, None)."""
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            return img.size
+    except Exception:
+        return None, None
+
+
+def read_source(path):
+    """Read one source file and hash it. Runs inside the thread pool."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    return path, data, hash_bytes(data)
+
+
+def scan_folder(folder_path, valid_exts):
+    """Return the sorted list of importable filenames in a folder."""
+    return sorted(
+        f for f in os.listdir(folder_path)
+        if os.path.splitext(f)[1].lower() in valid_exts
+    )
+
+
+def dedupe_by_stem(filenames, valid_exts, name_of=None):
+    """
+    One file per asset name ("logo.png" and "logo.jpg" are both "logo").
+    name_of maps a file stem to the name (default: the stem itself).
+    The extension listed first in valid_exts wins.
+    Returns ({name: filename}, [(skipped filename, kept filename)]).
+    """
+    rank = {ext: i for i, ext in enumerate(valid_exts)}
+    kept = {}
+    skipped = []
+    for filename in sorted(filenames, key=lambda f: (rank[os.path.splitext(f)[1].lower()], f)):
+        name = os.path.splitext(filename)[0]
+        if name_of is not None:
+            name = name_of(name)
+        if name in kept:
+            skipped.append((filename, kept[name]))
+        else:
+            kept[name] = filename
+    return kept, skipped
+
+
+def read_sources(folder_path, filenames, workers):
+    """
+    Read + hash every file in parallel.
+    Returns { filename: (bytes, sha256) }.
+    """
+    paths = [os.path.join(folder_path, f) for f in filenames]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(read_source, paths)
+        return {
+            os.path.basename(path): (data, digest)
+            for path, data, digest in results
+        }
+
+
+# ------------------------------------------------------------
+# PILLOW RE-ENCODING (process pool)
+# ------------------------------------------------------------
+def reencode_image(data, ext):
+    """
+    Losslessly re-encode an image with Pillow's optimizer.
+    Must stay a module-level function so it can be pickled
+    into the process pool. Returns the original bytes if the
+    re-encoded version is not smaller.
+    """
+    from PIL import Image
+
+    fmt = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}.get(ext)
+    if not fmt:
+        return data
+
+    with Image.open(io.BytesIO(data)) as img:
+        out = io.BytesIO()
+        if fmt == "PNG":
+            img.save(out, format=fmt, optimize=True)
+        elif fmt == "JPEG":
+            img.save(out, format=fmt, optimize=True, quality="keep" if img.format == "JPEG" else 90)
+        else:
+            img.save(out, format=fmt, lossless=True)
+
+    optimized = out.getvalue()
+    return optimized if len(optimized) < len(data) else data
+
+
+def reencode_all(jobs, processes):
+    """
+    jobs: list of (key, bytes, ext)
+    Returns { key: bytes } with re-encoded payloads.
+    """
+    if not jobs:
+        return {}
+
+    keys = [key for key, _, _ in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        encoded = pool.map(
+            reencode_image,
+            [data for _, data, _ in jobs],
+            [ext for _, _, ext in jobs],
+        )
+        return dict(zip(keys, encoded))
+
+
+# ------------------------------------------------------------
+# STORAGE UPLOADS (thread pool)
+# ------------------------------------------------------------
+def upload_all(uploads, workers):
+    """
+    uploads: list of (key, field_file, filename, bytes)
+    Saves each payload through the field's storage WITHOUT touching
+    the database. Returns { key: stored_name }.
+    """
+    def _upload(job):
+        key, field_file, filename, data = job
+        name = field_file.field.generate_filename(field_file.instance, filename)
+        stored = field_file.storage.save(name, ContentFile(data), max_length=field_file.field.max_length)
+        return key, stored
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_upload, uploads))
+
+
+# ------------------------------------------------------------
+# TIMING SUMMARY
+# ------------------------------------------------------------
+class PhaseTimer:
+    """Tiny wall-clock timer for the per-phase summary."""
+
+    def __init__(self):
+        self.phases = []
+        self._start = time.perf_counter()
+        self._last = self._start
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.phases.append((label, now - self._last))
+        self._last = now
+
+    def lines(self):
+        total = time.perf_counter() - self._start
+        out = [f"{label:<14} {secs * 1000:9.1f} ms" for label, secs in self.phases]
+        out.append(f"{'total':<14} {total * 1000:9.1f} ms")
+        return out
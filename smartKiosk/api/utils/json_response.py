@@ -0,0 +1,96 @@
+# api/utils/json_response.py
+"""
+Drop-in replacement for django.http.JsonResponse with a pluggable
+encoder. Uses orjson when it is installed (several times faster than
+the stdlib encoder), otherwise compact stdlib json.
+
+settings.JSON_RESPONSE_BACKEND:
+    "auto"   (default) orjson if importable, else stdlib
+    "orjson" require orjson
+    "json"   stdlib only
+    "<dotted.path>" any callable(obj) -> bytes
+"""
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _orjson_default(obj):
+    # Decimal, lazy strings, etc. — same coverage as DjangoJSONEncoder
+    return DjangoJSONEncoder().default(obj)
+
+
+def dumps_orjson(data):
+    return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dumps_stdlib(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode("utf-8")
+
+
+_dumps = None
+
+
+def get_dumps():
+    """Resolve the configured encoder once per process."""
+    global _dumps
+    if _dumps is None:
+        backend = getattr(settings, "JSON_RESPONSE_BACKEND", "auto")
+        if backend == "auto":
+            _dumps = dumps_orjson if orjson is not None else dumps_stdlib
+        elif backend == "orjson":
+            if orjson is None:
+                raise ImportError("JSON_RESPONSE_BACKEND='orjson' but orjson is not installed")
+            _dumps = dumps_orjson
+        elif backend == "json":
+            _dumps = dumps_stdlib
+        else:
+            _dumps = import_string(backend)
+    return _dumps
+
+
+class JsonResponse(HttpResponse):
+    """Same signature as django.http.JsonResponse."""
+
+    def __init__(self, data, encoder=None, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+
+        if encoder is not None or json_dumps_params:
+            # Caller asked for stdlib behaviour explicitly
+            content = json.dumps(data, cls=encoder or DjangoJSONEncoder, **(json_dumps_params or {}))
+        else:
+            content = get_dumps()(data)
+
+        super().__init__(content=content, **kwargs)
+
+
+# ---------------------------------------------------------
+# COMPACT (COLUMNAR) LIST MODE
+# ?format=compact  →  { "columns": [...], "rows": [[...], ...] }
+# Keys are sent once instead of once per row.
+# ---------------------------------------------------------
+def wants_compact(request):
+    return request.GET.get("format") == "compact"
+
+
+def to_columns(records):
+    if not records:
+        return {"columns": [], "rows": []}
+    columns = list(records[0].keys())
+    return {
+        "columns": columns,
+        "rows": [[r[c] for c in columns] for r in records],
+    }
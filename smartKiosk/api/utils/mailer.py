@@ -0,0 +1,86 @@
+# api/utils/mailer.py
+"""
+One place that builds and sends outgoing email, so views and
+management commands (digests, reminders) share the same code path.
+"""
+import asyncio
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from kiosks.metrics import timed_smtp
+
+# Same hosted logo the views use (Outlook/Gmail safe)
+LOGO_URL = (
+    "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
+    "smartKiosk/media/ui_assets/apple-touch-icon.png"
+)
+
+
+def build_message(
+    to_email,
+    subject,
+    html_content,
+    *,
+    from_email=None,
+    from_name="UTA Smart Kiosk",
+    ics_content=None,
+    text_content="",
+    attachments=None,
+    connection=None,
+):
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+        connection=connection,
+    )
+    msg.attach_alternative(html_content, "text/html")
+
+    if ics_content:
+        msg.attach("reservation.ics", ics_content, "text/calendar")
+
+    # [(filename, content, mimetype), ...]
+    for filename, content, mimetype in attachments or ():
+        msg.attach(filename, content, mimetype)
+
+    return msg
+
+
+def send_email(to_email, subject, html_content, **kwargs):
+    msg = build_message(to_email, subject, html_content, **kwargs)
+    with timed_smtp():
+        msg.send()
+    return True
+
+
+def send_batch(messages):
+    """
+    Send prepared messages over ONE SMTP connection instead of one
+    connect/login/quit per email. `messages` is [(to_email, subject,
+    html_content, kwargs)]. Returns the number sent.
+    """
+    if not messages:
+        return 0
+
+    connection = get_connection()
+    built = [
+        build_message(to_email, subject, html, connection=connection, **kwargs)
+        for to_email, subject, html, kwargs in messages
+    ]
+    with timed_smtp():
+        return connection.send_messages(built) or 0
+
+
+# ---------------------------------------------------------
+# ASYNC VIEWS
+# SMTP runs in a worker thread so the event loop keeps serving other
+# kiosks meanwhile (context — and with it SMTP timing — is copied).
+# ---------------------------------------------------------
+async def asend_email(to_email, subject, html_content, **kwargs):
+    return await asyncio.to_thread(send_email, to_email, subject, html_content, **kwargs)
+
+
+async def asend_batch(messages):
+    return await asyncio.to_thread(send_batch, messages)
@@ -0,0 +1,99 @@
+# api/utils/password_hashing.py
+"""
+Password hashing off the request thread.
+
+Request paths (login, registration, set-password) hash in one bounded
+thread pool per process (PASSWORD_HASH_THREADS). The hashers spend
+their time in C code that releases the GIL, so the pool caps how many
+cores hashing can take at once: a semester-start registration burst
+queues here instead of starving every other kiosk request.
+
+Bulk imports use hash_passwords() with the caller's pool: a process
+pool in the management command, the bounded threads for uploads.
+Process workers only receive (password, hasher class path) and call the
+hasher directly: they import no models and read no settings, and the
+encoded value uses whatever hasher is the default in the parent.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password, verify_password
+from django.utils.module_loading import import_string
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # A forked child (import process pool) has none of the parent's threads
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# ---------------------------------------------------------
+# BOUNDED THREAD POOL (request paths)
+# ---------------------------------------------------------
+def hashing_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, getattr(settings, "PASSWORD_HASH_THREADS", 2)),
+                    thread_name_prefix="password-hash",
+                )
+    return _executor
+
+
+def make_password_bounded(password):
+    """make_password() run in the bounded pool (blocks the caller until done)."""
+    return hashing_executor().submit(make_password, password).result()
+
+
+def verify_password_bounded(password, encoded):
+    """(is_correct, must_update) for a stored hash, computed in the bounded pool."""
+    return hashing_executor().submit(verify_password, password, encoded).result()
+
+
+# ---------------------------------------------------------
+# BULK IMPORTS (process pool or the bounded threads)
+# ---------------------------------------------------------
+def hasher_path(hasher):
+    return f"{type(hasher).__module__}.{type(hasher).__qualname__}"
+
+
+def hash_password(password, path):
+    """Encode one password. Module-level so it pickles into the process pool."""
+    hasher = import_string(path)()
+    return hasher.encode(password, hasher.salt())
+
+
+def hash_passwords(passwords, pool=None):
+    """
+    [raw password or None] → [encoded], in order. None/"" gets an
+    unusable password (nothing to hash). Hashes in `pool` (a process
+    pool, or the bounded hashing_executor()) when given and there is
+    more than one.
+    """
+    encoded = [None if password else make_password(None) for password in passwords]
+    todo = [i for i, password in enumerate(passwords) if password]
+    if not todo:
+        return encoded
+
+    path = hasher_path(get_hasher("default"))
+    raw = [passwords[i] for i in todo]
+    if pool is not None and len(raw) > 1:
+        results = pool.map(hash_password, raw, repeat(path))
+    else:
+        results = [hash_password(password, path) for password in raw]
+
+    for i, value in zip(todo, results):
+        encoded[i] = value
+    return encoded
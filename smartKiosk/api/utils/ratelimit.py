@@ -0,0 +1,201 @@
+# api/utils/ratelimit.py
+"""
+Fixed-window rate limiting for auth endpoints, stored in the Django cache.
+
+settings.RATE_LIMITS = {
+    "<scope>": {"rate": "10/min", "burst": 10, "keys": ("ip", "email")},
+}
+
+rate  : average speed, DRF style "<n>/<sec|min|hour|day>"
+burst : requests allowed per window (defaults to n); the window lasts
+        burst / rate, so "30/min" with burst 10 allows 10 per 20 s
+keys  : one counter per key kind — "ip", "email" (JSON body), "card"
+        (sha256 of the JSON raw_swipe, the swipe itself is never stored)
+
+A request is refused when ANY of its counters is over the limit: 429 +
+Retry-After (seconds to the end of the window), returned before the
+view touches the database or SMTP.
+
+Counting is cache.add(key, 0) + cache.incr(key) (aadd / aincr for async
+views, so the event loop never blocks on the cache): atomic in Redis,
+Memcached and LocMem, so concurrent requests never share a slot.
+The limit is only global when the default cache is shared by every
+worker process — set REDIS_URL in production (see CACHES in
+settings); the LocMem fallback limits each process separately.
+DatabaseCache is not suitable (its incr is read-then-write).
+"""
+import functools
+import hashlib
+import json
+import math
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+from api.utils.json_response import JsonResponse
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'10/min' → (10, 60.0)"""
+    count, _, period = rate.partition("/")
+    period = period.strip().lower()
+    digits = "".join(ch for ch in period if ch.isdigit())
+    unit = period.lstrip("0123456789")[:1]
+    return int(count), float(digits or 1) * PERIODS[unit]
+
+
+def client_ip(request):
+    if getattr(settings, "RATE_LIMIT_TRUST_FORWARDED", False):
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body.decode("utf-8") or "{}")
+    except (ValueError, UnicodeDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def request_keys(request, kinds):
+    """[(kind, value)] for every key kind present on this request."""
+    body = None
+    keys = []
+    for kind in kinds:
+        if kind == "ip":
+            value = client_ip(request)
+        else:
+            if body is None:
+                body = _json_body(request)
+            if kind == "email":
+                value = str(body.get("email") or "").strip().lower()
+            elif kind == "card":
+                raw = str(body.get("raw_swipe") or "").strip()
+                value = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] if raw else ""
+            else:
+                raise ValueError(f"Unknown rate limit key: {kind}")
+        if value:
+            keys.append((kind, value))
+    return keys
+
+
+def _window(counter_key, window, now):
+    """(cache key, window index, ttl) of the fixed window `now` falls in."""
+    index = int(now // window)
+    return f"{counter_key}:{index}", index, max(1, math.ceil(window)) + 1
+
+
+def _wait(count, limit, index, window, now):
+    if count <= limit:
+        return 0.0
+    return max(0.001, (index + 1) * window - now)
+
+
+def hit_window(counter_key, limit, window, now=None):
+    """
+    Count one request in the current fixed window. Returns 0.0 when
+    allowed, otherwise the seconds until the window ends.
+    """
+    now = now if now is not None else time.time()
+    key, index, ttl = _window(counter_key, window, now)
+
+    cache.add(key, 0, ttl)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Expired between add and incr: start the window again
+        cache.add(key, 0, ttl)
+        count = cache.incr(key)
+
+    return _wait(count, limit, index, window, now)
+
+
+async def ahit_window(counter_key, limit, window, now=None):
+    """hit_window for async views: the cache round trips never block the event loop."""
+    now = now if now is not None else time.time()
+    key, index, ttl = _window(counter_key, window, now)
+
+    await cache.aadd(key, 0, ttl)
+    try:
+        count = await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, ttl)
+        count = await cache.aincr(key)
+
+    return _wait(count, limit, index, window, now)
+
+
+def _counters(request, scope):
+    """[(counter key, limit, window)] for `scope` as configured in RATE_LIMITS."""
+    if not getattr(settings, "RATE_LIMIT_ENABLED", True):
+        return []
+
+    config = getattr(settings, "RATE_LIMITS", {}).get(scope)
+    if not config:
+        return []
+
+    count, period = parse_rate(config["rate"])
+    limit = config.get("burst", count)
+    window = period * limit / count
+
+    return [
+        (f"ratelimit:{scope}:{kind}:{value}", limit, window)
+        for kind, value in request_keys(request, config.get("keys", ("ip",)))
+    ]
+
+
+def check_rate_limit(request, scope):
+    """Seconds to wait (0.0 = allowed) for `scope` as configured in RATE_LIMITS."""
+    wait = 0.0
+    for counter_key, limit, window in _counters(request, scope):
+        wait = max(wait, hit_window(counter_key, limit, window))
+    return wait
+
+
+async def acheck_rate_limit(request, scope):
+    wait = 0.0
+    for counter_key, limit, window in _counters(request, scope):
+        wait = max(wait, await ahit_window(counter_key, limit, window))
+    return wait
+
+
+def too_many_requests(wait):
+    retry_after = max(1, math.ceil(wait))
+    response = JsonResponse(
+        {"ok": False, "error": f"Too many attempts. Try again in {retry_after} seconds."},
+        status=429,
+    )
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def rate_limit(scope):
+    """View decorator (sync or async views)."""
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            async def wrapped(request, *args, **kwargs):
+                wait = await acheck_rate_limit(request, scope)
+                if wait:
+                    return too_many_requests(wait)
+                return await view(request, *args, **kwargs)
+
+            wrapped = markcoroutinefunction(functools.wraps(view)(wrapped))
+        else:
+            @functools.wraps(view)
+            def wrapped(request, *args, **kwargs):
+                wait = check_rate_limit(request, scope)
+                if wait:
+                    return too_many_requests(wait)
+                return view(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
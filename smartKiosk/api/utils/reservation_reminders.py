@@ -0,0 +1,82 @@
+# api/utils/reservation_reminders.py
+"""
+"Starting soon" reminder emails for room reservations.
+
+Each tick is one indexed range query over (date, start_time) for the
+next N minutes. Due rows are claimed with one UPDATE on
+reminder_sent_at, so a reminder goes out once even if two workers tick
+at the same time. Claimed rows are sent in batches over one SMTP
+connection per batch.
+"""
+import datetime
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from api.models import RoomReservation
+from api.utils.calendar_utils import build_calendar_links
+from api.utils.email_templates import render_reservation_reminder_email, render_reservation_reminder_text
+from api.utils.mailer import LOGO_URL, send_batch
+from api.utils.reservation_windows import local_now, starts_within_q
+
+logger = logging.getLogger(__name__)
+
+
+def claim_due(lead_minutes, stamp, now):
+    due_ids = list(
+        RoomReservation.objects.filter(
+            starts_within_q(lead_minutes, now),
+            cancelled=False,
+            reminder_sent_at__isnull=True,
+        ).values_list("id", flat=True)
+    )
+    if not due_ids:
+        return []
+
+    RoomReservation.objects.filter(id__in=due_ids, reminder_sent_at__isnull=True).update(reminder_sent_at=stamp)
+    return list(
+        RoomReservation.objects.filter(id__in=due_ids, reminder_sent_at=stamp)
+        .select_related("room", "user")
+        .order_by("date", "start_time")
+    )
+
+
+def build_reminder(reservation, now):
+    start = datetime.datetime.combine(reservation.date, reservation.start_time)
+    minutes_until = (start - now).total_seconds() // 60
+
+    links = build_calendar_links(reservation)
+    return (
+        reservation.email or reservation.user.email,
+        f"⏰ Starting soon — {reservation.room.name} at {reservation.start_time.strftime('%I:%M %p')}",
+        render_reservation_reminder_email(reservation, links, LOGO_URL, minutes_until),
+        {"text_content": render_reservation_reminder_text(reservation, minutes_until)},
+    )
+
+
+def send_due_reminders(lead_minutes=None, batch_size=None, now=None):
+    """
+    Email every reservation starting within `lead_minutes` that has not
+    been reminded yet. Returns (claimed, sent). A failed batch is
+    released so the next tick retries it.
+    """
+    lead_minutes = lead_minutes or getattr(settings, "RESERVATION_REMINDER_MINUTES", 30)
+    batch_size = max(1, batch_size or getattr(settings, "RESERVATION_REMINDER_BATCH_SIZE", 50))
+    now = now or local_now()
+    stamp = timezone.now()
+
+    due = claim_due(lead_minutes, stamp, now)
+    sent = 0
+
+    for i in range(0, len(due), batch_size):
+        batch = due[i:i + batch_size]
+        try:
+            sent += send_batch([build_reminder(r, now) for r in batch if r.email or r.user.email])
+        except Exception:
+            logger.exception("Reminder batch of %d failed; released for the next tick", len(batch))
+            RoomReservation.objects.filter(
+                id__in=[r.id for r in batch], reminder_sent_at=stamp
+            ).update(reminder_sent_at=None)
+
+    return len(due), sent
@@ -0,0 +1,68 @@
+# api/utils/reservation_windows.py
+"""
+Time-window queries over RoomReservation (date, start_time).
+
+Reservations store local wall-clock date + time (America/Chicago, the
+same zone the calendar links use), so "now" is converted to that zone
+before building the filter. A window that crosses midnight becomes two
+index-friendly ranges instead of a scan.
+"""
+import datetime
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+def reservation_tz():
+    return ZoneInfo(getattr(settings, "RESERVATION_TIME_ZONE", "America/Chicago"))
+
+
+def local_now():
+    """Current naive wall-clock datetime in the reservation time zone."""
+    return timezone.now().astimezone(reservation_tz()).replace(tzinfo=None)
+
+
+def start_between_q(start_dt, end_dt):
+    """
+    Q for reservations whose (date, start_time) falls in [start_dt, end_dt).
+    Both bounds are naive local datetimes; windows spanning several
+    days get one range per day.
+    """
+    if end_dt <= start_dt:
+        return Q(pk__in=[])
+
+    first, last = start_dt.date(), end_dt.date()
+
+    if first == last:
+        return Q(date=first, start_time__gte=start_dt.time(), start_time__lt=end_dt.time())
+
+    # Overnight: tail of the first day, any full days, head of the last day
+    q = Q(date=first, start_time__gte=start_dt.time())
+    if (last - first).days > 1:
+        q |= Q(date__gt=first, date__lt=last)
+    if end_dt.time() > datetime.time.min:
+        q |= Q(date=last, start_time__lt=end_dt.time())
+    return q
+
+
+def starts_within_q(minutes, now=None):
+    """Reservations starting in the next `minutes` minutes."""
+    now = now or local_now()
+    return start_between_q(now, now + datetime.timedelta(minutes=minutes))
+
+
+def ends_after_q(now):
+    """
+    Reservations still running at naive local `now`: ending later today,
+    or overnight (end_time <= start_time, ends the next day) from today
+    or from yesterday and not yet over.
+    """
+    overnight = Q(end_time__lte=F("start_time"))
+    today, yesterday = now.date(), now.date() - datetime.timedelta(days=1)
+    return (
+        Q(date=today, end_time__gt=now.time())
+        | Q(overnight, date=today)
+        | Q(overnight, date=yesterday, end_time__gt=now.time())
+    )
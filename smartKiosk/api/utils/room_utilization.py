@@ -0,0 +1,159 @@
+# api/utils/room_utilization.py
+"""
+Room utilization over a date range, vectorized with NumPy.
+
+One range query loads (room, date, start, end) for every reservation
+that can touch the range (including the day before, for overnight
+bookings). Each room then gets a minute-resolution occupancy row built
+with a difference array:
+
+    +1 at the start minute, -1 at the end minute, cumsum > 0 → occupied
+
+so overlapping or back-to-back bookings are never double counted and a
+23:00–01:00 booking simply spans the day boundary. Everything after
+that (hours per weekday, occupancy %, peaks, max concurrent rooms) is
+array reshapes and sums — no per-minute or per-datetime Python loops.
+
+Reservations store local wall-clock dates/times, so minute 0 is local
+midnight of `start` and no time zone conversion happens here.
+"""
+import datetime
+
+import numpy as np
+from django.conf import settings
+from django.db.models.functions import ExtractHour, ExtractMinute
+
+from api.models import Room, RoomReservation
+
+MINUTES_PER_DAY = 24 * 60
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def load_reservations(start, end):
+    """Single range query → tuple of NumPy arrays (room_id, day_offset, start_min, duration)."""
+    rows = list(
+        RoomReservation.objects.filter(
+            cancelled=False,
+            date__range=(start - datetime.timedelta(days=1), end),
+        )
+        .annotate(
+            sh=ExtractHour("start_time"),
+            sm=ExtractMinute("start_time"),
+            eh=ExtractHour("end_time"),
+            em=ExtractMinute("end_time"),
+        )
+        .values_list("room_id", "date", "sh", "sm", "eh", "em")
+    )
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+
+    room_ids, dates, sh, sm, eh, em = zip(*rows)
+    day_offset = (np.array(dates, dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+    start_min = np.array(sh, dtype=np.int64) * 60 + np.array(sm, dtype=np.int64)
+    end_min = np.array(eh, dtype=np.int64) * 60 + np.array(em, dtype=np.int64)
+
+    # end <= start means the booking runs past midnight (equal = 24 h)
+    duration = (end_min - start_min) % MINUTES_PER_DAY
+    duration[duration == 0] = MINUTES_PER_DAY
+
+    return np.array(room_ids, dtype=np.int64), day_offset, start_min, duration
+
+
+def occupancy_matrix(room_index, day_offset, start_min, duration, n_rooms, n_days):
+    """bool array (rooms, n_days * 1440): True where a room is booked."""
+    total = n_days * MINUTES_PER_DAY
+    begin = np.clip(day_offset * MINUTES_PER_DAY + start_min, 0, total)
+    finish = np.clip(day_offset * MINUTES_PER_DAY + start_min + duration, 0, total)
+    keep = finish > begin
+
+    diff = np.zeros((n_rooms, total + 1), dtype=np.int16)
+    np.add.at(diff, (room_index[keep], begin[keep]), 1)
+    np.add.at(diff, (room_index[keep], finish[keep]), -1)
+    return np.cumsum(diff[:, :-1], axis=1, dtype=np.int16) > 0
+
+
+def _pct(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.round(np.where(denominator > 0, numerator * 100.0 / denominator, 0.0), 1)
+
+
+def compute(start, end, peak_count=5):
+    """Utilization report for local dates [start, end] (inclusive)."""
+    rooms = list(Room.objects.order_by("id").values_list("id", "name"))
+    n_rooms, n_days = len(rooms), (end - start).days + 1
+    open_hour, close_hour = getattr(settings, "ROOM_UTILIZATION_HOURS", (7, 22))
+
+    room_ids, day_offset, start_min, duration = load_reservations(start, end)
+
+    # Map room ids onto matrix rows (rooms deleted mid-query are dropped)
+    sorted_ids = np.array([room_id for room_id, _ in rooms], dtype=np.int64)
+    known = np.isin(room_ids, sorted_ids)
+    room_index = np.searchsorted(sorted_ids, room_ids[known])
+    day_offset, start_min, duration = day_offset[known], start_min[known], duration[known]
+
+    occupied = occupancy_matrix(room_index, day_offset, start_min, duration, n_rooms, n_days)
+
+    # (rooms, days, 24) booked minutes per hour → grouped by weekday
+    hourly = occupied.reshape(n_rooms, n_days, 24, 60).sum(axis=3, dtype=np.int32)
+    weekday_of_day = (np.arange(n_days) + start.weekday()) % 7
+    days_per_weekday = np.bincount(weekday_of_day, minlength=7)
+
+    by_weekday = np.zeros((n_rooms, 7, 24), dtype=np.int64)
+    for weekday in range(7):
+        by_weekday[:, weekday, :] = hourly[:, weekday_of_day == weekday, :].sum(axis=1)
+    capacity = (days_per_weekday * 60)[:, None]  # minutes available per (weekday, hour) cell
+
+    booked_minutes = occupied.sum(axis=1)
+    open_minutes = hourly[:, :, open_hour:close_hour].sum(axis=(1, 2))
+    open_capacity = n_days * (close_hour - open_hour) * 60
+    in_range = day_offset >= 0
+    reservation_counts = np.bincount(room_index[in_range], minlength=n_rooms)
+
+    room_reports = []
+    for i, (room_id, name) in enumerate(rooms):
+        matrix = _pct(by_weekday[i], capacity)
+        peak = np.unravel_index(np.argmax(matrix), matrix.shape)
+        room_reports.append({
+            "roomId": room_id,
+            "roomName": name,
+            "reservations": int(reservation_counts[i]),
+            "bookedHours": round(float(booked_minutes[i]) / 60, 2),
+            "occupancyPct": float(_pct(open_minutes[i], open_capacity)),
+            "byWeekdayHour": matrix.tolist(),
+            "peak": {
+                "weekday": WEEKDAYS[peak[0]],
+                "hour": int(peak[1]),
+                "pct": float(matrix[peak]),
+            } if matrix[peak] > 0 else None,
+        })
+
+    # All rooms together: share of room-minutes booked per (weekday, hour)
+    overall = _pct(by_weekday.sum(axis=0), capacity * max(n_rooms, 1))
+    flat = overall.ravel()
+    top = [i for i in np.argsort(-flat, kind="stable")[:peak_count] if flat[i] > 0]
+
+    # Rooms booked at the same minute, anywhere in the range
+    concurrent = occupied.sum(axis=0)
+    busiest = int(np.argmax(concurrent))
+    busiest_at = datetime.datetime.combine(start, datetime.time.min) + datetime.timedelta(minutes=busiest)
+
+    return {
+        "days": n_days,
+        "openHours": [open_hour, close_hour],
+        "weekdays": list(WEEKDAYS),
+        "rooms": room_reports,
+        "overall": {
+            "bookedHours": round(float(booked_minutes.sum()) / 60, 2),
+            "occupancyPct": float(_pct(open_minutes.sum(), open_capacity * max(n_rooms, 1))),
+            "byWeekdayHour": overall.tolist(),
+            "peaks": [
+                {"weekday": WEEKDAYS[i // 24], "hour": int(i % 24), "pct": float(flat[i])}
+                for i in top
+            ],
+            "maxConcurrentRooms": {
+                "rooms": int(concurrent[busiest]),
+                "at": busiest_at.isoformat(timespec="minutes") if concurrent[busiest] else None,
+            },
+        },
+    }
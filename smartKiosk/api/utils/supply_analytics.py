@@ -0,0 +1,246 @@
+# api/utils/supply_analytics.py
+"""
+Supply request reporting from pre-aggregated rollups.
+
+SupplyItemRollup  one row per (local day, item)  → item / category
+SupplyUserRollup  one row per (local day, user)  → day / week / user
+
+"requests" counts SupplyRequests, except for category where it counts
+request lines (one request with two closet items counts twice);
+"units" is the summed quantity everywhere.
+
+`manage.py rollup_supply_requests` (nightly) recomputes each completed
+day from SupplyRequestLine with two GROUP BY queries and advances the
+"supply" watermark. Queries read the rollups up to the watermark and
+aggregate only the days after it (normally just today) live from the
+indexed line table, one GROUP BY for the whole unrolled span — results
+are current without touching history.
+
+Days are local days (RESERVATION_TIME_ZONE), same as daily caps.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+
+from api.models import Category, RollupWatermark, SupplyItemRollup, SupplyRequestLine, SupplyUserRollup
+from api.utils.reservation_windows import reservation_tz
+from api.utils.supply_caps import day_start, supply_day
+
+WATERMARK = "supply"
+GROUPS = ("day", "week", "item", "category", "user")
+
+
+# ---------------------------------------------------------
+# BUILDING ROLLUPS
+# ---------------------------------------------------------
+def _lines_between(first, last):
+    return SupplyRequestLine.objects.filter(
+        requested_at__gte=day_start(first),
+        requested_at__lt=day_start(last + datetime.timedelta(days=1)),
+    )
+
+
+def _lines_on(day):
+    return _lines_between(day, day)
+
+
+def aggregate_items(day):
+    """GROUP BY item for one day → rows shaped like SupplyItemRollup."""
+    rows = (
+        _lines_on(day)
+        .values("item_id", "item_name", "item__category__key")
+        .annotate(requests=Count("id"), units=Sum("qty"))
+    )
+    return [
+        {
+            "day": day,
+            "item_id": r["item_id"],
+            "item_name": r["item_name"],
+            "category_key": r["item__category__key"] or "",
+            "requests": r["requests"],
+            "units": r["units"] or 0,
+        }
+        for r in rows
+    ]
+
+
+def aggregate_users(day):
+    """GROUP BY requester for one day → rows shaped like SupplyUserRollup."""
+    rows = (
+        _lines_on(day)
+        .values("request__user_id")
+        .annotate(
+            full_name=Max("request__full_name"),
+            requests=Count("request_id", distinct=True),
+            units=Sum("qty"),
+        )
+    )
+    return [
+        {
+            "day": day,
+            "user_id": r["request__user_id"],
+            "full_name": r["full_name"] or "",
+            "requests": r["requests"],
+            "units": r["units"] or 0,
+        }
+        for r in rows
+    ]
+
+
+def rollup_day(day):
+    """Recompute one day (idempotent). Returns (item_rows, user_rows)."""
+    items = aggregate_items(day)
+    users = aggregate_users(day)
+    with transaction.atomic():
+        SupplyItemRollup.objects.filter(day=day).delete()
+        SupplyUserRollup.objects.filter(day=day).delete()
+        SupplyItemRollup.objects.bulk_create([SupplyItemRollup(**r) for r in items])
+        SupplyUserRollup.objects.bulk_create([SupplyUserRollup(**r) for r in users])
+    return len(items), len(users)
+
+
+def rolled_through():
+    return (
+        RollupWatermark.objects.filter(name=WATERMARK)
+        .values_list("through", flat=True)
+        .first()
+    )
+
+
+def first_line_day():
+    first = SupplyRequestLine.objects.order_by("requested_at").values_list("requested_at", flat=True).first()
+    if first is None:
+        return None
+    return first.astimezone(day_start(supply_day()).tzinfo).date()
+
+
+def pending_days(until=None, since=None):
+    """Days to roll up: after the watermark (or `since`) through `until` (default yesterday)."""
+    until = until or supply_day() - datetime.timedelta(days=1)
+    if since is None:
+        through = rolled_through()
+        since = through + datetime.timedelta(days=1) if through else first_line_day()
+    if since is None or since > until:
+        return []
+    return [since + datetime.timedelta(days=n) for n in range((until - since).days + 1)]
+
+
+def advance_watermark(day):
+    RollupWatermark.objects.update_or_create(name=WATERMARK, defaults={"through": day})
+
+
+# ---------------------------------------------------------
+# QUERYING
+# ---------------------------------------------------------
+def _rollup_rows(group, start, end):
+    """SQL-aggregated (key, label, requests, units) from the rollup tables."""
+    if end < start:
+        return []
+
+    if group in ("day", "week", "user"):
+        qs = SupplyUserRollup.objects.filter(day__range=(start, end))
+        if group == "user":
+            rows = qs.values("user_id").annotate(label=Max("full_name"), requests=Sum("requests"), units=Sum("units"))
+            return [(r["user_id"], r["label"], r["requests"], r["units"]) for r in rows]
+        rows = qs.values("day").annotate(requests=Sum("requests"), units=Sum("units"))
+        return [(r["day"], r["day"].isoformat(), r["requests"], r["units"]) for r in rows]
+
+    qs = SupplyItemRollup.objects.filter(day__range=(start, end))
+    if group == "category":
+        rows = qs.values("category_key").annotate(requests=Sum("requests"), units=Sum("units"))
+        return [(r["category_key"], r["category_key"], r["requests"], r["units"]) for r in rows]
+
+    rows = qs.values("item_id", "item_name").annotate(requests=Sum("requests"), units=Sum("units"))
+    return [(r["item_id"], r["item_name"], r["requests"], r["units"]) for r in rows]
+
+
+def _live_rows(group, first, last):
+    """Same shape as _rollup_rows, aggregated from the line table over [first, last] in one query."""
+    if last < first:
+        return []
+
+    lines = _lines_between(first, last)
+    if group in ("day", "week"):
+        rows = (
+            lines.annotate(local_day=TruncDate("requested_at", tzinfo=reservation_tz()))
+            .values("local_day")
+            .annotate(requests=Count("request_id", distinct=True), units=Sum("qty"))
+        )
+        return [(r["local_day"], r["local_day"].isoformat(), r["requests"], r["units"] or 0) for r in rows]
+
+    if group == "user":
+        rows = lines.values("request__user_id").annotate(
+            label=Max("request__full_name"),
+            requests=Count("request_id", distinct=True),
+            units=Sum("qty"),
+        )
+        return [(r["request__user_id"], r["label"] or "", r["requests"], r["units"] or 0) for r in rows]
+
+    if group == "category":
+        rows = lines.values("item__category__key").annotate(requests=Count("id"), units=Sum("qty"))
+        return [
+            (r["item__category__key"] or "", r["item__category__key"] or "", r["requests"], r["units"] or 0)
+            for r in rows
+        ]
+
+    rows = lines.values("item_id", "item_name").annotate(requests=Count("id"), units=Sum("qty"))
+    return [(r["item_id"], r["item_name"], r["requests"], r["units"] or 0) for r in rows]
+
+
+def _week_start(day):
+    return day - datetime.timedelta(days=day.weekday())  # Monday
+
+
+def series(group, start, end, limit=None):
+    """
+    Chart-ready buckets for [start, end] (local dates, inclusive).
+    day/week: every bucket in range, zero-filled, chronological.
+    item/category/user: by units desc, optionally top `limit`.
+    Returns (buckets, totals, rolled_through); totals ignore `limit`.
+    """
+    today = supply_day()
+    through = rolled_through()
+    rolled_end = min(end, through) if through else start - datetime.timedelta(days=1)
+
+    rows = _rollup_rows(group, start, rolled_end)
+    rows.extend(_live_rows(group, max(start, rolled_end + datetime.timedelta(days=1)), min(end, today)))
+
+    buckets = {}
+    for key, label, requests, units in rows:
+        if group == "week":
+            key = _week_start(key)
+        elif group == "item" and key is None:
+            key = label  # item deleted since: keep it apart by name
+        bucket = buckets.get(key)
+        if bucket is None:
+            json_key = key.isoformat() if isinstance(key, datetime.date) else key
+            bucket = buckets[key] = {"key": json_key, "label": str(json_key), "requests": 0, "units": 0}
+        bucket["requests"] += requests
+        bucket["units"] += units
+        if label and group in ("item", "user"):
+            bucket["label"] = label  # live rows come last: the current name wins
+
+    totals = {
+        "requests": sum(b["requests"] for b in buckets.values()),
+        "units": sum(b["units"] for b in buckets.values()),
+    }
+
+    if group in ("day", "week"):
+        step = datetime.timedelta(days=7 if group == "week" else 1)
+        cursor = _week_start(start) if group == "week" else start
+        out = []
+        while cursor <= end:
+            empty = {"key": cursor.isoformat(), "label": cursor.isoformat(), "requests": 0, "units": 0}
+            out.append(buckets.get(cursor, empty))
+            cursor += step
+        return out, totals, through
+
+    if group == "category":
+        names = dict(Category.objects.values_list("key", "name"))
+        for bucket in buckets.values():
+            bucket["label"] = names.get(bucket["key"]) or bucket["key"] or "Uncategorized"
+
+    out = sorted(buckets.values(), key=lambda b: (-b["units"], b["label"]))
+    return (out[:limit] if limit else out), totals, through
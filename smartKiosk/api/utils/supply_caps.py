@@ -0,0 +1,162 @@
+# api/utils/supply_caps.py
+"""
+Supply request quantities and per-item daily caps.
+
+Item.daily_cap = None means unlimited. Each capped item has one
+ItemDailyUsage counter row per day, and a request takes its quantity with
+
+    UPDATE api_itemdailyusage SET used = used + <qty>
+     WHERE item_id = <id> AND day = <today> AND used <= <cap> - <qty>
+
+The row lock makes concurrent kiosks queue on that single row and each
+one sees the others' committed total: there is no read-modify-write and
+no scan of today's requests. All lines of one request are reserved in
+the same transaction as the request rows, so a request over any cap
+leaves nothing behind.
+
+"Today" is the local day (RESERVATION_TIME_ZONE), also used for the
+list of items locked in the kiosk UI.
+"""
+import datetime
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from api.db_retry import run_with_backoff
+from api.models import ItemDailyUsage, SupplyRequest, SupplyRequestLine
+from api.utils.reservation_windows import local_now, reservation_tz
+
+
+def supply_day():
+    return local_now().date()
+
+
+def day_start(day):
+    """Aware datetime of local midnight starting `day`."""
+    return datetime.datetime.combine(day, datetime.time.min, tzinfo=reservation_tz())
+
+
+def parse_quantities(raw):
+    """
+    {item_id: qty} from the request body's "items":
+      [3, 5, 5]                          → {3: 1, 5: 2}  (repeats add up)
+      [{"id": 3, "qty": 2}, {"id": 5}]   → {3: 2, 5: 1}
+    Returns (quantities, error).
+    """
+    if not raw or not isinstance(raw, list):
+        return None, "items must be a list of IDs"
+
+    max_qty = getattr(settings, "SUPPLY_MAX_QTY_PER_LINE", 20)
+    quantities = Counter()
+    for entry in raw:
+        if isinstance(entry, dict):
+            item_id, qty = entry.get("id"), entry.get("qty", 1)
+        else:
+            item_id, qty = entry, 1
+        try:
+            item_id, qty = int(item_id), int(qty)
+        except (TypeError, ValueError):
+            return None, "items must be IDs or {id, qty} objects"
+        if qty < 1:
+            return None, "qty must be at least 1"
+        quantities[item_id] += qty
+
+    too_many = [item_id for item_id, qty in quantities.items() if qty > max_qty]
+    if too_many:
+        return None, f"qty is limited to {max_qty} per item"
+    return dict(quantities), None
+
+
+def reserve_caps(items, quantities, day):
+    """
+    Take today's quantity for every capped item. Must run inside a
+    transaction; returns the items that would exceed their cap (the
+    caller rolls back when the list is not empty).
+    """
+    capped = [i for i in items if i.daily_cap is not None]
+    if not capped:
+        return []
+
+    # Counter rows for today, created on first use (a racing kiosk may win)
+    ItemDailyUsage.objects.bulk_create(
+        [ItemDailyUsage(item=i, day=day) for i in capped],
+        ignore_conflicts=True,
+    )
+
+    rejected = []
+    for item in capped:
+        qty = quantities[item.id]
+        taken = ItemDailyUsage.objects.filter(
+            item=item, day=day, used__lte=item.daily_cap - qty
+        ).update(used=F("used") + qty)
+        if not taken:
+            rejected.append(item)
+    return rejected
+
+
+def remaining_today(items, day):
+    """{item_id: units left today} for capped items."""
+    used = dict(
+        ItemDailyUsage.objects.filter(item__in=items, day=day).values_list("item_id", "used")
+    )
+    return {
+        i.id: max(0, i.daily_cap - used.get(i.id, 0))
+        for i in items if i.daily_cap is not None
+    }
+
+
+def _record(user_id, full_name, email, items, quantities, day):
+    with transaction.atomic():
+        rejected = reserve_caps(items, quantities, day)
+        if rejected:
+            transaction.set_rollback(True)
+            return None, rejected
+
+        supply_request = SupplyRequest.objects.create(
+            user_id=user_id,
+            full_name=full_name,
+            email=email,
+            # One name per unit, so digests and old readers count quantities
+            items=[i.name for i in items for _ in range(quantities[i.id])],
+        )
+        SupplyRequestLine.objects.bulk_create([
+            SupplyRequestLine(
+                request=supply_request,
+                item=i,
+                item_name=i.name,
+                qty=quantities[i.id],
+                requested_at=supply_request.requested_at,
+            )
+            for i in items
+        ])
+        return supply_request, []
+
+
+def record_request(user_id, full_name, email, items, quantities, day=None):
+    """
+    Reserve caps and save the request + lines atomically.
+    Returns (supply_request, []) or (None, rejected_items).
+    """
+    day = day or supply_day()
+    return run_with_backoff(_record, user_id, full_name, email, items, quantities, day)
+
+
+def locked_item_names(day):
+    """
+    Sync query (views wrap it). Names locked in the kiosk UI today:
+    uncapped items once requested, capped items once the cap is used up.
+    """
+    names = set(
+        SupplyRequestLine.objects
+        .filter(requested_at__gte=day_start(day), item__isnull=False, item__daily_cap__isnull=True)
+        .values_list("item__name", flat=True)
+        .distinct()
+    )
+    names.update(
+        ItemDailyUsage.objects
+        .filter(day=day, used__gte=F("item__daily_cap"))
+        .values_list("item__name", flat=True)
+    )
+    return names
@@ -0,0 +1,90 @@
+# api/utils/supply_digest.py
+"""
+Supply request notifications in digest mode.
+
+With settings.SUPPLY_DIGEST_ENABLED the create endpoint only stores the
+request (notified_at stays NULL). `manage.py send_supply_digest` then
+claims every pending row and sends one consolidated email per recipient,
+listing only the items in that recipient's categories.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from api.models import SupplyRequest
+from api.utils.email_templates import render_supply_digest_email, render_supply_digest_text
+from api.utils.mailer import LOGO_URL, send_batch
+from api.utils.supply_routing import route_item_names
+
+
+def digest_enabled():
+    return getattr(settings, "SUPPLY_DIGEST_ENABLED", False)
+
+
+def claim_pending(stamp):
+    """
+    Mark every un-notified request with `stamp` in one UPDATE and return
+    the claimed rows. A second worker running at the same time claims
+    nothing, so no request is emailed twice.
+    """
+    pending_ids = list(
+        SupplyRequest.objects.filter(notified_at__isnull=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    if not pending_ids:
+        return []
+
+    SupplyRequest.objects.filter(id__in=pending_ids, notified_at__isnull=True).update(notified_at=stamp)
+    return list(SupplyRequest.objects.filter(id__in=pending_ids, notified_at=stamp).order_by("id"))
+
+
+def split_by_recipient(requests):
+    """
+    { recipient: [request, ...] } where each request is an unsaved copy
+    holding only the items routed to that recipient.
+    """
+    per_recipient = {}
+    for req in requests:
+        items = req.items if isinstance(req.items, (list, tuple)) else [req.items]
+        for recipient, names in route_item_names(items).items():
+            per_recipient.setdefault(recipient, []).append(SupplyRequest(
+                id=req.id,
+                user_id=req.user_id,
+                full_name=req.full_name,
+                email=req.email,
+                items=names,
+                requested_at=req.requested_at,
+            ))
+    return per_recipient
+
+
+def build_digest_messages(requests):
+    messages = []
+    for (email, first, last), subset in split_by_recipient(requests).items():
+        messages.append((
+            email,
+            f"📦 Supply Request Digest — {len(subset)} request(s)",
+            render_supply_digest_email(subset, LOGO_URL, first, last),
+            {"text_content": render_supply_digest_text(subset)},
+        ))
+    return messages
+
+
+def send_pending_digest(now=None):
+    """
+    Send one digest email per recipient for everything pending.
+    Returns (requests_included, emails_sent). On a send failure the
+    claim is released so the next run retries the same requests.
+    """
+    stamp = now or timezone.now()
+    requests = claim_pending(stamp)
+    if not requests:
+        return 0, 0
+
+    try:
+        sent = send_batch(build_digest_messages(requests))
+    except Exception:
+        SupplyRequest.objects.filter(id__in=[r.id for r in requests], notified_at=stamp).update(notified_at=None)
+        raise
+
+    return len(requests), sent
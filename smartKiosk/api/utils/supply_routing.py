@@ -0,0 +1,102 @@
+# api/utils/supply_routing.py
+"""
+Supply request routing: which recipient gets which items.
+
+The routing table (category → recipients, item name → category) is built
+with two queries, kept in process memory and invalidated by signals on
+SupplyRecipient / Category / Item. A TTL backs up invalidation across
+worker processes, and a generation counter keeps a build that raced an
+invalidation out of the cache (same scheme as the UI asset manifest).
+"""
+import threading
+import time
+
+from django.conf import settings
+
+ROUTING_TTL = getattr(settings, "SUPPLY_ROUTING_TTL", 300)  # seconds
+
+_lock = threading.Lock()
+_routing = None
+_built_at = 0.0
+_generation = 0
+
+
+def invalidate_routing():
+    global _routing, _generation
+    with _lock:
+        _routing = None
+        _generation += 1
+
+
+def fallback_recipient():
+    return (getattr(settings, "SUPPLY_FALLBACK_EMAIL", "patrickknguyen1@gmail.com"), "", "")
+
+
+def build_routing():
+    """
+    {
+      "by_category": { category_key: [(email, first, last), ...] },
+      "catch_all":   [(email, first, last), ...],   # recipients with no categories
+      "item_category": { item_name: category_key },
+    }
+    """
+    from api.models import Item, SupplyRecipient
+
+    by_category = {}
+    catch_all = []
+
+    for r in SupplyRecipient.objects.order_by("id").prefetch_related("categories"):
+        recipient = (r.email, r.first_name, r.last_name)
+        keys = [c.key for c in r.categories.all()]
+        if not keys:
+            catch_all.append(recipient)
+        for key in keys:
+            by_category.setdefault(key, []).append(recipient)
+
+    item_category = dict(Item.objects.values_list("name", "category__key"))
+
+    return {
+        "by_category": by_category,
+        "catch_all": catch_all,
+        "item_category": item_category,
+    }
+
+
+def get_routing():
+    global _routing, _built_at
+
+    with _lock:
+        if _routing is not None and time.monotonic() - _built_at < ROUTING_TTL:
+            return _routing
+        generation = _generation
+
+    routing = build_routing()
+
+    with _lock:
+        # Routing changed while building: this table may predate it
+        if generation == _generation:
+            _routing = routing
+            _built_at = time.monotonic()
+
+    return routing
+
+
+def recipients_for_category(key, routing=None):
+    routing = routing or get_routing()
+    return routing["by_category"].get(key) or routing["catch_all"] or [fallback_recipient()]
+
+
+def route_item_names(item_names):
+    """
+    Split item names by responsible recipient.
+    Returns { (email, first, last): [item_name, ...] } in first-seen order.
+    Items whose category has no dedicated recipient go to the catch-all
+    recipients, then to SUPPLY_FALLBACK_EMAIL.
+    """
+    routing = get_routing()
+    routed = {}
+    for name in item_names:
+        key = routing["item_category"].get(name)
+        for recipient in recipients_for_category(key, routing):
+            routed.setdefault(recipient, []).append(name)
+    return routed
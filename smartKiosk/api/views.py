@@ -1,4 +1,6 @@
+import codecs
 import json
+import logging
 import re
 import smtplib
 import requests
@@ -9,17 +11,32 @@ from email.mime.text import MIMEText
 from base64 import b64encode
 
 from django.conf import settings
-from django.http import JsonResponse, HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 from django.db.models import F, Q
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from asgiref.sync import sync_to_async
+from api.utils.mailer import asend_batch, asend_email, send_email
+from api.utils.supply_digest import digest_enabled
+from api.utils import directory_import, exports, room_utilization, supply_analytics, supply_caps
+from api.utils.directory_import import normalize_full_name
+from api.utils.password_hashing import make_password_bounded
+from api.utils.supply_routing import route_item_names
+from api.utils.availability import bump_dates
+from api.utils.availability import date_version as availability_version
+from api.utils.availability import get_cached as get_cached_availability
+from api.utils.availability import set_cached as set_cached_availability
+from api.utils.no_shows import check_in
+from api.utils.ratelimit import rate_limit
+from api.events import publish, reservation_event
 from api.utils.email_templates import render_reservation_email
 from api.utils.email_templates import render_supply_request_email
 from api.utils.email_templates import render_cancellation_email
 from api.utils.calendar_utils import build_calendar_links
 from api.utils.email_templates import render_password_reset_email
+from api.utils.json_response import JsonResponse, to_columns, wants_compact
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.contrib.auth import update_session_auth_hash
@@ -41,6 +58,8 @@ from datetime import datetime, timedelta, time
 from django.utils import timezone
 import random
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------
 #  URL PARSING HELPER
@@ -64,7 +83,7 @@ def get_clean_banner_url(request, image_field):
 # ---------------------------
 #  SUPPLY ITEM URL PARSER
 # ---------------------------
-def get_clean_item_url(image_field):
+def get_clean_item_url(image_field, version=None):
     if not image_field:
         return None
     
@@ -79,6 +98,10 @@ def get_clean_item_url(image_field):
     
     # 3. Stitch it all together so it ALWAYS points to the live server
     clean_path = f"{RENDER_DOMAIN}/api{settings.MEDIA_URL}items/{folder_name}/{filename}"
+
+    # 4. Content-hash version → media layer serves it as immutable
+    if version:
+        clean_path += f"?v={version[:12]}"
     
     return clean_path
 
@@ -128,6 +151,7 @@ def schedule_banner(request, banner_id):
     banner.save()
 
     auto_update_banner_state()
+    publish("banner.changed", {"bannerId": banner.id})
 
     return JsonResponse({
         "ok": True,
@@ -153,6 +177,7 @@ def activate_banner(request, banner_id):
         banner.is_active = True
         # Note: We NO LONGER clear start/end dates here so schedules remain intact
         banner.save()
+        publish("banner.changed", {"bannerId": banner.id, "active": True})
         return JsonResponse({"ok": True})
     except BannerImage.DoesNotExist:
         return JsonResponse({"ok": False, "error": "Not found"}, status=404)
@@ -169,6 +194,7 @@ def deactivate_banner(request, banner_id):
     banner = BannerImage.objects.get(id=banner_id)
     banner.is_active = False
     banner.save()
+    publish("banner.changed", {"bannerId": banner.id, "active": False})
 
     return JsonResponse({"ok": True})
 
@@ -194,6 +220,7 @@ def deactivate_active_banner(request):
 
     # Fallback to ensure everything is off
     BannerImage.objects.update(is_active=False)
+    publish("banner.changed", {"bannerId": None, "active": False})
 
     return JsonResponse({"ok": True})
 
@@ -299,6 +326,7 @@ def update_banner(request, banner_id):
     # 4. Save and Recalculate
     banner.save()
     auto_update_banner_state() 
+    publish("banner.changed", {"bannerId": banner.id, "active": banner.is_active})
 
     return JsonResponse({
         "ok": True,
@@ -319,10 +347,10 @@ def get_all_users(request):
 
     users = []
 
-    for u in User.objects.all().order_by('id'):
+    # One JOIN instead of a profile query per user
+    for u in User.objects.select_related("userprofile").order_by('id'):
         try:
-            profile = UserProfile.objects.get(user=u)
-            full_name = profile.full_name
+            full_name = u.userprofile.full_name
         except UserProfile.DoesNotExist:
             full_name = (u.first_name + " " + u.last_name).strip() or u.username
 
@@ -333,6 +361,9 @@ def get_all_users(request):
             "isAdmin": u.is_staff,
         })
 
+    if wants_compact(request):
+        return JsonResponse({"ok": True, "users": to_columns(users)}, status=200)
+
     return JsonResponse({"ok": True, "users": users}, status=200)
 
 
@@ -431,22 +462,19 @@ def send_via_sendgrid(
     from_email=None,
     from_name="UTA Smart Kiosk",
     ics_content=None,
+    text_content="",
+    attachments=None,
 ):
-    sender = from_email or settings.DEFAULT_FROM_EMAIL
-
-    msg = EmailMultiAlternatives(
-        subject=subject,
-        body="",
-        from_email=sender,
-        to=[to_email],
+    return send_email(
+        to_email,
+        subject,
+        html_content,
+        from_email=from_email,
+        from_name=from_name,
+        ics_content=ics_content,
+        text_content=text_content,
+        attachments=attachments,
     )
-    msg.attach_alternative(html_content, "text/html")
-
-    if ics_content:
-        msg.attach("reservation.ics", ics_content, "text/calendar")
-
-    msg.send()
-    return True
 
 # ---------------------------------------------------------
 # POST /api/register/
@@ -471,24 +499,19 @@ def register_user(request):
         return JsonResponse({"ok": False, "error": "This email is already registered"}, status=409)
 
     try:
-        # 1. PROFESSIONAL NAME CLEANING: Handle "PrakashSapkota" -> "Prakash Sapkota"
-        # Only add a space if one doesn't exist
-        cleaned_name = raw_full_name
-        if ' ' not in cleaned_name:
-            # Insert space before capital letters (except the first one)
-            cleaned_name = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', cleaned_name)
-        
-        # 2. Normalize to Title Case (prakash sapkota -> Prakash Sapkota)
-        name_parts = cleaned_name.split()
-        name_parts = [p.capitalize() for p in name_parts]
-        final_full_name = " ".join(name_parts)
-
-        # Create Django user
-        user = User.objects.create_user(username=email, email=email, password=password)
-
-        # 3. Save split names to Django's internal User model
-        user.first_name = name_parts[0] if name_parts else ""
-        user.last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
+        # 1-2. NAME CLEANING: "PrakashSapkota" / "prakash sapkota" -> "Prakash Sapkota"
+        final_full_name = normalize_full_name(raw_full_name)
+        name_parts = final_full_name.split()
+
+        # 3. Create the Django user with split names in one write
+        #    (password hashed in the bounded pool first)
+        user = User(
+            username=User.normalize_username(email),
+            email=User.objects.normalize_email(email),
+            password=make_password_bounded(password),
+            first_name=name_parts[0] if name_parts else "",
+            last_name=" ".join(name_parts[1:]) if len(name_parts) > 1 else "",
+        )
         user.save()
 
         # 4. Save formatted name to UserProfile
@@ -531,7 +554,7 @@ def get_items(request):
         category_name = item.category.name  # e.g. "Storage Closet"
 
         # 👇 FIX: Use our new helper function here!
-        image_url = get_clean_item_url(item.image)
+        image_url = get_clean_item_url(item.image, item.image_hash)
 
         if category_name not in categories:
             categories[category_name] = []
@@ -543,6 +566,7 @@ def get_items(request):
                 "image": image_url,  # media URL or null
                 "category_key": item.category.key,
                 "category_name": item.category.name,
+                "daily_cap": item.daily_cap,
             }
         )
 
@@ -601,6 +625,16 @@ def admin_save_item(request):
             {"ok": False, "error": "Category is required"}, status=400
         )
 
+    # Optional per-day cap: null/"" = unlimited
+    daily_cap = None
+    if data.get("daily_cap") not in (None, ""):
+        try:
+            daily_cap = int(data["daily_cap"])
+        except (TypeError, ValueError):
+            daily_cap = 0
+        if daily_cap < 1:
+            return JsonResponse({"ok": False, "error": "daily_cap must be a positive number"}, status=400)
+
     # Create or update the item
     if item_id:
         try:
@@ -609,12 +643,16 @@ def admin_save_item(request):
             return JsonResponse({"ok": False, "error": "Item not found"}, status=404)
         item.name = name
         item.category = category
+        if "daily_cap" in data:
+            item.daily_cap = daily_cap
         item.save()
         status_code = 200
     else:
-        item = Item.objects.create(name=name, category=category)
+        item = Item.objects.create(name=name, category=category, daily_cap=daily_cap)
         status_code = 201
 
+    publish("catalog.changed", {"itemId": item.id, "categoryKey": category.key})
+
     image_url = request.build_absolute_uri(item.image.url) if item.image else None
 
     return JsonResponse(
@@ -626,6 +664,7 @@ def admin_save_item(request):
                 "image": image_url,
                 "category_key": item.category.key,
                 "category_name": item.category.name,
+                "daily_cap": item.daily_cap,
             },
         },
         status=status_code,
@@ -637,12 +676,14 @@ def admin_save_item(request):
 # POST /api/supplies/request/
 # Creates a supply request, updates popularity, sends email (PREMIUM)
 # ADDED: Daily Item Deactivation Logic
+# Async: DB and SMTP waits don't hold an ASGI worker
 # ---------------------------------------------------------
 @csrf_exempt
 @require_POST
-def create_supply_request(request):
+async def create_supply_request(request):
     # Try to use authenticated user if available
-    user = request.user if request.user.is_authenticated else None
+    user = await request.auser()
+    user = user if user.is_authenticated else None
 
     # Parse incoming JSON
     try:
@@ -650,15 +691,13 @@ def create_supply_request(request):
     except json.JSONDecodeError:
         return JsonResponse({"ok": False, "error": "Invalid JSON"}, status=400)
 
-    # Expect: { items: [itemId, ...], userId?, fullName?, email? }
-    item_ids = data.get("items")
-    if not item_ids or not isinstance(item_ids, list):
-        return JsonResponse(
-            {"ok": False, "error": "items must be a list of IDs"}, status=400
-        )
+    # Expect: { items: [itemId, ...] | [{id, qty}, ...], userId?, fullName?, email? }
+    quantities, error = supply_caps.parse_quantities(data.get("items"))
+    if error:
+        return JsonResponse({"ok": False, "error": error}, status=400)
 
     # Load items
-    items = list(Item.objects.filter(id__in=item_ids))
+    items = [i async for i in Item.objects.filter(id__in=quantities).select_related("category")]
     if not items:
         return JsonResponse({"ok": False, "error": "Invalid item IDs"}, status=400)
 
@@ -678,7 +717,7 @@ def create_supply_request(request):
 
         # Try UserProfile full name
         try:
-            profile = UserProfile.objects.get(user=user)
+            profile = await UserProfile.objects.aget(user=user)
             full_name = profile.full_name or user.username
         except UserProfile.DoesNotExist:
             full_name = user.username
@@ -689,90 +728,102 @@ def create_supply_request(request):
         email = data.get("email") or ""
 
     # ---------------------------------------------------------
-    # Save supply request
+    # Save supply request + lines, taking daily caps atomically
+    # (conditional UPDATE per capped item, see api/utils/supply_caps.py)
     # ---------------------------------------------------------
-    supply_request = SupplyRequest.objects.create(
-        user_id=user_id,
-        full_name=full_name,
-        email=email,
-        items=item_names,
+    day = supply_caps.supply_day()
+    supply_request, rejected = await sync_to_async(supply_caps.record_request)(
+        user_id, full_name, email, items, quantities, day
     )
+    if rejected:
+        remaining = await sync_to_async(supply_caps.remaining_today)(rejected, day)
+        return JsonResponse(
+            {
+                "ok": False,
+                "error": "Daily limit reached for: " + ", ".join(i.name for i in rejected),
+                "capExceeded": [
+                    {
+                        "itemId": i.id,
+                        "name": i.name,
+                        "dailyCap": i.daily_cap,
+                        "remaining": remaining.get(i.id, 0),
+                    }
+                    for i in rejected
+                ],
+            },
+            status=409,
+        )
 
     # ---------------------------------------------------------
-    # Update popularity counts (per item, per category)
+    # Update popularity counts (per item, per category) by quantity
     # Uses F() for concurrency-safe increments
     # ---------------------------------------------------------
     for item in items:
-        pop, created = ItemPopularity.objects.get_or_create(
+        pop, created = await ItemPopularity.objects.aget_or_create(
             item_name=item.name,
             category=item.category.key,
             defaults={"count": 0},
         )
-        ItemPopularity.objects.filter(pk=pop.pk).update(count=F("count") + 1)
+        await ItemPopularity.objects.filter(pk=pop.pk).aupdate(count=F("count") + quantities[item.id])
 
     # ---------------------------------------------------------
     # FETCH ALL ITEMS REQUESTED TODAY TO SYNC FRONTEND LOCKING
     # This allows the frontend to deactivate buttons for these items.
     # ---------------------------------------------------------
-    today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    todays_requests = SupplyRequest.objects.filter(requested_at__gte=today_start).values_list('items', flat=True)
-    
-    # Flatten the list of lists into a unique set of requested item names
-    locked_item_names = set()
-    for req_list in todays_requests:
-        for name in req_list:
-            locked_item_names.add(name)
+    # Uncapped items lock once requested today, capped ones once full
+    locked_item_names = await sync_to_async(supply_caps.locked_item_names)(day)
+
+    publish("items.locked", {"items": sorted(locked_item_names)})
 
     # ---------------------------------------------------------
     # Send PREMIUM email notification via SendGrid (FINAL)
+    # In digest mode the request is queued (notified_at stays NULL)
+    # and send_supply_digest emails it with the rest of the window.
     # ---------------------------------------------------------
     email_sent = False
     email_error = None
+    email_queued = digest_enabled()
 
-    try:
-        from api.utils.email_templates import render_supply_request_email
-
-        # GitHub-hosted logo (Outlook/Gmail safe)
-        logo_url = (
-            "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
-            "smartKiosk/media/ui_assets/apple-touch-icon.png"
-        )
-
-        supply_recipient = SupplyRecipient.objects.first()
-        if supply_recipient:
-            recipient_email = supply_recipient.email
-            recipient_first = supply_recipient.first_name
-            recipient_last = supply_recipient.last_name
-        else:
-            recipient_email = "patrickknguyen1@gmail.com"
-            recipient_first = ""
-            recipient_last = ""
-
-        # Build premium HTML
-        html_body = render_supply_request_email(
-            full_name=full_name,
-            email=email,
-            items=item_names,
-            request_id=supply_request.id,
-            timestamp=supply_request.requested_at,
-            logo_url=logo_url,
-            recipient_first=recipient_first,
-            recipient_last=recipient_last,
-        )
-
-        subject = f"📦 New Supply Request — {full_name}"
-
-        send_via_sendgrid(
-            to_email=recipient_email,
-            subject=subject,
-            html_content=html_body,
-        )
+    if not email_queued:
+        try:
+            from api.utils.email_templates import render_supply_request_email
 
-        email_sent = True
+            # GitHub-hosted logo (Outlook/Gmail safe)
+            logo_url = (
+                "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
+                "smartKiosk/media/ui_assets/apple-touch-icon.png"
+            )
 
-    except Exception as e:
-        email_error = str(e)
-        email_sent = False
+            # One message per responsible recipient, each listing only
+            # the items in their categories; sent over one connection
+            messages = []
+            # Routing may rebuild its cache from the DB → run it in a thread
+            routed = await sync_to_async(route_item_names)(item_names)
+            qty_by_name = {i.name: quantities[i.id] for i in items}
+            for (recipient_email, recipient_first, recipient_last), names in routed.items():
+                # Build premium HTML
+                html_body = render_supply_request_email(
+                    full_name=full_name,
+                    email=email,
+                    items=[(name, qty_by_name.get(name, 1)) for name in names],
+                    request_id=supply_request.id,
+                    timestamp=supply_request.requested_at,
+                    logo_url=logo_url,
+                    recipient_first=recipient_first,
+                    recipient_last=recipient_last,
+                )
+
+                subject = f"📦 New Supply Request — {full_name}"
+                messages.append((recipient_email, subject, html_body, {}))
+
+            await asend_batch(messages)
+
+            email_sent = True
+            await SupplyRequest.objects.filter(pk=supply_request.pk).aupdate(notified_at=timezone.now())
+
+        except Exception as e:
+            email_error = str(e)
+            email_sent = False
 
     return JsonResponse(
         {
@@ -780,6 +831,7 @@ def create_supply_request(request):
             "requestId": supply_request.id,
             "emailSent": email_sent,
             "emailError": email_error,
+            "emailQueued": email_queued,
             "lockedItems": list(locked_item_names), # Return list to deactivate UI items
         },
         status=201,
@@ -830,6 +882,121 @@ def get_popular_items(request):
 
     return JsonResponse({"ok": True, "popular": popular_by_display}, status=200)
 
+
+# ---------------------------------------------------------
+# GET /api/supplies/analytics/?from=YYYY-MM-DD&to=YYYY-MM-DD
+#                             &group=day|week|item|category|user&limit=N
+# Admin only. Served from the daily rollup tables (+ live today);
+# defaults to the last 30 days grouped by day.
+# ---------------------------------------------------------
+@require_GET
+def supply_analytics_view(request):
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return JsonResponse({"ok": False, "error": "Admin privileges required"}, status=403)
+
+    group = request.GET.get("group", "day")
+    if group not in supply_analytics.GROUPS:
+        return JsonResponse(
+            {"ok": False, "error": f"group must be one of: {', '.join(supply_analytics.GROUPS)}"},
+            status=400,
+        )
+
+    today = supply_caps.supply_day()
+    try:
+        end = parse_date(request.GET.get("to") or "") or today
+        start = parse_date(request.GET.get("from") or "") or end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "from/to must be valid YYYY-MM-DD dates"}, status=400)
+    if start > end:
+        return JsonResponse({"ok": False, "error": "from must be on or before to"}, status=400)
+    if (end - start).days > getattr(settings, "SUPPLY_ANALYTICS_MAX_DAYS", 731):
+        return JsonResponse({"ok": False, "error": "Date range too large"}, status=400)
+
+    try:
+        limit = max(0, int(request.GET.get("limit", "0"))) or None
+    except ValueError:
+        limit = None
+
+    series, totals, rolled_through = supply_analytics.series(group, start, end, limit=limit)
+
+    return JsonResponse({
+        "ok": True,
+        "group": group,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "rolledUpThrough": rolled_through.isoformat() if rolled_through else None,
+        "totals": totals,
+        "series": series,
+    })
+
+# ---------------------------------------------------------
+# GET /api/exports/<reservations|supply_requests>/
+#     ?format=csv|parquet&from=YYYY-MM-DD&to=YYYY-MM-DD
+# Admin only. Streams the whole history (or the date range) as a
+# download; rows are read a page at a time, so size doesn't matter.
+# ---------------------------------------------------------
+@require_GET
+def export_data_view(request, dataset):
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return JsonResponse({"ok": False, "error": "Admin privileges required"}, status=403)
+
+    fmt = request.GET.get("format", "csv")
+    try:
+        start = parse_date(request.GET.get("from") or "")
+        end = parse_date(request.GET.get("to") or "")
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "from/to must be valid YYYY-MM-DD dates"}, status=400)
+    if start and end and start > end:
+        return JsonResponse({"ok": False, "error": "from must be on or before to"}, status=400)
+    if fmt == "parquet" and not exports.parquet_available():
+        return JsonResponse({"ok": False, "error": "Parquet export requires pyarrow"}, status=501)
+
+    try:
+        content = exports.chunks(dataset, fmt, start, end)
+    except ValueError as e:
+        return JsonResponse({"ok": False, "error": str(e)}, status=400)
+
+    if isinstance(request, ASGIRequest):
+        content = exports.achunks(content)
+
+    response = StreamingHttpResponse(content, content_type=exports.CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{exports.filename(dataset, fmt, start, end)}"'
+    response["Cache-Control"] = "no-store"
+    return response
+
+# ---------------------------------------------------------
+# POST /api/import/<rooms|items|users>/   (multipart "file", CSV)
+# Admin only. Validates every row, upserts the valid ones in batches
+# and reports per-row errors; dryRun=1 validates without writing.
+# ---------------------------------------------------------
+@csrf_exempt
+@require_POST
+def import_directory_view(request, kind):
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return JsonResponse({"ok": False, "error": "Admin privileges required"}, status=403)
+
+    upload = request.FILES.get("file")
+    if upload is None:
+        return JsonResponse({"ok": False, "error": "CSV file is required"}, status=400)
+
+    dry_run = (request.POST.get("dryRun") or request.GET.get("dryRun") or "").lower() in ("1", "true", "yes")
+    try:
+        # Uploads are iterated line by line (large files stay on disk);
+        # passwords hash in the bounded thread pool, never in forked workers
+        report = directory_import.import_csv(
+            kind,
+            codecs.iterdecode(upload, "utf-8-sig"),
+            dry_run=dry_run,
+            processes=0,
+        )
+    except ValueError as e:
+        return JsonResponse({"ok": False, "error": str(e)}, status=400)
+    except Exception:
+        logger.exception("Directory import failed (kind=%s)", kind)
+        return JsonResponse({"ok": False, "error": "Import failed"}, status=500)
+
+    return JsonResponse({"ok": True, **report.as_dict()})
+
 # ---------------------------------------------------------
 # GET /api/items/all/
 # Flat list for Admin Panel (future-proof)
@@ -841,7 +1008,7 @@ def get_all_items(request):
     data = []
     for item in items:
         # 👇 FIX: Use our new helper function here!
-        image_url = get_clean_item_url(item.image)
+        image_url = get_clean_item_url(item.image, item.image_hash)
 
         data.append({
             "id": item.id,
@@ -849,6 +1016,7 @@ def get_all_items(request):
             "image": image_url,
             "category_key": item.category.key,
             "category_name": item.category.name,
+            "daily_cap": item.daily_cap,
         })
 
     return JsonResponse({"ok": True, "items": data}, status=200)
@@ -962,6 +1130,37 @@ def delete_room(request, room_id):
     return JsonResponse({"ok": True, "message": "Room deleted"}, status=200)
 
 
+# ---------------------------------------------------------
+# GET /api/rooms/utilization/?from=YYYY-MM-DD&to=YYYY-MM-DD
+# Admin only. Booked hours, occupancy % per weekday × hour and peak
+# windows per room; defaults to the last 4 weeks (local dates).
+# ---------------------------------------------------------
+@require_GET
+def room_utilization_view(request):
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return JsonResponse({"ok": False, "error": "Admin privileges required"}, status=403)
+
+    today = supply_caps.supply_day()
+    try:
+        end = parse_date(request.GET.get("to") or "") or today
+        start = parse_date(request.GET.get("from") or "") or end - timedelta(days=27)
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "from/to must be valid YYYY-MM-DD dates"}, status=400)
+    if start > end:
+        return JsonResponse({"ok": False, "error": "from must be on or before to"}, status=400)
+    if (end - start).days >= getattr(settings, "ROOM_UTILIZATION_MAX_DAYS", 366):
+        return JsonResponse({"ok": False, "error": "Date range too large"}, status=400)
+
+    report = room_utilization.compute(start, end)
+
+    return JsonResponse({
+        "ok": True,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        **report,
+    })
+
+
 # ---------------------------------------------------------
 # Helpers for calendar link and emails (legacy)
 # ---------------------------------------------------------
@@ -1052,12 +1251,14 @@ Add to your calendar:
 # ---------------------------------------------------------
 # POST /api/rooms/reserve/
 # Create a reservation (requires login)
+# Async: DB and SMTP waits don't hold an ASGI worker
 # ---------------------------------------------------------
 @csrf_exempt
 @require_POST
-def create_room_reservation(request):
+async def create_room_reservation(request):
     # 🔐 Ensure user is logged in
-    if not request.user.is_authenticated:
+    user = await request.auser()
+    if not user.is_authenticated:
         return JsonResponse({"ok": False, "error": "Login required"}, status=401)
 
     # Parse JSON body
@@ -1079,7 +1280,7 @@ def create_room_reservation(request):
 
     # Load room
     try:
-        room = Room.objects.get(id=room_id)
+        room = await Room.objects.aget(id=room_id)
     except Room.DoesNotExist:
         return JsonResponse({"ok": False, "error": "Room not found"}, status=404)
 
@@ -1109,13 +1310,16 @@ def create_room_reservation(request):
     # ------------------------------------------------------
     # 🔥 True conflict detection (cross-midnight safe)
     # A_start < B_end AND A_end > B_start
+    # Only reservations starting the day before (overnight) through the
+    # new end date can overlap; the rest of the room's history is skipped.
     # ------------------------------------------------------
     existing = RoomReservation.objects.filter(
         room=room,
-        cancelled=False
+        cancelled=False,
+        date__range=(start_dt.date() - timedelta(days=1), end_dt.date()),
     )
 
-    for r in existing:
+    async for r in existing:
         r_start = datetime.combine(r.date, r.start_time)
         r_end = datetime.combine(r.date, r.end_time)
 
@@ -1135,11 +1339,10 @@ def create_room_reservation(request):
     # ------------------------------------------------------
     # Build full_name (from profile)
     # ------------------------------------------------------
-    user = request.user
     email = user.email
 
     try:
-        profile = UserProfile.objects.get(user=user)
+        profile = await UserProfile.objects.aget(user=user)
         full_name = profile.full_name or user.get_full_name() or user.username
     except UserProfile.DoesNotExist:
         full_name = user.get_full_name() or user.username or email
@@ -1148,7 +1351,7 @@ def create_room_reservation(request):
     # SAVE reservation
     # Make sure stored date/time is correct for overnight
     # ------------------------------------------------------
-    reservation = RoomReservation.objects.create(
+    reservation = await RoomReservation.objects.acreate(
         user=user,
         room=room,
         date=start_dt.date(),        # if overnight, moves into next day
@@ -1157,6 +1360,7 @@ def create_room_reservation(request):
         full_name=full_name,
         email=email,
     )
+    publish("reservation.created", reservation_event([reservation]))
 
     # ------------------------------------------------------
     # Send confirmation email (non-blocking)
@@ -1199,10 +1403,10 @@ def create_room_reservation(request):
 
         html_body = render_reservation_email(user, reservation, calendar_links, logo_url)
 
-        send_via_sendgrid(
-            to_email=email,
-            subject=f"✅ Reservation Confirmed — {room.name}",
-            html_content=html_body,
+        await asend_email(
+            email,
+            f"✅ Reservation Confirmed — {room.name}",
+            html_body,
             ics_content=ics_data,
         )
 
@@ -1250,7 +1454,7 @@ def my_room_reservations(request):
             cancelled=False,
             date__gte=today,
         )
-        .select_related("room")
+        .select_related("room", "user__userprofile")
         .order_by("date", "start_time")
     )
 
@@ -1258,8 +1462,7 @@ def my_room_reservations(request):
     for r in qs:
         # Get full name from UserProfile (correct source)
         try:
-            profile = UserProfile.objects.get(user=r.user)
-            full_name = profile.full_name
+            full_name = r.user.userprofile.full_name
         except UserProfile.DoesNotExist:
             # fallback: Django's first_name + last_name OR username
             full_name = (r.user.first_name + " " + r.user.last_name).strip() or r.user.username
@@ -1306,6 +1509,12 @@ def reservations_by_date(request):
             status=400,
         )
 
+    # Served from the per-date cache until a booking/cancel bumps it
+    version = availability_version(target_date)
+    cached = get_cached_availability(target_date, version)
+    if cached is not None:
+        return JsonResponse({"ok": True, "reservations": cached}, status=200)
+
     # Start-of-day reference for spillover logic
     start_of_day = datetime.combine(target_date, time(0, 0))
 
@@ -1344,16 +1553,67 @@ def reservations_by_date(request):
         for r in qs
     ]
 
+    set_cached_availability(target_date, version, data)
+
     return JsonResponse({"ok": True, "reservations": data}, status=200)
 
+# ---------------------------------------------------------
+# POST /api/rooms/reservations/check-in/
+# Kiosk card swipe → check in to the reservation starting now
+# Body: { raw_swipe, roomId? }
+# ---------------------------------------------------------
+@csrf_exempt
+@require_POST
+def check_in_reservation(request):
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+        raw_swipe = str(data.get("raw_swipe", "")).strip()
+        room_id = data.get("roomId")
+    except Exception:
+        return JsonResponse({"ok": False, "error": "Invalid JSON"}, status=400)
+
+    if room_id not in (None, ""):
+        try:
+            room_id = int(room_id)
+        except (TypeError, ValueError):
+            return JsonResponse({"ok": False, "error": "roomId must be a number"}, status=400)
+
+    if not raw_swipe:
+        return JsonResponse({"ok": False, "error": "Card data required"}, status=400)
+
+    user = user_for_swipe(raw_swipe)
+    if not user:
+        return JsonResponse({"ok": False, "error": "Card not registered."}, status=401)
+
+    reservation = check_in(user, room_id=room_id)
+    if reservation is None:
+        return JsonResponse(
+            {"ok": False, "error": "No reservation open for check-in right now"},
+            status=404,
+        )
+
+    return JsonResponse({
+        "ok": True,
+        "reservation": {
+            "id": reservation.id,
+            "roomId": reservation.room_id,
+            "roomName": reservation.room.name,
+            "date": reservation.date.strftime("%Y-%m-%d"),
+            "startTime": reservation.start_time.strftime("%H:%M"),
+            "endTime": reservation.end_time.strftime("%H:%M"),
+            "checkedInAt": reservation.checked_in_at.isoformat(),
+        },
+    })
+
 # ---------------------------------------------------------
 # POST /api/rooms/reservations/<id>/cancel/
 # Cancel a reservation
 # ---------------------------------------------------------
 @csrf_exempt
 @require_POST
-def cancel_room_reservation(request, reservation_id):
-    if not request.user.is_authenticated:
+async def cancel_room_reservation(request, reservation_id):
+    user = await request.auser()
+    if not user.is_authenticated:
         return JsonResponse({"ok": False, "error": "Login required"}, status=401)
 
     try:
@@ -1362,7 +1622,7 @@ def cancel_room_reservation(request, reservation_id):
         pass
 
     try:
-        reservation = RoomReservation.objects.get(id=reservation_id)
+        reservation = await RoomReservation.objects.select_related("user", "room").aget(id=reservation_id)
 
         if reservation.cancelled:
             return JsonResponse(
@@ -1370,7 +1630,7 @@ def cancel_room_reservation(request, reservation_id):
                 status=400,
             )
 
-        if reservation.user != request.user:
+        if reservation.user_id != user.id:
             return JsonResponse(
                 {"ok": False, "error": "Not allowed"},
                 status=403,
@@ -1378,8 +1638,9 @@ def cancel_room_reservation(request, reservation_id):
 
         reservation.cancelled = True
         reservation.cancel_reason = "User cancelled"
-        reservation.save()
-        send_cancellation_email(reservation,
+        await reservation.asave()
+        publish("reservation.cancelled", reservation_event([reservation]))
+        await asend_cancellation_email(reservation,
             reason="Reservation cancelled by user.",
             cancelled_by=reservation.user.username
             )
@@ -1402,8 +1663,9 @@ def cancel_room_reservation(request, reservation_id):
 # ---------------------------------------------------------
 @csrf_exempt
 @require_POST
-def cancel_room_reservations_bulk(request):
-    if not request.user.is_authenticated:
+async def cancel_room_reservations_bulk(request):
+    user = await request.auser()
+    if not user.is_authenticated:
         return JsonResponse({"ok": False, "error": "Login required"}, status=401)
 
     try:
@@ -1417,43 +1679,86 @@ def cancel_room_reservations_bulk(request):
         return JsonResponse({"ok": False, "error": "ids must be a non-empty list"}, status=400)
 
     # Fetch all reservations
-    reservations = list(
-        RoomReservation.objects.filter(
+    reservations = [
+        r async for r in RoomReservation.objects.filter(
             id__in=ids,
-            user=request.user,
+            user=user,
             cancelled=False
-        ).select_related("room")
-    )
+        ).select_related("room", "user")
+    ]
 
     if len(reservations) == 0:
         return JsonResponse({"ok": False, "error": "No valid reservations found"}, status=404)
 
-    # Mark all as cancelled
+    # Mark all as cancelled — one UPDATE instead of one save() per row
+    await RoomReservation.objects.filter(
+        id__in=[r.id for r in reservations]
+    ).aupdate(cancelled=True, cancel_reason=reason)
+
     for r in reservations:
         r.cancelled = True
         r.cancel_reason = reason
-        r.save()
+
+    bump_dates({r.date for r in reservations})
+    publish("reservation.cancelled", reservation_event(reservations))
 
     # ---------- Send ONE premium bulk email ----------
+    # Above BULK_EMAIL_ROW_LIMIT the HTML shows a per-room summary and the
+    # full list is attached (csv / ics), keeping the email under Gmail's clip size.
     try:
-        from api.utils.email_templates import render_bulk_cancellation_email
+        from api.utils.email_templates import (
+            render_bulk_cancellation_csv,
+            render_bulk_cancellation_email,
+            render_bulk_cancellation_text,
+        )
+        from api.utils.calendar_utils import create_cancellation_ics
 
         logo_url = (
             "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
             "smartKiosk/media/ui_assets/apple-touch-icon.png"
         )
 
+        max_rows = getattr(settings, "BULK_EMAIL_ROW_LIMIT", 25)
+        attachment_kind = data.get("attachment", getattr(settings, "BULK_EMAIL_ATTACHMENT", "csv"))
+
+        attachments = []
+        if len(reservations) > max_rows:
+            if attachment_kind == "csv":
+                attachments.append((
+                    "cancelled-reservations.csv",
+                    render_bulk_cancellation_csv(reservations),
+                    "text/csv",
+                ))
+            elif attachment_kind == "ics":
+                attachments.append((
+                    "cancelled-reservations.ics",
+                    create_cancellation_ics(reservations, user.email),
+                    "text/calendar",
+                ))
+        attachment_name = attachments[0][0] if attachments else None
+
         html = render_bulk_cancellation_email(
             reservations=reservations,
             logo_url=logo_url,
-            cancelled_by=request.user.username,
+            cancelled_by=user.username,
             reason=reason,
+            max_rows=max_rows,
+            attachment_name=attachment_name,
+        )
+        text = render_bulk_cancellation_text(
+            reservations,
+            cancelled_by=user.username,
+            reason=reason,
+            max_rows=max_rows,
+            attachment_name=attachment_name,
         )
 
-        send_via_sendgrid(
-            to_email=request.user.email,
-            subject=f"⚠️ {len(reservations)} Reservation(s) Cancelled",
-            html_content=html,
+        await asend_email(
+            user.email,
+            f"⚠️ {len(reservations)} Reservation(s) Cancelled",
+            html,
+            text_content=text,
+            attachments=attachments,
         )
 
     except Exception as e:
@@ -1483,7 +1788,7 @@ def all_room_reservations(request):
     qs = (
         RoomReservation.objects
         .filter(cancelled=False)
-        .select_related("room")
+        .select_related("room", "user__userprofile")
         .order_by("date", "start_time")
     )
 
@@ -1491,8 +1796,7 @@ def all_room_reservations(request):
     for r in qs:
         # get full name safely
         try:
-            profile = UserProfile.objects.get(user=r.user)
-            full_name = profile.full_name
+            full_name = r.user.userprofile.full_name
         except UserProfile.DoesNotExist:
             full_name = (f"{r.user.first_name} {r.user.last_name}").strip()
             if not full_name:
@@ -1513,6 +1817,9 @@ def all_room_reservations(request):
             "email": r.user.email,   # ← NEW IMPORTANT LINE
         })
 
+    # ?format=compact → columns once + row arrays (much smaller for big lists)
+    if wants_compact(request):
+        return JsonResponse({"ok": True, "reservations": to_columns(reservations)})
 
     return JsonResponse({"ok": True, "reservations": reservations})
 
@@ -1520,15 +1827,16 @@ def all_room_reservations(request):
 
 @csrf_exempt
 @require_POST
-def admin_cancel_reservation(request, reservation_id):
-    if not request.user.is_authenticated or not request.user.is_staff:
+async def admin_cancel_reservation(request, reservation_id):
+    user = await request.auser()
+    if not user.is_authenticated or not user.is_staff:
         return JsonResponse(
             {"ok": False, "error": "Admin privileges required"},
             status=403,
         )
 
     try:
-        reservation = RoomReservation.objects.get(id=reservation_id)
+        reservation = await RoomReservation.objects.select_related("user", "room").aget(id=reservation_id)
 
         if reservation.cancelled:
             return JsonResponse(
@@ -1544,9 +1852,10 @@ def admin_cancel_reservation(request, reservation_id):
 
         reservation.cancelled = True
         reservation.cancel_reason = reason
-        reservation.save()
+        await reservation.asave()
+        publish("reservation.cancelled", reservation_event([reservation]))
 
-        send_cancellation_email(reservation, reason, cancelled_by=request.user.username)
+        await asend_cancellation_email(reservation, reason, cancelled_by=user.username)
 
         return JsonResponse({"ok": True, "message": "Reservation cancelled"})
 
@@ -1563,25 +1872,30 @@ def admin_cancel_reservation(request, reservation_id):
         )
 
 
-def send_cancellation_email(reservation, reason, cancelled_by="System"):
-    try:
-        from api.utils.email_templates import render_cancellation_email
+def build_cancellation_email(reservation, reason, cancelled_by="System"):
+    """(to, subject, html) — reservation needs user + room loaded."""
+    from api.utils.email_templates import render_cancellation_email
 
-        logo_url = (
-            "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
-            "smartKiosk/media/ui_assets/apple-touch-icon.png"
-        )
+    logo_url = (
+        "https://raw.githubusercontent.com/patrickngg1/kioskguys/main/"
+        "smartKiosk/media/ui_assets/apple-touch-icon.png"
+    )
+
+    html = render_cancellation_email(
+        reservation=reservation,
+        reason=reason,
+        logo_url=logo_url,
+        cancelled_by=cancelled_by,
+    )
+    return reservation.user.email, "⚠️ Reservation Cancelled", html
 
-        html = render_cancellation_email(
-            reservation=reservation,
-            reason=reason,
-            logo_url=logo_url,
-            cancelled_by=cancelled_by,
-        )
 
+def send_cancellation_email(reservation, reason, cancelled_by="System"):
+    try:
+        to_email, subject, html = build_cancellation_email(reservation, reason, cancelled_by)
         send_via_sendgrid(
-            to_email=reservation.user.email,
-            subject="⚠️ Reservation Cancelled",
+            to_email=to_email,
+            subject=subject,
             html_content=html,
         )
 
@@ -1589,6 +1903,15 @@ def send_cancellation_email(reservation, reason, cancelled_by="System"):
         print("Cancellation Email Error:", e)
 
 
+async def asend_cancellation_email(reservation, reason, cancelled_by="System"):
+    try:
+        to_email, subject, html = build_cancellation_email(reservation, reason, cancelled_by)
+        await asend_email(to_email, subject, html)
+
+    except Exception as e:
+        print("Cancellation Email Error:", e)
+
+
 
 # ---------------------------------------------------------
 # POST /api/login/
@@ -1596,6 +1919,7 @@ def send_cancellation_email(reservation, reason, cancelled_by="System"):
 # ---------------------------------------------------------
 @csrf_exempt
 @require_POST
+@rate_limit("login")
 def login_user(request):
     data = json.loads(request.body.decode("utf-8"))
     email = data.get("email", "").strip().lower()
@@ -1611,9 +1935,10 @@ def login_user(request):
 
         # Look up code
        # Always fetch the most recent unused reset code
+        # (expired codes are filtered out in SQL)
         reset_obj = (
             PasswordResetCode.objects
-            .filter(user=user_obj, used=False)
+            .filter(user=user_obj, used=False, expires_at__gt=timezone.now())
             .order_by('-created_at')
             .first()
         )
@@ -1627,8 +1952,7 @@ def login_user(request):
 
 
         # Mark code used
-        reset_obj.used = True
-        reset_obj.save()
+        PasswordResetCode.objects.filter(pk=reset_obj.pk).update(used=True)
 
         # Login user
         user_obj.backend = "django.contrib.auth.backends.ModelBackend"
@@ -1725,7 +2049,8 @@ def get_session_user(request):
 # ---------------------------------------------------------
 @csrf_exempt
 @require_POST
-def password_reset_request(request):
+@rate_limit("password_reset")
+async def password_reset_request(request):
     """
     POST /api/password-reset/request/
     Body: { "email": "user@mavs.uta.edu" }
@@ -1743,7 +2068,7 @@ def password_reset_request(request):
         return JsonResponse({"ok": False, "error": "Email required"}, status=400)
 
     try:
-        user = User.objects.get(email=email)
+        user = await User.objects.aget(email=email)
     except User.DoesNotExist:
         # Don't leak which emails exist: pretend success
         return JsonResponse(
@@ -1754,13 +2079,16 @@ def password_reset_request(request):
             status=200,
         )
 
-    # Invalidate any previous unused codes for this user
-    PasswordResetCode.objects.filter(user=user, used=False).update(used=True)
+    # Invalidate previous codes that are still live (expired ones are
+    # already unusable and get removed by purge_expired)
+    await PasswordResetCode.objects.filter(
+        user=user, used=False, expires_at__gt=timezone.now()
+    ).aupdate(used=True)
 
     # Generate 6-digit numeric code
     code = f"{random.randint(0, 999999):06d}"
 
-    reset_obj = PasswordResetCode.objects.create(user=user, code=code)
+    reset_obj = await PasswordResetCode.objects.acreate(user=user, code=code)
 
     # Build a simple, clean HTML email
     # Same logo used everywhere in your app
@@ -1778,11 +2106,7 @@ def password_reset_request(request):
     )
 
     try:
-        send_via_sendgrid(
-            to_email=email,
-            subject=subject,
-            html_content=html_content,
-        )
+        await asend_email(email, subject, html_content)
     except Exception as e:
         print("Password reset send error:", e)
         return JsonResponse(
@@ -1801,17 +2125,23 @@ def password_reset_request(request):
 # ---------------------------------------------------------
 # GET /api/ui-assets/
 # Returns URL mapping for UI images stored in Django
+# Served from the cached manifest (hashed URLs + ETag)
 # ---------------------------------------------------------
 @require_GET
 def get_ui_assets(request):
-    from .models import UIAsset
-
-    assets = {}
+    from kiosks.ui_assets import manifest_response
 
-    for asset in UIAsset.objects.all():
-        assets[asset.name] = request.build_absolute_uri(asset.image.url)
-
-    return JsonResponse({"ok": True, "assets": assets}, status=200)
+    return manifest_response(
+        request,
+        lambda manifest, origin: {
+            "ok": True,
+            "version": manifest["version"],
+            "assets": {
+                name: origin + meta["url"] for name, meta in manifest["assets"].items()
+            },
+            "manifest": manifest["assets"],
+        },
+    )
 
 
 # ---------------------------------------------------------
@@ -1879,7 +2209,7 @@ def set_password(request):
         return JsonResponse({"ok": False, "error": "Password required"}, status=400)
 
     user = request.user
-    user.set_password(new_password) #
+    user.password = make_password_bounded(new_password)  # bounded hashing pool
     user.save() #
     
     update_session_auth_hash(request, user) #
@@ -1920,6 +2250,18 @@ def parse_uta_card(raw_swipe):
 
     return extracted_id
 
+def user_for_swipe(raw_swipe):
+    """Registered user for a raw card swipe (parsed UTA ID first, then exact swipe), or None."""
+    extracted_id = parse_uta_card(raw_swipe)
+    card_obj = None
+
+    if extracted_id:
+        card_obj = UserCard.objects.filter(uta_id=extracted_id).select_related("user").first()
+    if not card_obj:
+        card_obj = UserCard.objects.filter(raw_swipe=raw_swipe).select_related("user").first()
+
+    return card_obj.user if card_obj else None
+
 @csrf_exempt
 @require_POST
 def register_card(request):
@@ -1976,6 +2318,7 @@ def register_card(request):
 
 @csrf_exempt
 @require_POST
+@rate_limit("card_login")
 def login_with_card(request):
     try:
         data = json.loads(request.body.decode("utf-8"))
@@ -1986,18 +2329,10 @@ def login_with_card(request):
     if not raw_swipe:
         return JsonResponse({"ok": False, "error": "Card data required"}, status=400)
 
-    extracted_id = parse_uta_card(raw_swipe)
-    card_obj = None
-
-    if extracted_id:
-        card_obj = UserCard.objects.filter(uta_id=extracted_id).first()
-    if not card_obj:
-        card_obj = UserCard.objects.filter(raw_swipe=raw_swipe).first()
-
-    if not card_obj:
+    user = user_for_swipe(raw_swipe)
+    if not user:
         return JsonResponse({"ok": False, "error": "Card not registered."}, status=401)
 
-    user = card_obj.user
     user.backend = "django.contrib.auth.backends.ModelBackend"
     login(request, user)
 
@@ -0,0 +1,247 @@
+"""
+Production media serving (banners, item images, UI assets).
+
+- FileResponse for full bodies → wsgi.file_wrapper / sendfile (zero-copy);
+  under ASGI an async chunk stream (Django buffers sync iterators whole)
+- Optional X-Accel-Redirect / X-Sendfile offload to the front server
+- Single-range HTTP Range requests (206 / 416)
+- ETag + Last-Modified revalidation (304)
+- Far-future immutable Cache-Control for content-hashed names, or a
+  ?v=<hash> that matches the file's sha256
+- Precompressed .br / .gz siblings picked by Accept-Encoding
+"""
+import hashlib
+import mimetypes
+import os
+import re
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+DEFAULT_MAX_AGE = getattr(settings, "MEDIA_DEFAULT_MAX_AGE", 3600)
+
+# Set to "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache / Caddy)
+# to hand the transfer to the front server.
+SENDFILE_HEADER = getattr(settings, "MEDIA_SENDFILE_HEADER", None)
+SENDFILE_PREFIX = getattr(settings, "MEDIA_SENDFILE_PREFIX", "/protected-media/")
+
+# name.<12+ hex>.ext  (same shape as ManifestStaticFilesStorage)
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12,64}\.[A-Za-z0-9]+$")
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# (Accept-Encoding token, file suffix), best first
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+CHUNK_SIZE = 64 * 1024
+
+# ?v= values are the first 12 hex digits of the content sha256
+MIN_VERSION_LENGTH = 12
+
+
+@lru_cache(maxsize=1024)
+def file_hash(path, mtime_ns, size):
+    """sha256 hex of the file; mtime / size key the cache so edits rehash."""
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+def is_hashed_request(request, path, fullpath):
+    if HASHED_NAME_RE.search(path):
+        return True
+
+    # A stale or made-up ?v= must not pin the file in caches for a year
+    version = request.GET.get("v", "").lower()
+    if len(version) < MIN_VERSION_LENGTH:
+        return False
+    stat = os.stat(fullpath)
+    return file_hash(fullpath, stat.st_mtime_ns, stat.st_size).startswith(version)
+
+
+def pick_variant(request, fullpath):
+    """Return (path, encoding) for the best precompressed sibling."""
+    accept = request.headers.get("Accept-Encoding", "")
+    accepted = {token.split(";")[0].strip() for token in accept.split(",")}
+
+    for token, suffix in PRECOMPRESSED:
+        candidate = fullpath + suffix
+        if token in accepted and os.path.isfile(candidate):
+            # Never serve a stale variant
+            if os.path.getmtime(candidate) >= os.path.getmtime(fullpath):
+                return candidate, token
+
+    return fullpath, None
+
+
+def parse_range(header, size):
+    """
+    Parse a single 'bytes=start-end' range.
+    Returns (start, end) inclusive, None for "serve the full body"
+    (absent / multi-range / malformed), or False if unsatisfiable.
+    """
+    if not header:
+        return None
+
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multi-range or junk → full 200 is allowed
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+
+    return start, min(end, size - 1)
+
+
+def iter_range(path, start, end):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def aiter_chunks(iterator):
+    """
+    Async view of a chunk iterator for ASGI responses (a sync iterator
+    would be buffered whole by Django). Reads run in the thread pool.
+    """
+    done = object()
+    try:
+        while True:
+            chunk = await sync_to_async(next, thread_sensitive=False)(iterator, done)
+            if chunk is done:
+                return
+            yield chunk
+    finally:
+        iterator.close()
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except Exception:
+        raise Http404("Invalid path")
+
+    if not os.path.isfile(fullpath):
+        raise Http404("File not found")
+
+    content_type, _ = mimetypes.guess_type(fullpath)
+    content_type = content_type or "application/octet-stream"
+
+    # Ranges only make sense on the identity encoding
+    range_header = request.headers.get("Range")
+    if range_header:
+        body_path, encoding = fullpath, None
+    else:
+        body_path, encoding = pick_variant(request, fullpath)
+
+    stat = os.stat(body_path)
+    etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+
+    # ?v= versions the original file, not its precompressed sibling
+    if is_hashed_request(request, path, fullpath):
+        cache_control = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        cache_control = f"public, max-age={DEFAULT_MAX_AGE}"
+
+    def finish(response):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        response["Cache-Control"] = cache_control
+        response["Accept-Ranges"] = "bytes"
+        response["Vary"] = "Accept-Encoding"
+        return response
+
+    # ---------------------------------------------------------
+    # Conditional GET
+    # ---------------------------------------------------------
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        if etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return finish(HttpResponseNotModified())
+    elif not was_modified_since(request.headers.get("If-Modified-Since"), stat.st_mtime):
+        return finish(HttpResponseNotModified())
+
+    # ---------------------------------------------------------
+    # Front-server offload (true zero-copy, handles ranges itself)
+    # ---------------------------------------------------------
+    if SENDFILE_HEADER:
+        response = HttpResponse(content_type=content_type)
+        rel = os.path.relpath(body_path, settings.MEDIA_ROOT).replace(os.sep, "/")
+        if SENDFILE_HEADER.lower() == "x-accel-redirect":
+            response[SENDFILE_HEADER] = SENDFILE_PREFIX.rstrip("/") + "/" + rel
+        else:
+            response[SENDFILE_HEADER] = body_path
+        if encoding:
+            response["Content-Encoding"] = encoding
+        return finish(response)
+
+    # ---------------------------------------------------------
+    # Range request → 206 / 416
+    # ---------------------------------------------------------
+    byte_range = parse_range(range_header, stat.st_size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return finish(response)
+
+    is_asgi = isinstance(request, ASGIRequest)
+
+    if byte_range is not None:
+        start, end = byte_range
+        body = iter_range(body_path, start, end)
+        response = StreamingHttpResponse(
+            aiter_chunks(body) if is_asgi else body,
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        return finish(response)
+
+    # ---------------------------------------------------------
+    # Full body → FileResponse (wsgi.file_wrapper / sendfile),
+    # or an async chunk stream under ASGI
+    # ---------------------------------------------------------
+    if is_asgi:
+        response = StreamingHttpResponse(
+            aiter_chunks(iter_range(body_path, 0, stat.st_size - 1)),
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(stat.st_size)
+    else:
+        response = FileResponse(open(body_path, "rb"), content_type=content_type)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return finish(response)
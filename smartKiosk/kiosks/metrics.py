@@ -0,0 +1,254 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from api.utils.json_response import JsonResponse
+
+logger = logging.getLogger("kiosks.perf")
+
+# ---------------------------------------------------------
+# PER-REQUEST COUNTERS
+# One RequestStats per request, reachable from anywhere in the
+# request (DB wrapper, mailer) through a context variable.
+# ---------------------------------------------------------
+_current = contextvars.ContextVar("kiosk_request_stats", default=None)
+
+
+class RequestStats:
+    __slots__ = ("db_count", "db_time", "smtp_count", "smtp_time")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_time = 0.0
+        self.smtp_count = 0
+        self.smtp_time = 0.0
+
+
+def current_stats():
+    return _current.get()
+
+
+def db_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_count += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def install_db_wrapper(connection, **kwargs):
+    """
+    Permanently add db_wrapper to a DB connection. It is a no-op outside a
+    request, and because it reads a context variable it also counts queries
+    that async views run in sync_to_async worker threads.
+    """
+    if db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_wrapper)
+
+
+connection_created.connect(install_db_wrapper)
+
+
+@contextmanager
+def timed_smtp():
+    """Wrap an SMTP send; no-op outside a request (management commands)."""
+    stats = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.smtp_count += 1
+            stats.smtp_time += time.perf_counter() - start
+
+
+# ---------------------------------------------------------
+# PER-ENDPOINT AGGREGATES (process memory)
+# Latency histogram with fixed bucket bounds + running totals.
+# ---------------------------------------------------------
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_lock = threading.Lock()
+_endpoints = {}
+_since = time.time()
+
+
+def _empty_entry():
+    return {
+        "count": 0,
+        "errors": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "buckets": [0] * (len(BUCKETS_MS) + 1),  # last one is +Inf
+        "db_queries": 0,
+        "db_queries_max": 0,
+        "db_ms": 0.0,
+        "smtp_ms": 0.0,
+        "bytes": 0,
+    }
+
+
+def record(endpoint, status, wall_ms, stats, size):
+    index = len(BUCKETS_MS)
+    for i, bound in enumerate(BUCKETS_MS):
+        if wall_ms <= bound:
+            index = i
+            break
+
+    with _lock:
+        entry = _endpoints.get(endpoint)
+        if entry is None:
+            entry = _endpoints[endpoint] = _empty_entry()
+        entry["count"] += 1
+        entry["errors"] += status >= 500
+        entry["total_ms"] += wall_ms
+        entry["max_ms"] = max(entry["max_ms"], wall_ms)
+        entry["buckets"][index] += 1
+        entry["db_queries"] += stats.db_count
+        entry["db_queries_max"] = max(entry["db_queries_max"], stats.db_count)
+        entry["db_ms"] += stats.db_time * 1000
+        entry["smtp_ms"] += stats.smtp_time * 1000
+        entry["bytes"] += size
+
+
+def snapshot(reset=False):
+    global _since
+
+    with _lock:
+        endpoints = {name: dict(entry, buckets=list(entry["buckets"])) for name, entry in _endpoints.items()}
+        since = _since
+        if reset:
+            _endpoints.clear()
+            _since = time.time()
+
+    for entry in endpoints.values():
+        count = entry["count"] or 1
+        entry["avg_ms"] = round(entry["total_ms"] / count, 2)
+        entry["avg_db_queries"] = round(entry["db_queries"] / count, 2)
+        entry["histogram"] = {
+            **{f"le_{bound}": n for bound, n in zip(BUCKETS_MS, entry["buckets"])},
+            "le_inf": entry["buckets"][-1],
+        }
+        del entry["buckets"]
+        for key in ("total_ms", "max_ms", "db_ms", "smtp_ms"):
+            entry[key] = round(entry[key], 2)
+
+    return {"since": since, "endpoints": endpoints}
+
+
+def endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return f"{request.method} /{match.route}"
+
+
+# ---------------------------------------------------------
+# MIDDLEWARE (sync + async)
+# Wall time, DB queries/time (connection.execute_wrapper), SMTP time
+# and response size per request → Server-Timing header, one log
+# line, and the per-endpoint aggregates above.
+# ---------------------------------------------------------
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "PERF_METRICS_ENABLED", True)
+        self.slow_ms = getattr(settings, "PERF_SLOW_REQUEST_MS", 500)
+        self.server_timing = getattr(settings, "PERF_SERVER_TIMING", True)
+
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        # Connections opened before this module was imported
+        for conn in connections.all(initialized_only=True):
+            install_db_wrapper(conn)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self.finish(request, response, stats, start)
+
+    def finish(self, request, response, stats, start):
+        wall_ms = (time.perf_counter() - start) * 1000
+        size = 0 if response.streaming else len(response.content)
+        endpoint = endpoint_name(request)
+
+        record(endpoint, response.status_code, wall_ms, stats, size)
+
+        if self.server_timing:
+            response["Server-Timing"] = (
+                f"app;dur={wall_ms:.1f}, "
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.db_count} queries", '
+                f"smtp;dur={stats.smtp_time * 1000:.1f}"
+            )
+
+        line = json.dumps({
+            "endpoint": endpoint,
+            "path": request.path,
+            "status": response.status_code,
+            "ms": round(wall_ms, 1),
+            "db_queries": stats.db_count,
+            "db_ms": round(stats.db_time * 1000, 1),
+            "smtp_ms": round(stats.smtp_time * 1000, 1),
+            "bytes": size,
+        })
+        if wall_ms >= self.slow_ms:
+            logger.warning(line)
+        else:
+            logger.info(line)
+
+        return response
+
+
+# ---------------------------------------------------------
+# GET /api/_metrics/   (?reset=1 clears after reading)
+# Admin only — aggregates for THIS worker process
+# ---------------------------------------------------------
+def metrics_view(request):
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return JsonResponse({"ok": False, "error": "Admin privileges required"}, status=403)
+
+    data = snapshot(reset=request.GET.get("reset") == "1")
+    return JsonResponse({"ok": True, "bucketsMs": list(BUCKETS_MS), **data})
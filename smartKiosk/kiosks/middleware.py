@@ -0,0 +1,119 @@
+import gzip
+import re
+import secrets
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+_q_re = re.compile(r";\s*q=([0-9.]+)")
+
+
+def parse_accept_encoding(header):
+    """{ token: q } from an Accept-Encoding header (q=0 means refused)."""
+    accepted = {}
+    for part in (header or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        token = part.split(";")[0].strip().lower()
+        match = _q_re.search(part)
+        try:
+            accepted[token] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            accepted[token] = 0.0
+    return accepted
+
+
+def gzip_padded(content, level, max_random_bytes):
+    """
+    gzip with a random-length FNAME header (same trick as Django's
+    GZipMiddleware): the compressed size no longer tracks the content
+    byte for byte, which is what BREACH measures.
+    """
+    compressed = gzip.compress(content, compresslevel=level, mtime=0)
+    if not max_random_bytes:
+        return compressed
+    header = bytearray(compressed[:10])
+    header[3] = gzip.FNAME
+    filename = b"a" * secrets.randbelow(max_random_bytes) + b"\x00"
+    return bytes(header) + filename + compressed[10:]
+
+
+# ---------------------------------------------------------
+# NEGOTIATED RESPONSE COMPRESSION (br / gzip)
+# Only for compressible content types above a size threshold —
+# small JSON bodies are cheaper to send as-is.
+#
+# BREACH: a page that carries a secret (CSRF token) next to reflected
+# input leaks it through the compressed length. gzip bodies get random
+# length padding; brotli has no padding slot, so HTML is never sent as br.
+# ---------------------------------------------------------
+class CompressionMiddleware(MiddlewareMixin):
+    min_size = getattr(settings, "RESPONSE_COMPRESSION_MIN_SIZE", 1024)
+    content_types = getattr(
+        settings,
+        "RESPONSE_COMPRESSION_TYPES",
+        ("application/json", "text/html", "text/plain", "text/csv", "text/calendar"),
+    )
+    gzip_level = getattr(settings, "RESPONSE_COMPRESSION_GZIP_LEVEL", 6)
+    brotli_quality = getattr(settings, "RESPONSE_COMPRESSION_BROTLI_QUALITY", 5)
+    max_random_bytes = getattr(settings, "RESPONSE_COMPRESSION_MAX_RANDOM_BYTES", 100)
+    gzip_only_types = ("text/html",)  # brotli cannot be padded
+
+    def choose_encoding(self, request, content_type=None):
+        accepted = parse_accept_encoding(request.headers.get("Accept-Encoding"))
+        wildcard = accepted.get("*", 0.0)
+        candidates = []
+        if brotli is not None and content_type not in self.gzip_only_types:
+            candidates.append("br")
+        candidates.append("gzip")
+
+        best, best_q = None, 0.0
+        for token in candidates:
+            q = accepted.get(token, wildcard)
+            if q > best_q:
+                best, best_q = token, q
+        return best
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if content_type not in self.content_types:
+            return response
+
+        # Vary even when we decide not to compress this particular body
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding = self.choose_encoding(request, content_type)
+        if encoding is None:
+            return response
+
+        if encoding == "br":
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        else:
+            compressed = gzip_padded(response.content, self.gzip_level, self.max_random_bytes)
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+
+        # Strong ETags describe the identity body only
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+
+        return response
@@ -42,6 +42,8 @@ SITE_ID = 1
 # ---------------------------------------------------------
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',   # MUST BE FIRST
+    'kiosks.metrics.PerformanceMiddleware',  # timing / DB / SMTP per request → Server-Timing
+    'kiosks.middleware.CompressionMiddleware',  # br/gzip for large JSON bodies
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +56,139 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Compress JSON/text responses above this many bytes (br if installed, else gzip).
+# gzip bodies carry up to this many random padding bytes against BREACH;
+# HTML is only ever gzipped (brotli cannot be padded)
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+RESPONSE_COMPRESSION_MAX_RANDOM_BYTES = 100
+
+# JSON encoder for API responses: "auto" uses orjson when installed
+JSON_RESPONSE_BACKEND = "auto"
+
+# Bulk cancellation emails above this many rows switch to a per-room
+# summary; the full list is attached as "csv", "ics" or not at all (None)
+BULK_EMAIL_ROW_LIMIT = 25
+BULK_EMAIL_ATTACHMENT = "csv"
+
+# Supply request emails: False = one email per request (default);
+# True = requests queue up and `manage.py send_supply_digest` sends one
+# consolidated email per recipient every SUPPLY_DIGEST_INTERVAL_MINUTES
+SUPPLY_DIGEST_ENABLED = False
+SUPPLY_DIGEST_INTERVAL_MINUTES = 15
+
+# Supply routing: recipients are matched by category (admin → Supply
+# recipients); this address is used only when no recipient matches
+SUPPLY_FALLBACK_EMAIL = "patrickknguyen1@gmail.com"
+SUPPLY_ROUTING_TTL = 300  # seconds; signals invalidate sooner
+
+# Largest quantity one request may ask for per item (Item.daily_cap, set
+# in the admin, limits the total per local day across all kiosks)
+SUPPLY_MAX_QTY_PER_LINE = 20
+
+# /api/supplies/analytics/ reads daily rollups kept by
+# `manage.py rollup_supply_requests` (run nightly); longest range allowed
+SUPPLY_ANALYTICS_MAX_DAYS = 731
+
+# /api/rooms/utilization/: longest range (days) and the open hours
+# [start, end) that occupancyPct is measured against
+ROOM_UTILIZATION_MAX_DAYS = 366
+ROOM_UTILIZATION_HOURS = (7, 22)
+
+# /api/exports/ and `manage.py export_data`: rows per page (one query,
+# one CSV chunk / Parquet row group). Parquet needs pyarrow installed
+EXPORT_CHUNK_SIZE = 2000
+
+# /api/import/ and `manage.py import_directory`: rows per bulk upsert.
+# IMPORT_HASH_PROCESSES: password hashing processes for the command only
+# (None = CPU count); uploads hash in the bounded PASSWORD_HASH_THREADS
+IMPORT_BATCH_SIZE = 500
+IMPORT_HASH_PROCESSES = None
+
+# Reservation dates/times are stored as local wall-clock times in this zone
+RESERVATION_TIME_ZONE = "America/Chicago"
+
+# `manage.py send_reservation_reminders`: email reservations starting
+# within this many minutes, checking every tick, BATCH_SIZE per SMTP connection
+RESERVATION_REMINDER_MINUTES = 30
+RESERVATION_REMINDER_TICK_SECONDS = 60
+RESERVATION_REMINDER_BATCH_SIZE = 50
+
+# Kiosk check-in: allowed from CHECK_IN_EARLY_MINUTES before start until
+# NO_SHOW_GRACE_MINUTES after; `manage.py release_no_shows` frees rooms
+# not checked in by then (looking back NO_SHOW_LOOKBACK_HOURS per sweep)
+CHECK_IN_EARLY_MINUTES = 15
+NO_SHOW_GRACE_MINUTES = 15
+NO_SHOW_LOOKBACK_HOURS = 12
+
+# Seconds a per-date availability payload may be served from cache
+# (writes invalidate it immediately in this process)
+AVAILABILITY_CACHE_TTL = 30
+
+# Password reset codes are valid this long
+PASSWORD_RESET_CODE_TTL_MINUTES = 10
+
+# `manage.py purge_expired`: also delete cancelled reservations older than this
+PURGE_CANCELLED_RESERVATIONS_DAYS = 90
+
+# Default cache: rate-limit counters, availability payloads, routing and
+# the UI asset manifest. Rate limits are only global across worker
+# processes with a shared cache, so production sets REDIS_URL (needs the
+# redis package); without it every process keeps its own LocMem cache
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+
+# Fixed-window limits for auth endpoints (api/utils/ratelimit.py), counted
+# atomically in the default cache. "burst" requests are allowed per window
+# of burst / rate, and every key kind has its own counter (card = sha256)
+RATE_LIMIT_ENABLED = True
+RATE_LIMIT_TRUST_FORWARDED = False  # True behind a proxy that sets X-Forwarded-For
+RATE_LIMITS = {
+    "login": {"rate": "10/min", "burst": 10, "keys": ("ip", "email")},
+    "card_login": {"rate": "30/min", "burst": 10, "keys": ("ip", "card")},
+    "password_reset": {"rate": "5/hour", "burst": 3, "keys": ("ip", "email")},
+}
+
+# Request instrumentation (kiosks/metrics.py): Server-Timing header, one
+# "kiosks.perf" log line per request (WARNING above PERF_SLOW_REQUEST_MS),
+# per-endpoint aggregates at /api/_metrics/ (admin only)
+PERF_METRICS_ENABLED = True
+PERF_SERVER_TIMING = True
+PERF_SLOW_REQUEST_MS = 500
+
+# Live kiosk updates over SSE at /api/events/ (api/events.py; needs ASGI).
+# The in-process backend only reaches streams held by the same worker
+EVENTS_ENABLED = True
+EVENTS_BACKEND = "api.events.InProcessBackend"
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_RETRY_MS = 3000       # EventSource reconnect delay
+EVENTS_REPLAY_SIZE = 200     # events kept for Last-Event-ID replay
+EVENTS_QUEUE_SIZE = 100      # per-stream buffer; a client this far behind is disconnected
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "kiosks.perf": {
+            "handlers": ["console"],
+            "level": os.environ.get("PERF_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 # ---------------------------------------------------------
 # CORS SETTINGS
 # ---------------------------------------------------------
@@ -119,6 +254,19 @@ DATABASES = {
     },
 }
 
+# KIOSK_SQLITE=1 (or KIOSK_SQLITE=<path>) runs on a local SQLite file
+# instead of TiDB: tests, `bench`, `bench_auth` and offline work, with no
+# network and no shared data touched. The default file is git-ignored;
+# tests and the benches use their own in-memory database on top of it
+KIOSK_SQLITE = os.environ.get("KIOSK_SQLITE", "")
+if KIOSK_SQLITE:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'kiosk-local.sqlite3' if KIOSK_SQLITE == "1" else KIOSK_SQLITE,
+        },
+    }
+
 # ---------------------------------------------------------
 # PASSWORDS
 # ---------------------------------------------------------
@@ -129,6 +277,31 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# New hashes use scrypt (stdlib, same on every host): memory-hard and far
+# less CPU per login than PBKDF2 at Django's iteration count. The other
+# entries only verify older hashes, which are upgraded on the next login
+# (Argon2 ones need argon2-cffi on the host that checks them)
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+]
+
+# Password checks and new hashes run in a thread pool of this size
+# (api/utils/password_hashing.py), so a registration burst queues
+# instead of taking every core from other kiosk requests. ModelBackend
+# stays listed for sessions created before the bounded backend
+PASSWORD_HASH_THREADS = 2
+AUTHENTICATION_BACKENDS = [
+    "api.auth_backends.BoundedHashingBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+# Tests hash with MD5 (kiosks/test_runner.py); only hash-upgrade tests
+# switch back to the real PASSWORD_HASHERS
+TEST_RUNNER = "kiosks.test_runner.KioskTestRunner"
+
 # ---------------------------------------------------------
 # INTERNATIONALIZATION
 # ---------------------------------------------------------
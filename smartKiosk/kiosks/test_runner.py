@@ -0,0 +1,34 @@
+"""
+Test runner for the kiosk suite.
+
+Production password hashers cost hundreds of milliseconds per hash on
+purpose; the suite hashes with MD5 instead so logins and registrations
+stay fast (and under the slow-request log threshold). Tests about the
+real hashers override PASSWORD_HASHERS back for themselves.
+
+Per-request performance lines are only shown for slow requests, so
+test output stays readable.
+
+    KIOSK_SQLITE=1 python manage.py test api
+"""
+import logging
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+PERF_LOGGER = logging.getLogger("kiosks.perf")
+
+
+class KioskTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._hashers = override_settings(PASSWORD_HASHERS=TEST_PASSWORD_HASHERS)
+        self._hashers.enable()
+        self._perf_level = PERF_LOGGER.level
+        PERF_LOGGER.setLevel(logging.WARNING)
+
+    def teardown_test_environment(self, **kwargs):
+        PERF_LOGGER.setLevel(self._perf_level)
+        self._hashers.disable()
+        super().teardown_test_environment(**kwargs)
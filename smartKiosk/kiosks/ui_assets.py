@@ -1,19 +1,139 @@
-import os
+import hashlib
+import json
+import threading
+import time
+
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponseNotModified
+
+from api.utils.json_response import JsonResponse
+
+# ---------------------------------------------------------
+# UI ASSET MANIFEST
+# Built once from UIAsset rows, kept in process memory and
+# invalidated by UIAsset post_save / post_delete signals.
+# A TTL backs up invalidation across worker processes.
+# Every invalidation bumps a generation: a build that started
+# before it is returned to its caller but never stored.
+# ---------------------------------------------------------
+MANIFEST_TTL = getattr(settings, "UI_ASSET_MANIFEST_TTL", 300)  # seconds
+MANIFEST_MAX_AGE = getattr(settings, "UI_ASSET_MANIFEST_MAX_AGE", 60)  # browser cache
+
+_lock = threading.Lock()
+_manifest = None
+_built_at = 0.0
+_generation = 0
+
+
+def invalidate_manifest():
+    global _manifest, _generation
+    with _lock:
+        _manifest = None
+        _generation += 1
 
-def get_ui_assets(request):
-    folder = os.path.join(settings.MEDIA_ROOT, "ui_assets")
-    files = os.listdir(folder)
 
-    # Build a dictionary mapping filenames -> full URLs
+def _fill_missing_metadata(asset):
+    """Hash + measure legacy rows once, persist without firing signals."""
+    from api.models import UIAsset
+
+    try:
+        asset.image.open("rb")
+        with asset.image:
+            data = asset.image.read()
+    except (FileNotFoundError, OSError):
+        return False
+
+    asset.refresh_image_metadata(data)
+    UIAsset.objects.filter(pk=asset.pk).update(
+        image_hash=asset.image_hash,
+        size=asset.size,
+        width=asset.width,
+        height=asset.height,
+    )
+    return True
+
+
+def build_manifest():
+    """
+    { "version": <etag>, "assets": { name: {url, hash, size, width, height} } }
+    URLs are site-relative and carry ?v=<content hash> so they can be
+    cached forever by kiosks.
+    """
+    from api.models import UIAsset
+
     assets = {}
 
-    for f in files:
-        name = os.path.splitext(f)[0]  # "logo" from logo.png
-        url = request.build_absolute_uri(
-            settings.MEDIA_URL + "ui_assets/" + f
-        )
-        assets[name] = url
+    for asset in UIAsset.objects.order_by("name"):
+        if not asset.image:
+            continue
+
+        if not asset.image_hash or not asset.size or asset.width is None:
+            if not _fill_missing_metadata(asset):
+                continue
+
+        assets[asset.name] = {
+            "url": f"{asset.image.url}?v={asset.image_hash[:12]}",
+            "hash": asset.image_hash,
+            "size": asset.size,
+            "width": asset.width,
+            "height": asset.height,
+        }
 
-    return JsonResponse({"ui_assets": assets})
+    version = hashlib.sha256(
+        json.dumps(assets, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+
+    return {"version": version, "assets": assets}
+
+
+def get_manifest():
+    global _manifest, _built_at
+
+    with _lock:
+        if _manifest is not None and time.monotonic() - _built_at < MANIFEST_TTL:
+            return _manifest
+        generation = _generation
+
+    manifest = build_manifest()
+
+    with _lock:
+        # An asset changed while building: this manifest may predate it
+        if generation == _generation:
+            _manifest = manifest
+            _built_at = time.monotonic()
+
+    return manifest
+
+
+def manifest_response(request, build_body):
+    """
+    Shared response path for both ui-assets endpoints:
+    ETag / If-None-Match + cache headers. build_body(manifest, origin)
+    returns the endpoint-specific JSON body.
+    """
+    manifest = get_manifest()
+    etag = f'"{manifest["version"]}"'
+
+    # Compressed responses carry a weak W/"..." copy of the same tag
+    if request.headers.get("If-None-Match", "").removeprefix("W/") == etag:
+        response = HttpResponseNotModified()
+    else:
+        # One absolute-URI build per request, not per file
+        origin = request.build_absolute_uri("/").rstrip("/")
+        response = JsonResponse(build_body(manifest, origin))
+
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={MANIFEST_MAX_AGE}"
+    return response
+
+
+def get_ui_assets(request):
+    # Legacy shape: { "ui_assets": { name: url } }
+    return manifest_response(
+        request,
+        lambda manifest, origin: {
+            "ui_assets": {
+                name: origin + meta["url"] for name, meta in manifest["assets"].items()
+            }
+        },
+    )
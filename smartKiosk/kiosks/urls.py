@@ -1,15 +1,17 @@
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
 from kiosks.ui_assets import get_ui_assets;
-
-# ⭐ ADD THESE THREE IMPORTS
-from django.conf import settings
-from django.conf.urls.static import static
+from kiosks.media import serve_media
+from kiosks.metrics import metrics_view
 
 urlpatterns = [
     # Admin
@@ -24,13 +26,21 @@ urlpatterns = [
     # Supply Request + Items API
     path('api/', include('api.urls')),
     path("api/ui-assets/", get_ui_assets),
+    path("api/_metrics/", metrics_view, name="metrics"),
     # JWT Endpoints
     path('api/auth/jwt/login/', TokenObtainPairView.as_view(), name='jwt_login'),
     path('api/auth/jwt/refresh/', TokenRefreshView.as_view(), name='jwt_refresh'),
     path('api/auth/jwt/verify/', TokenVerifyView.as_view(), name='jwt_verify'),
 ]
 
-# ⭐ ADD THIS BLOCK BELOW
-# Serve media files (uploaded images)
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Serve media files (uploaded images) — dev AND production — under
+# MEDIA_URL, unless it points at another host (CDN / bucket).
+# /api/media/ is the prefix the kiosk image URL helpers emit.
+media_url = urlsplit(settings.MEDIA_URL)
+if not media_url.netloc:
+    urlpatterns += [
+        re_path(rf"^{re.escape(media_url.path.lstrip('/'))}(?P<path>.+)$", serve_media, name="serve_media"),
+    ]
+urlpatterns += [
+    re_path(r"^api/media/(?P<path>.+)$", serve_media),
+]
@@ -42,8 +42,11 @@ nvm use 24
 echo "📦 Installing frontend dependencies..."
 npm install --legacy-peer-deps
 
-echo "🚀 Starting Django backend..."
-python3 manage.py runserver &
+# ASGI (uvicorn) rather than runserver (WSGI): the kiosk event stream,
+# async views and streaming exports need it. Reloads on Python changes only
+echo "🚀 Starting Django backend (uvicorn, ASGI)..."
+python3 -m uvicorn kiosks.asgi:application --host 127.0.0.1 --port $PORT_BACKEND \
+  --reload --reload-dir accounts --reload-dir api --reload-dir kiosks --reload-dir main &
 BACKEND_PID=$!
 
 echo "⏳ Waiting for Django to be ready..."